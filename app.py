@@ -1,12 +1,44 @@
 #!/usr/bin/env python3
 
-import tkinter as tk
+import time
+
+LAUNCHED_AT = time.perf_counter()
+
 import sys
-from ui.main_window import DarkRepoLauncher
+
+# Subcommands that run in the terminal without loading the GUI
+CLI_COMMANDS = ("list", "open")
 
 def main():
+    args = sys.argv[1:]
+    if args and args[0] in CLI_COMMANDS:
+        from cli import main as cli_main
+        sys.exit(cli_main(args))
+
+    flags = {a for a in args if a.startswith("--")}
+    # Anything else pre-fills the search box: `repos api` opens filtered to "api"
+    search = " ".join(a for a in args if not a.startswith("--"))
+
+    from services import instance
+    if "--quit" in flags:
+        sys.exit(0 if instance.send_to_running({"cmd": "quit"}) else 1)
+    # An instance is already up: bring it forward and get out of the way
+    if "--new-instance" not in flags and instance.send_to_running(
+        {"cmd": "show", "search": search or None}
+    ):
+        return
+
+    from services import startup
+    if "--profile-startup" in flags:
+        startup.enable(LAUNCHED_AT)
+
+    import tkinter as tk
+    from ui.main_window import DarkRepoLauncher
+    startup.mark("imports")
+
     root = tk.Tk()
-    
+    startup.mark("Tk created")
+
     # Fix blurry text on Windows
     if sys.platform == "win32":
         try:
@@ -14,9 +46,14 @@ def main():
             windll.shcore.SetProcessDpiAwareness(1)
         except:
             pass
-            
+
     app = DarkRepoLauncher(root)
+    if search:
+        app.search_var.set(search)
+    if "--new-instance" not in flags:
+        app.listen_for_instances()
+    startup.mark("widgets built")
     root.mainloop()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""Keeps `app.py list` fast: times it and checks what it imports.
+
+    python benchmarks/bench_cli_startup.py --repos 500
+
+Runs the CLI in fresh interpreters against a synthetic tree (with its own
+index, so your real one is untouched), reports wall time for a warm-index scan
+and for `--cached`, and breaks down `python -X importtime`. Exits non-zero if
+the CLI pulls in any of the GUI/network modules in FORBIDDEN.
+"""
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from benchmarks.synthetic_tree import make_repo_tree
+
+APP = os.path.join(REPO_ROOT, "app.py")
+FORBIDDEN = ("tkinter", "PIL", "httpx", "asyncio", "keyring", "requests")
+IMPORT_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)")
+
+
+def run(args, env, extra=()):
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, *extra, APP, *args], env=env,
+                            capture_output=True, text=True)
+    elapsed = time.perf_counter() - start
+    if result.returncode != 0:
+        sys.exit(f"app.py {' '.join(args)} failed:\n{result.stderr}")
+    return elapsed, result
+
+
+def best_of(runs, args, env):
+    return min(run(args, env)[0] for _ in range(runs))
+
+
+def import_report(stderr):
+    """[(module, self_us, cumulative_us, depth)] from -X importtime output."""
+    modules = []
+    for line in stderr.splitlines():
+        match = IMPORT_LINE.match(line)
+        if match:
+            depth = len(match.group(3)) // 2
+            modules.append((match.group(4), int(match.group(1)), int(match.group(2)), depth))
+    return modules
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repos", type=int, default=500)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=12)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tree = os.path.join(tmp, "tree")
+        make_repo_tree(tree, args.repos, depth=2)
+        env = dict(
+            os.environ,
+            SCAN_ROOTS=json.dumps([{"path": tree, "depth": 2, "prune": []}]),
+            REPO_INDEX_PATH=os.path.join(tmp, "index.db"),
+        )
+
+        run(["list", "--tsv"], env)  # Builds the index
+        interpreter = min(
+            run_python(env) for _ in range(args.runs)
+        )
+        scan = best_of(args.runs, ["list", "--tsv"], env)
+        cached = best_of(args.runs, ["list", "--tsv", "--cached"], env)
+        print(f"{args.repos} repos, best of {args.runs}")
+        print(f"  python -c pass            {interpreter * 1000:7.1f} ms")
+        print(f"  app.py list (warm index)  {scan * 1000:7.1f} ms")
+        print(f"  app.py list --cached      {cached * 1000:7.1f} ms")
+
+        _, result = run(["list", "--tsv", "--cached"], env, extra=("-X", "importtime"))
+        modules = import_report(result.stderr)
+
+    total = sum(m[1] for m in modules)
+    print(f"\nImports: {len(modules)} modules, {total / 1000:.1f} ms")
+    top_level = sorted((m for m in modules if m[3] == 0), key=lambda m: -m[2])
+    for name, _, cumulative, _ in top_level[:args.top]:
+        print(f"  {cumulative / 1000:7.1f} ms  {name}")
+
+    loaded = {m[0].split(".")[0] for m in modules}
+    bad = [name for name in FORBIDDEN if name in loaded]
+    if bad:
+        sys.exit(f"\nFAIL: the CLI imported {', '.join(bad)}")
+    print("\nOK: none of " + ", ".join(FORBIDDEN) + " were imported")
+
+
+def run_python(env):
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-c", "pass"], env=env, check=True)
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    main()
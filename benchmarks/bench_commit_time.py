@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""Times reading HEAD's committer date from the object store vs. `git log -1`.
+
+    python benchmarks/bench_commit_time.py --repos 200
+
+Creates real repos with the git CLI (half of them packed), then checks that
+both methods agree on every repo.
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.git_meta import get_repo_meta
+from services.git_objects import _commit_cache, get_commit_time
+
+GIT_ENV = dict(
+    os.environ,
+    GIT_AUTHOR_NAME="bench", GIT_AUTHOR_EMAIL="bench@example.com",
+    GIT_COMMITTER_NAME="bench", GIT_COMMITTER_EMAIL="bench@example.com",
+)
+
+
+def git(*args):
+    subprocess.run(["git", *args], check=True, capture_output=True, env=GIT_ENV)
+
+
+def make_repos(root, count, commits):
+    paths = []
+    for i in range(count):
+        path = os.path.join(root, f"repo{i}")
+        git("init", "-q", path)
+        for n in range(commits):
+            git("-C", path, "commit", "-q", "--allow-empty", "-m", f"commit {n}")
+        if i % 2:
+            git("-C", path, "gc", "-q")
+        paths.append(path)
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repos", type=int, default=100)
+    parser.add_argument("--commits", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as root:
+        paths = make_repos(root, args.repos, args.commits)
+
+        start = time.perf_counter()
+        expected = [
+            int(subprocess.run(
+                ["git", "-C", p, "log", "-1", "--format=%ct"], capture_output=True, text=True
+            ).stdout)
+            for p in paths
+        ]
+        subprocess_time = time.perf_counter() - start
+
+        _commit_cache.clear()
+        start = time.perf_counter()
+        cold = [get_commit_time(p, get_repo_meta(p)["head_sha"]) for p in paths]
+        cold_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        warm = [get_commit_time(p, get_repo_meta(p)["head_sha"]) for p in paths]
+        warm_time = time.perf_counter() - start
+
+        assert cold == warm == expected, "object store and git log disagree"
+        print(f"{args.repos} repos")
+        print(f"git log -1        {subprocess_time * 1000:8.1f} ms")
+        print(f"objects (cold)    {cold_time * 1000:8.1f} ms  {subprocess_time / cold_time:6.1f}x")
+        print(f"objects (cached)  {warm_time * 1000:8.1f} ms  {subprocess_time / warm_time:6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""Compares the GitHub sync over GraphQL and over REST, against the live API.
+
+    python benchmarks/bench_github.py --runs 3
+
+Runs the same fetch the dashboard does (my open PRs, PRs waiting on my
+review, review and CI status) once per API per run, with the token the app
+signed in with, and reports HTTP requests and wall time for each, plus
+whether both came back with the same rows. Runs share one pooled session
+like the app's, so only the first pays for connecting.
+"""
+import argparse
+import os
+import statistics
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from services.auth_service import AuthService
+from services.github_service import fetch_dashboard
+from services.github_session import close_session
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    if not AuthService.get_token():
+        sys.exit("Sign in to GitHub from the dashboard first")
+
+    results = {}
+    for api in ("graphql", "rest"):
+        times, requests = [], []
+        for _ in range(args.runs):
+            stats = {}
+            prs, reviews = fetch_dashboard(stats, api=api)
+            if api == "graphql" and stats["api"] != "GraphQL":
+                sys.exit("GraphQL query failed (see above), nothing to compare")
+            times.append(stats["seconds"] * 1000)
+            requests.append(stats["requests"])
+        results[api] = (prs, reviews)
+        print(f"  {api:<8} {len(prs):3} PRs {len(reviews):3} reviews   "
+              f"{max(requests):4} requests   median {statistics.median(times):7.1f} ms   "
+              f"max {max(times):7.1f} ms")
+
+    # CI can differ: REST only sees commit statuses, GraphQL's rollup also has check runs
+    def rows(prs, reviews):
+        return ({(pr["url"], pr["review_status"]) for pr in prs},
+                {rev["url"] for rev in reviews})
+
+    same = rows(*results["graphql"]) == rows(*results["rest"])
+    close_session()
+    print("Same PRs and reviews from both" if same else "GraphQL and REST disagree")
+    return 0 if same else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""Compares the sequential walker with the work-stealing pool in get_git_repos.
+
+    python benchmarks/bench_scan.py --latency-ms 2 --workers 1 4 8 16
+
+--latency-ms adds a sleep to every scandir/stat call to mimic an NFS or SSHFS
+mount; on a local SSD both walkers are CPU-bound and the difference is small.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic_tree import make_tree
+from services.git_service import get_git_repos
+
+
+def add_latency(seconds):
+    real_scandir, real_stat = os.scandir, os.stat
+
+    def slow_scandir(*args, **kwargs):
+        time.sleep(seconds)
+        return real_scandir(*args, **kwargs)
+
+    def slow_stat(*args, **kwargs):
+        time.sleep(seconds)
+        return real_stat(*args, **kwargs)
+
+    os.scandir, os.stat = slow_scandir, slow_stat
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--dirs-per-level", type=int, default=6)
+    parser.add_argument("--depth", type=int, default=3)
+    parser.add_argument("--latency-ms", type=float, default=0)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 8, 16])
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as root:
+        n = make_tree(root, args.dirs_per_level, args.depth)
+        if args.latency_ms:
+            add_latency(args.latency_ms / 1000)
+        print(f"{n} repos, depth {args.depth}, latency {args.latency_ms} ms")
+
+        baseline = None
+        for workers in args.workers:
+            best = float("inf")
+            for _ in range(args.runs):
+                start = time.perf_counter()
+                found = get_git_repos(root, args.depth, use_index=False, workers=workers)
+                best = min(best, time.perf_counter() - start)
+            assert len(found) == n, f"expected {n} repos, got {len(found)}"
+            baseline = baseline or best
+            print(f"workers={workers:<3} {best * 1000:8.1f} ms  {baseline / best:5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""Times the hot paths of the dashboard on synthetic trees of 100/1k/10k repos.
+
+    python benchmarks/bench_suite.py
+    python benchmarks/bench_suite.py --sizes 1000 --packed-refs --config-lines 200
+    python benchmarks/bench_suite.py --compare benchmarks/results/<older>.json
+
+Covers the scan (get_git_repos), remote URL extraction, and the repo table's
+update_list (cleared, filtered, typed a key at a time) / sort_column. Each result has the best-of-N time, throughput
+(repos/s) and the peak Python allocation seen by tracemalloc. Results are
+written as JSON (benchmarks/results/<commit>.json by default) so two commits
+can be compared with --compare.
+
+Runs headless: without a display the table benchmarks drive HeadlessTree,
+an in-memory stand-in for ttk.Treeview, so they time our own code only.
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from benchmarks.synthetic_tree import make_repo_tree
+import services.git_meta as git_meta
+import services.git_objects as git_objects
+from services.git_service import extract_git_url, get_git_repos
+from ui.main_window import DarkRepoLauncher
+from ui.tree_rows import TreeRows
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+RESULTS_DIR = os.path.join(REPO_ROOT, "benchmarks", "results")
+COLUMNS = ("Name", "Link", "Status", "Branch", "Upstream", "Ahead", "Behind", "Last Commit")
+
+
+class HeadlessTree:
+    """Just enough of ttk.Treeview for the launcher's table code to run."""
+
+    def __init__(self, columns=()):
+        self.columns = columns
+        self.items = {}
+        self.children = []  # Attached items, in order; the rest are detached
+
+    def __getitem__(self, option):
+        return self.columns if option == "columns" else None
+
+    def get_children(self, item=""):
+        return tuple(self.children)
+
+    def set_children(self, item, *children):
+        self.children = list(children)
+
+    def delete(self, *items):
+        for item in items:
+            del self.items[item]
+        gone = set(items)
+        self.children = [c for c in self.children if c not in gone]
+
+    def insert(self, parent, index, iid=None, values=(), tags=()):
+        iid = iid or f"I{len(self.items):05d}"
+        self.items[iid] = {"values": list(values), "tags": tags}
+        self.children.append(iid)
+        return iid
+
+    def item(self, item, **options):
+        self.items[item].update(options)
+
+    def exists(self, item):
+        return item in self.items
+
+    def set(self, item, column=None, value=None):
+        pass
+
+    def selection(self):
+        return ()
+
+    def selection_remove(self, *items):
+        pass
+
+
+class Var:
+    def __init__(self, value=""):
+        self.value = value
+
+    def get(self):
+        return self.value
+
+    def set(self, value):
+        self.value = value
+
+
+def make_launcher(repos):
+    """A DarkRepoLauncher with only the table state, skipping the rest of __init__."""
+    launcher = DarkRepoLauncher.__new__(DarkRepoLauncher)
+    launcher.all_repos = list(repos)
+    launcher.filtered_repos = []
+    launcher.matcher = None
+    launcher.rows_source = None
+    launcher.link_row = None
+    launcher.search_after = None
+    launcher.sort_reverse = {"Name": False, "Last Commit": True}
+    launcher.search_var = Var()
+    launcher.status_var = Var()
+    launcher.tree = None
+    if os.environ.get("DISPLAY"):
+        try:
+            import tkinter as tk
+            from tkinter import ttk
+
+            tk_root = tk.Tk()
+            tk_root.withdraw()
+            launcher.tree = ttk.Treeview(tk_root, columns=COLUMNS, show="headings")
+        except Exception:
+            launcher.tree = None
+    launcher.tree = launcher.tree or HeadlessTree(COLUMNS)
+    launcher.rows = TreeRows(launcher.tree, key=lambda repo: repo["path"], values=launcher.row_values)
+    return launcher
+
+
+def clear_caches():
+    """Forget everything the readers memoized, for cold-cache timings."""
+    git_meta._file_cache.clear()
+    git_objects._commit_cache.clear()
+    git_objects.close_packs()
+
+
+def measure(fn, runs, setup=None):
+    """Best-of-runs wall time, then one extra traced run for peak memory."""
+    best = float("inf")
+    for _ in range(runs):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    if setup:
+        setup()
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak
+
+
+def run_size(size, args):
+    results = []
+    with tempfile.TemporaryDirectory() as root:
+        start = time.perf_counter()
+        paths = make_repo_tree(root, size, args.depth, args.packed_refs, args.config_lines)
+        print(f"\n{size} repos (generated in {time.perf_counter() - start:.1f}s)")
+
+        repos = []
+
+        def scan():
+            repos[:] = get_git_repos(root, args.depth, use_index=False, workers=args.workers)
+
+        def urls():
+            for path in paths:
+                extract_git_url(path)
+
+        cases = [
+            ("get_git_repos (cold)", scan, clear_caches),
+            ("get_git_repos (warm)", scan, None),
+            ("extract_git_url (cold)", urls, clear_caches),
+            ("extract_git_url (warm)", urls, None),
+        ]
+        for name, fn, setup in cases:
+            results.append(record(size, name, *measure(fn, args.runs, setup)))
+        assert len(repos) == size, f"expected {size} repos, got {len(repos)}"
+
+        launcher = make_launcher(repos)
+
+        def search(term):
+            def fn():
+                launcher.search_var.set(term)
+                launcher.update_list()
+            return fn
+
+        def typing(query):
+            # One update per keystroke, as if every key outran the debounce
+            def fn():
+                for end in range(1, len(query) + 1):
+                    search(query[:end])()
+            return fn
+
+        cases = [
+            ("update_list", search("")),
+            ("update_list (filtered)", search("repo-1")),
+            ("update_list (typing)", typing("repo-12")),
+            ("sort_column Name", lambda: launcher.sort_column("Name")),
+            ("sort_column Last Commit", lambda: launcher.sort_column("Last Commit")),
+        ]
+        for name, fn in cases:
+            results.append(record(size, name, *measure(fn, args.runs, search(""))))
+    return results
+
+
+def record(size, name, seconds, peak):
+    result = {
+        "size": size,
+        "name": name,
+        "seconds": seconds,
+        "repos_per_second": size / seconds if seconds else None,
+        "peak_kib": peak / 1024,
+    }
+    print(f"  {name:<26} {seconds * 1000:9.1f} ms  {result['repos_per_second']:11.0f} repos/s"
+          f"  {result['peak_kib']:9.0f} KiB peak")
+    return result
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "-C", REPO_ROOT, "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, timeout=5,
+        ).stdout.strip() or "unknown"
+    except (OSError, subprocess.TimeoutExpired):
+        return "unknown"
+
+
+def compare(results, baseline_path):
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    before = {(r["size"], r["name"]): r["seconds"] for r in baseline["results"]}
+    print(f"\nvs {baseline['commit']} ({baseline_path})")
+    for r in results:
+        old = before.get((r["size"], r["name"]))
+        if old:
+            change = (r["seconds"] - old) / old * 100
+            print(f"  {r['size']:>6} {r['name']:<26} {change:+7.1f}%")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--depth", type=int, default=2)
+    parser.add_argument("--packed-refs", action="store_true", help="packed-refs instead of loose refs")
+    parser.add_argument("--config-lines", type=int, default=0, help="pad each .git/config to ~N lines")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--output", help="results file (default benchmarks/results/<commit>.json)")
+    parser.add_argument("--compare", help="earlier results file to diff against")
+    args = parser.parse_args()
+
+    commit = git_commit()
+    results = []
+    for size in args.sizes:
+        results.extend(run_size(size, args))
+
+    output = args.output or os.path.join(RESULTS_DIR, f"{commit}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump({
+            "commit": commit,
+            "timestamp": time.time(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "options": vars(args),
+            "max_rss_kib": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss if resource else None,
+            "results": results,
+        }, f, indent=2)
+    print(f"\nWrote {output}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
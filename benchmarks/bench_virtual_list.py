@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""Compares the repo table widgets at 100k rows: ttk.Treeview vs VirtualList.
+
+    python benchmarks/bench_virtual_list.py --rows 100000
+    xvfb-run python benchmarks/bench_virtual_list.py      # on a headless box
+
+For each widget, fills the table the way the launcher does (TreeRows over
+synthetic repos), then times a filter (typing QUERY into the fuzzy matcher),
+clearing it, and scrolling through the list in SCROLL_STEPS jumps, each
+followed by a full redraw. Also reports how much the process grew (RSS) to
+hold the rows. Needs a display; Tk can't draw without one.
+"""
+import argparse
+import os
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+import tkinter as tk
+from tkinter import ttk
+
+from benchmarks.synthetic_tree import make_repo_entries
+from services.fuzzy import FuzzyIndex
+from ui.theme import BG_MAIN, BG_STRIPE, apply_ttk_styles
+from ui.tree_rows import TreeRows
+from ui.virtual_list import VirtualList
+
+COLUMNS = ("Name", "Link", "Status", "Branch", "Upstream", "Ahead", "Behind", "Last Commit")
+QUERY = "billing-api"
+SCROLL_STEPS = 50
+
+
+def rss_kib():
+    """Resident memory from /proc (Tcl's allocations don't show in tracemalloc)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") // 1024
+    except (OSError, ValueError):
+        return None
+
+
+def row_values(repo):
+    return (f"  {repo['name']}", "", "", repo["branch"], "", "", "", "3 days ago")
+
+
+def timed(root, fn):
+    start = time.perf_counter()
+    fn()
+    root.update()  # Includes the redraw Tk does once we're idle
+    return (time.perf_counter() - start) * 1000
+
+
+def run(widget_class, repos, root):
+    frame = tk.Frame(root, bg=BG_MAIN)
+    frame.pack(fill=tk.BOTH, expand=True)
+    tree = widget_class(frame, columns=COLUMNS, show="headings")
+    for col in COLUMNS:
+        tree.heading(col, text=col.upper())
+        tree.column(col, width=100)
+    tree.tag_configure("oddrow", background=BG_MAIN)
+    tree.tag_configure("evenrow", background=BG_STRIPE)
+    tree.pack(fill=tk.BOTH, expand=True)
+    root.update()
+
+    rows = TreeRows(tree, key=lambda repo: repo["path"], values=row_values)
+    matcher = FuzzyIndex(repos)
+
+    before = rss_kib()
+    results = {"fill": timed(root, lambda: rows.show(repos))}
+    after = rss_kib()
+
+    def type_query():
+        for end in range(1, len(QUERY) + 1):
+            rows.show(matcher.search(QUERY[:end]))
+            root.update()
+
+    results["filter (per key)"] = timed(root, type_query) / len(QUERY)
+    results["clear filter"] = timed(root, lambda: rows.show(repos))
+
+    def scroll():
+        for step in range(SCROLL_STEPS):
+            tree.yview("moveto", step / SCROLL_STEPS)
+            root.update()
+
+    results["scroll (per jump)"] = timed(root, scroll) / SCROLL_STEPS
+    if before is not None and after is not None:
+        results["memory"] = after - before
+
+    frame.destroy()
+    root.update()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--only", choices=("treeview", "virtual"))
+    args = parser.parse_args()
+
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        sys.exit(f"Needs a display ({e}); try xvfb-run")
+    root.geometry("900x700")
+    apply_ttk_styles(ttk.Style())
+
+    repos = make_repo_entries(args.rows)
+    print(f"{args.rows} rows")
+    widgets = [("treeview", ttk.Treeview), ("virtual", VirtualList)]
+    for name, widget_class in widgets:
+        if args.only and args.only != name:
+            continue
+        results = run(widget_class, repos, root)
+        print(f"  {name}")
+        for label, value in results.items():
+            unit = "KiB" if label == "memory" else "ms"
+            print(f"    {label:<20} {value:10.1f} {unit}")
+    root.destroy()
+
+
+if __name__ == "__main__":
+    main()
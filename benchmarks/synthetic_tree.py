@@ -0,0 +1,166 @@
+import hashlib
+import math
+import os
+import random
+import zlib
+
+
+def make_tree(root, dirs_per_level=6, depth=3, repo_ratio=0.3, seed=1):
+    """Builds a throwaway directory tree with fake .git folders sprinkled in.
+
+    Returns the number of repos created. Repos only get the handful of files the
+    scanner looks at (config and COMMIT_EDITMSG), which is all we need to time
+    the walk itself.
+    """
+    rng = random.Random(seed)
+    count = 0
+
+    def make_repo(path, n):
+        git_dir = os.path.join(path, ".git")
+        os.makedirs(git_dir, exist_ok=True)
+        with open(os.path.join(git_dir, "config"), "w") as f:
+            f.write(f'[remote "origin"]\n\turl = git@github.com:acme/repo-{n}.git\n')
+        with open(os.path.join(git_dir, "COMMIT_EDITMSG"), "w") as f:
+            f.write("synthetic\n")
+        os.makedirs(os.path.join(path, "src"), exist_ok=True)
+
+    def fill(path, level):
+        nonlocal count
+        for i in range(dirs_per_level):
+            child = os.path.join(path, f"dir{level}_{i}")
+            os.makedirs(child, exist_ok=True)
+            if level == depth or rng.random() < repo_ratio:
+                make_repo(child, count)
+                count += 1
+            else:
+                fill(child, level + 1)
+
+    os.makedirs(root, exist_ok=True)
+    fill(root, 1)
+    return count
+
+
+def write_loose_object(git_dir, obj_type, body):
+    """Stores an object the way git does (zlib, objects/xx/yyyy) and returns its SHA."""
+    raw = f"{obj_type} {len(body)}\0".encode() + body
+    sha = hashlib.sha1(raw).hexdigest()
+    obj_dir = os.path.join(git_dir, "objects", sha[:2])
+    os.makedirs(obj_dir, exist_ok=True)
+    with open(os.path.join(obj_dir, sha[2:]), "wb") as f:
+        f.write(zlib.compress(raw))
+    return sha
+
+
+def make_git_repo(path, n, rng, packed_refs=False, config_lines=0, tags=10):
+    """A repo the metadata readers can't tell from a real one: HEAD, a commit,
+    a tracking branch with its remote ref, and optionally a padded config.
+    """
+    git_dir = os.path.join(path, ".git")
+    for sub in ("objects/info", "objects/pack", "refs/heads", "refs/tags", "refs/remotes/origin"):
+        os.makedirs(os.path.join(git_dir, sub), exist_ok=True)
+
+    stamp = 1_600_000_000 + rng.randrange(100_000_000)
+    tree = write_loose_object(git_dir, "tree", b"")
+    commit = write_loose_object(git_dir, "commit", (
+        f"tree {tree}\n"
+        f"author bench <bench@example.com> {stamp} +0000\n"
+        f"committer bench <bench@example.com> {stamp} +0000\n\n"
+        f"commit {n}\n"
+    ).encode())
+
+    refs = {"refs/heads/main": commit, "refs/remotes/origin/main": commit}
+    refs.update({f"refs/tags/v{t}": commit for t in range(tags)})
+    if packed_refs:
+        with open(os.path.join(git_dir, "packed-refs"), "w") as f:
+            f.write("# pack-refs with: peeled fully-peeled sorted \n")
+            for name in sorted(refs):
+                f.write(f"{refs[name]} {name}\n")
+    else:
+        for name, sha in refs.items():
+            with open(os.path.join(git_dir, name), "w") as f:
+                f.write(sha + "\n")
+
+    with open(os.path.join(git_dir, "HEAD"), "w") as f:
+        f.write("ref: refs/heads/main\n")
+    with open(os.path.join(git_dir, "COMMIT_EDITMSG"), "w") as f:
+        f.write(f"commit {n}\n")
+
+    url = (f"git@github.com:acme/repo-{n}.git" if n % 2
+           else f"https://github.com/acme/repo-{n}")
+    lines = [
+        "[core]", "\trepositoryformatversion = 0", "\tbare = false",
+        '[remote "origin"]', f"\turl = {url}", "\tfetch = +refs/heads/*:refs/remotes/origin/*",
+        '[branch "main"]', "\tremote = origin", "\tmerge = refs/heads/main",
+    ]
+    # Padding: the extra remotes and branches long-lived clones accumulate
+    extra = 0
+    while extra < config_lines:
+        lines += [f'[remote "fork{extra}"]', f"\turl = git@github.com:user{extra}/repo-{n}.git",
+                  f'[branch "feature-{extra}"]', f"\tremote = fork{extra}",
+                  f"\tmerge = refs/heads/feature-{extra}"]
+        extra += 5
+    with open(os.path.join(git_dir, "config"), "w") as f:
+        f.write("\n".join(lines) + "\n")
+
+
+def make_repo_tree(root, repos, depth=2, packed_refs=False, config_lines=0, seed=1):
+    """Builds exactly `repos` git repos, spread evenly `depth` folders deep.
+
+    Returns the repo paths. Use with get_git_repos(root, depth).
+    """
+    rng = random.Random(seed)
+    fanout = max(2, math.ceil(repos ** (1 / depth)))
+    paths = []
+    for n in range(repos):
+        parts = []
+        rest = n
+        for _ in range(depth - 1):
+            parts.append(f"group{rest % fanout}")
+            rest //= fanout
+        path = os.path.join(root, *reversed(parts), f"repo-{n}")
+        os.makedirs(path, exist_ok=True)
+        make_git_repo(path, n, rng, packed_refs, config_lines)
+        paths.append(path)
+    return paths
+
+
+NAME_WORDS = (
+    "api", "web", "app", "service", "billing", "auth", "core", "data", "ml", "pipeline",
+    "dashboard", "infra", "tools", "sdk", "client", "server", "docs", "legacy", "mobile",
+    "ios", "android", "ui", "kit", "proto", "gateway", "search", "index", "worker",
+    "queue", "cache", "payments", "notify", "admin", "etl", "terraform", "charts",
+)
+ORGS = ("work", "oss", "personal", "clients/acme", "clients/globex", "forks", "archive")
+
+
+def make_repo_entries(count, root="/home/dev/code", seed=1, now=1_700_000_000):
+    """In-memory repo dicts shaped like build_repo_entry's, no disk involved.
+
+    Names are realistic-looking (`billing-api`, `mlPipeline2`, ...) with lots of
+    shared words, spread over a few org folders with a year of commit times.
+    """
+    rng = random.Random(seed)
+    repos = []
+    used = set()
+    for n in range(count):
+        words = rng.sample(NAME_WORDS, rng.randint(1, 3))
+        if rng.random() < 0.2:
+            name = words[0] + "".join(w.title() for w in words[1:])
+        else:
+            name = rng.choice("-_").join(words)
+        if rng.random() < 0.5:
+            name += str(n)
+        org = rng.choice(ORGS)
+        if (org, name) in used:  # Paths are row ids, so no two repos can share one
+            name += f"-{n}"
+        used.add((org, name))
+        mtime = now - rng.random() * 86400 * 365
+        repos.append({
+            "name": name,
+            "path": os.path.join(root, *org.split("/"), name),
+            "root": root,
+            "mtime": mtime,
+            "branch": rng.choice(("main", "master", "develop", f"feature-{n}")),
+            "remote_key": f"github.com/{org.split('/')[-1]}/{name}".lower(),
+        })
+    return repos
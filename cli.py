@@ -0,0 +1,118 @@
+"""Terminal front end: `app.py list` and `app.py open NAME`.
+
+Only imports the scanning side of services, never tkinter, PIL, httpx or
+keyring. `list` still walks the search paths (skipping folders the index
+says are unchanged) and reads every repo's branch, HEAD commit, remotes and
+ahead/behind, which can spawn `git rev-list` for repos without a
+commit-graph, so it takes as long as a rescan. `list --cached` prints the
+index rows as the last scan left them, in tens of milliseconds; that's the
+one for scripts and shell prompts.
+"""
+import argparse
+import json
+import sys
+
+import services.config as config
+from services.fuzzy import FuzzyIndex
+from services.git_service import RepoScan, ScanRoot, load_cached_repos
+
+# Fields written by `list --json`, and the column order of `list --tsv`
+JSON_FIELDS = (
+    "name", "path", "root", "branch", "detached", "head_sha", "upstream",
+    "ahead", "behind", "mtime", "remote_url", "remote_key", "remotes",
+)
+TSV_FIELDS = ("name", "path", "branch", "upstream", "ahead", "behind", "mtime", "remote_url")
+
+
+def get_repos(cached=False):
+    roots = ScanRoot.from_config()
+    if cached:
+        return load_cached_repos(roots)
+    return RepoScan(roots).run()
+
+
+def filter_repos(repos, term):
+    """Same matching as the search box: ranked fuzzy matches, best first."""
+    if not (term or "").strip():
+        return list(repos)
+    return FuzzyIndex(repos).search(term)
+
+
+def sort_repos(repos, key):
+    if key == "mtime":
+        return sorted(repos, key=lambda r: r["mtime"], reverse=True)
+    return sorted(repos, key=lambda r: r["name"].lower())
+
+
+def find_repo(repos, name):
+    """An exact (case-insensitive) name match, else the only repo containing it.
+
+    Returns (repo, candidates); repo is None when nothing or several match.
+    """
+    exact = [r for r in repos if r["name"].lower() == name.lower()]
+    if len(exact) == 1:
+        return exact[0], exact
+    candidates = exact or [r for r in repos if name.lower() in r["name"].lower()]
+    return (candidates[0] if len(candidates) == 1 else None), candidates
+
+
+def print_repos(repos, fmt, out=sys.stdout):
+    if fmt == "json":
+        json.dump([{k: repo.get(k) for k in JSON_FIELDS} for repo in repos], out, indent=2)
+        out.write("\n")
+    elif fmt == "tsv":
+        for repo in repos:
+            values = ["" if repo.get(k) is None else str(repo.get(k)) for k in TSV_FIELDS]
+            out.write("\t".join(v.replace("\t", " ") for v in values) + "\n")
+    else:
+        width = max((len(r["name"]) for r in repos), default=0)
+        for repo in repos:
+            out.write(f"{repo['name']:<{width}}  {repo.get('branch') or '':<20}  "
+                      f"{repo.get('time_ago', ''):>8}  {repo['path']}\n")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="repos", description="Git repo dashboard")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    list_cmd = sub.add_parser("list", help="print the repos under your search paths")
+    fmt = list_cmd.add_mutually_exclusive_group()
+    fmt.add_argument("--json", dest="format", action="store_const", const="json")
+    fmt.add_argument("--tsv", dest="format", action="store_const", const="tsv")
+    list_cmd.add_argument("--filter", default="",
+                          help="only repos matching this, best match first (like the search box)")
+    list_cmd.add_argument("--sort", choices=("name", "mtime"),
+                          help="default: name, or best match first with --filter")
+    list_cmd.add_argument("--cached", action="store_true",
+                          help="print the last scan from the index without walking the disk "
+                               "or reading any repo (fast, for scripts and prompts)")
+
+    open_cmd = sub.add_parser("open", help="open a repo in your editor")
+    open_cmd.add_argument("name")
+    open_cmd.add_argument("--cached", action="store_true")
+
+    args = parser.parse_args(argv)
+    repos = get_repos(args.cached)
+
+    if args.command == "list":
+        repos = filter_repos(repos, args.filter)
+        if args.sort or not args.filter:
+            repos = sort_repos(repos, args.sort or "name")
+        print_repos(repos, args.format)
+        return 0
+
+    repo, candidates = find_repo(repos, args.name)
+    if repo is None:
+        if candidates:
+            print(f"'{args.name}' matches several repos:", file=sys.stderr)
+            for candidate in sort_repos(candidates, "name"):
+                print(f"  {candidate['name']}  {candidate['path']}", file=sys.stderr)
+        else:
+            print(f"No repo named '{args.name}'", file=sys.stderr)
+        return 1
+
+    from services.editor import open_in_editor
+
+    open_in_editor(repo["path"])
+    print(f"Opening {repo['path']} in {config.get_editor()}")
+    return 0
@@ -1,6 +1,6 @@
 import keyring
 import httpx
-import asyncio
+from services.github_session import get_session
 
 SERVICE_NAME = "GitRepoLauncher"
 
@@ -14,8 +14,8 @@ class AuthService:
         }
         
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get("https://api.github.com/user", headers=headers, timeout=5)
+            client = get_session().client
+            response = await client.get("https://api.github.com/user", headers=headers, timeout=5)
             
             if response.status_code == 200:
                 user_data = response.json()
@@ -36,8 +36,8 @@ class AuthService:
 
     @staticmethod
     def validate_and_save(token):
-        """Sync wrapper for the async validation."""
-        return asyncio.run(AuthService.validate_and_save_async(token))
+        """Sync wrapper for the async validation, run on the shared GitHub session."""
+        return get_session().run(AuthService.validate_and_save_async(token))
 
     @staticmethod
     def get_current_user():
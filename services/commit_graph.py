@@ -0,0 +1,340 @@
+import heapq
+import mmap
+import os
+import struct
+import subprocess
+import threading
+from collections import OrderedDict
+
+from services.git_meta import resolve_git_dir
+from services.git_objects import read_commit
+
+GRAPH_SIGNATURE = b"CGPH"
+PARENT_NONE = 0x70000000
+PARENT_EXTRA = 0x80000000
+
+# repo path -> (local sha, upstream sha) -> (ahead, behind); both tips pin
+# the answer. Only the last few pairs per repo are kept, since old tips don't
+# come back once a branch moves on
+_ab_cache = {}
+AB_PAIRS_PER_REPO = 4
+# common dir -> (signature, CommitGraph), least recently used first. Each
+# layer holds a map and so a file descriptor, which mustn't pile up per repo
+_graph_cache = OrderedDict()
+GRAPH_CACHE_SIZE = 16
+_lock = threading.Lock()
+
+
+class GraphLayer:
+    """One commit-graph file, memory-mapped."""
+
+    def __init__(self, path, base_count):
+        self.path = path
+        self.base_count = base_count  # Commits in the layers below this one
+        with open(path, "rb") as f:
+            self.buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self._read_header()
+        except Exception:
+            self.buf.close()
+            raise
+
+    def _read_header(self):
+        buf = self.buf
+        if buf[:4] != GRAPH_SIGNATURE or buf[5] != 1:  # version, SHA-1 only
+            raise ValueError(f"unsupported commit-graph {self.path}")
+        chunk_count = buf[6]
+        chunks = {}
+        for i in range(chunk_count + 1):
+            chunk_id, offset = struct.unpack_from(">4sQ", buf, 8 + i * 12)
+            chunks[chunk_id] = offset
+        self.fanout = chunks[b"OIDF"]
+        self.oids = chunks[b"OIDL"]
+        self.data = chunks[b"CDAT"]
+        self.edges = chunks.get(b"EDGE")
+        self.count = struct.unpack_from(">I", buf, self.fanout + 255 * 4)[0]
+
+    def find(self, sha_bin):
+        first = sha_bin[0]
+        lo = struct.unpack_from(">I", self.buf, self.fanout + (first - 1) * 4)[0] if first else 0
+        hi = struct.unpack_from(">I", self.buf, self.fanout + first * 4)[0]
+        while lo < hi:
+            mid = (lo + hi) // 2
+            start = self.oids + mid * 20
+            name = self.buf[start:start + 20]
+            if name < sha_bin:
+                lo = mid + 1
+            elif name > sha_bin:
+                hi = mid
+            else:
+                return mid
+        return None
+
+    def oid(self, local_pos):
+        start = self.oids + local_pos * 20
+        return self.buf[start:start + 20]
+
+    def close(self):
+        self.buf.close()
+
+
+class CommitGraph:
+    """A repo's commit-graph: a single file or a chain of split layers.
+
+    Commit positions are global across the chain (base layer first), which is
+    how parent pointers are stored.
+    """
+
+    def __init__(self, layers):
+        self.layers = layers
+        self.users = 0  # Walks in progress, counted under _lock
+        self.retired = False  # Out of the cache: closed once users drops to 0
+
+    @classmethod
+    def load(cls, common_dir):
+        """The repo's graph, or None if it has none. Held open for the caller
+        until release()."""
+        info_dir = os.path.join(common_dir, "objects", "info")
+        chain_file = os.path.join(info_dir, "commit-graphs", "commit-graph-chain")
+        paths = []
+        if os.path.exists(chain_file):
+            with open(chain_file) as f:
+                paths = [
+                    os.path.join(info_dir, "commit-graphs", f"graph-{line.strip()}.graph")
+                    for line in f
+                    if line.strip()
+                ]
+        elif os.path.exists(os.path.join(info_dir, "commit-graph")):
+            paths = [os.path.join(info_dir, "commit-graph")]
+        if not paths:
+            return None
+
+        signature = tuple((p, os.stat(p).st_mtime_ns) for p in paths)
+        with _lock:
+            cached = _graph_cache.get(common_dir)
+            if cached and cached[0] == signature:
+                _graph_cache.move_to_end(common_dir)
+                cached[1].users += 1
+                return cached[1]
+
+        layers = []
+        base = 0
+        try:
+            for path in paths:
+                layer = GraphLayer(path, base)
+                layers.append(layer)
+                base += layer.count
+        except Exception:
+            cls(layers).close()
+            raise
+        graph = cls(layers)
+        graph.users = 1
+        with _lock:
+            replaced = _graph_cache.pop(common_dir, None)
+            if replaced:
+                replaced[1].retire()
+            _graph_cache[common_dir] = (signature, graph)
+            while len(_graph_cache) > GRAPH_CACHE_SIZE:
+                _graph_cache.popitem(last=False)[1][1].retire()
+        return graph
+
+    def retire(self):
+        """Closes a graph taken out of the cache, or has the last walk still
+        using it do so. Call with _lock held."""
+        self.retired = True
+        if not self.users:
+            self.close()
+
+    def release(self):
+        """Ends a walk of a graph from load()."""
+        with _lock:
+            self.users -= 1
+            if self.retired and not self.users:
+                self.close()
+
+    def close(self):
+        for layer in self.layers:
+            layer.close()
+
+    def position(self, sha):
+        sha_bin = bytes.fromhex(sha)
+        # Newer layers sit on top of the chain, look there first
+        for layer in reversed(self.layers):
+            local = layer.find(sha_bin)
+            if local is not None:
+                return layer.base_count + local
+        return None
+
+    def _layer(self, pos):
+        for layer in reversed(self.layers):
+            if pos >= layer.base_count:
+                return layer, pos - layer.base_count
+        raise IndexError(pos)
+
+    def sha(self, pos):
+        layer, local = self._layer(pos)
+        return layer.oid(local).hex()
+
+    def commit(self, pos):
+        """Returns (generation, parent positions) for a graph position."""
+        layer, local = self._layer(pos)
+        start = layer.data + local * 36 + 20  # skip the tree OID
+        parent1, parent2, gen_word, _ = struct.unpack_from(">IIII", layer.buf, start)
+        parents = []
+        if parent1 != PARENT_NONE:
+            parents.append(parent1)
+        if parent2 != PARENT_NONE:
+            if parent2 & PARENT_EXTRA and layer.edges is not None:
+                # Octopus merge: the rest of the parents live in the EDGE chunk
+                i = parent2 & ~PARENT_EXTRA
+                while True:
+                    edge = struct.unpack_from(">I", layer.buf, layer.edges + i * 4)[0]
+                    parents.append(edge & ~PARENT_EXTRA)
+                    if edge & PARENT_EXTRA:
+                        break
+                    i += 1
+            else:
+                parents.append(parent2)
+        return gen_word >> 2, parents
+
+
+class _Walker:
+    """Generation numbers and parents for commits, graph first, objects second.
+
+    Commits made after the graph was written aren't in it; for those we read
+    the commit object and derive a generation number from their parents, so
+    the walk order stays topological.
+    """
+
+    def __init__(self, graph, common_dir):
+        self.graph = graph
+        self.common_dir = common_dir
+        self.info = {}  # sha -> (generation, parent shas)
+
+    def get(self, sha):
+        if sha in self.info:
+            return self.info[sha]
+
+        pending = [sha]
+        while pending:
+            current = pending[-1]
+            if current in self.info:
+                pending.pop()
+                continue
+            pos = self.graph.position(current)
+            if pos is not None:
+                gen, parents = self.graph.commit(pos)
+                self.info[current] = (gen, [self.graph.sha(p) for p in parents])
+                pending.pop()
+                continue
+            commit = read_commit(self.common_dir, current)
+            if commit is None:
+                raise LookupError(current)
+            missing = [p for p in commit["parents"] if p not in self.info]
+            if missing:
+                pending.extend(missing)
+                continue
+            gen = 1 + max((self.info[p][0] for p in commit["parents"]), default=0)
+            self.info[current] = (gen, commit["parents"])
+            pending.pop()
+        return self.info[sha]
+
+
+def count_ahead_behind(graph, common_dir, local, upstream):
+    """Walks both histories in descending generation order.
+
+    A commit can only be reached from commits with a higher generation, so by
+    the time one is popped its left/right flags are final. The walk stops as
+    soon as everything still queued is reachable from both tips.
+    """
+    LEFT, RIGHT = 1, 2
+    walker = _Walker(graph, common_dir)
+    flags = {local: LEFT}
+    flags[upstream] = flags.get(upstream, 0) | RIGHT
+    queue = []
+    for sha in {local, upstream}:
+        heapq.heappush(queue, (-walker.get(sha)[0], sha))
+    queued = {local, upstream}
+    uncommon = sum(1 for sha in queued if flags[sha] != LEFT | RIGHT)
+
+    ahead = behind = 0
+    while queue and uncommon:
+        _, sha = heapq.heappop(queue)
+        queued.discard(sha)
+        flag = flags[sha]
+        if flag != LEFT | RIGHT:
+            uncommon -= 1
+        if flag == LEFT:
+            ahead += 1
+        elif flag == RIGHT:
+            behind += 1
+
+        for parent in walker.get(sha)[1]:
+            old = flags.get(parent, 0)
+            new = old | flag
+            if parent in queued:
+                if old != LEFT | RIGHT and new == LEFT | RIGHT:
+                    uncommon -= 1
+                flags[parent] = new
+            elif new != old:
+                flags[parent] = new
+                heapq.heappush(queue, (-walker.get(parent)[0], parent))
+                queued.add(parent)
+                if new != LEFT | RIGHT:
+                    uncommon += 1
+    return ahead, behind
+
+
+def _rev_list_count(repo_path, local, upstream):
+    try:
+        result = subprocess.run(
+            ["git", "rev-list", "--left-right", "--count", f"{local}...{upstream}"],
+            cwd=repo_path, capture_output=True, text=True, timeout=10,
+            env=dict(os.environ, GIT_OPTIONAL_LOCKS="0"),
+        )
+        ahead, behind = result.stdout.split()
+        return int(ahead), int(behind)
+    except (OSError, ValueError, subprocess.TimeoutExpired):
+        return None
+
+
+def get_ahead_behind(repo_path, local, upstream):
+    """(ahead, behind) of `local` relative to `upstream`, or (None, None).
+
+    Uses the commit-graph when the repo has one and only shells out to
+    `git rev-list` when it doesn't. Cached by the pair of tip SHAs.
+    """
+    if not local or not upstream:
+        return None, None
+    if local == upstream:
+        return 0, 0
+    with _lock:
+        pairs = _ab_cache.get(repo_path)
+        if pairs and (local, upstream) in pairs:
+            pairs.move_to_end((local, upstream))
+            return pairs[(local, upstream)]
+
+    result = None
+    _, common_dir = resolve_git_dir(repo_path)
+    try:
+        graph = CommitGraph.load(common_dir) if common_dir else None
+    except (OSError, ValueError, KeyError, struct.error):
+        graph = None
+    if graph:
+        try:
+            result = count_ahead_behind(graph, common_dir, local, upstream)
+        except (LookupError, OSError, ValueError, struct.error):
+            result = None
+        finally:
+            graph.release()
+    if result is None:
+        result = _rev_list_count(repo_path, local, upstream)
+    if result is None:
+        return None, None
+
+    with _lock:
+        pairs = _ab_cache.setdefault(repo_path, OrderedDict())
+        pairs[(local, upstream)] = result
+        if len(pairs) > AB_PAIRS_PER_REPO:
+            pairs.popitem(last=False)
+    return result
@@ -1,3 +1,4 @@
+import json
 import os
 import sys
 from dotenv import load_dotenv
@@ -17,3 +18,82 @@ def get_base_path():
 
 def get_search_depth():
     return int(os.getenv("DEPTH", 1))
+
+def get_scan_workers():
+    return max(1, int(os.getenv("SCAN_WORKERS", 8)))
+
+def get_stay_resident():
+    """Hide the window on close instead of exiting, so the next `repos` is instant."""
+    return os.getenv("STAY_RESIDENT", "false").lower() in ("1", "true", "yes")
+
+def get_virtual_table():
+    """Draw only the visible rows of the repo table, for lists of many thousands."""
+    return os.getenv("VIRTUAL_TABLE", "false").lower() in ("1", "true", "yes")
+
+def get_github_api():
+    """graphql (one query for PRs, reviews and CI; REST if it fails) or rest."""
+    api = os.getenv("GITHUB_API", "graphql").lower()
+    return api if api in ("graphql", "rest") else "graphql"
+
+def get_github_cache_mb():
+    """Disk space for cached GitHub responses (revalidated by ETag); 0 turns it off."""
+    return max(0, int(os.getenv("GITHUB_CACHE_MB", 20)))
+
+def get_github_concurrency():
+    """GitHub requests in flight at once; more trips GitHub's secondary rate limits."""
+    return max(1, int(os.getenv("GITHUB_MAX_CONCURRENCY", 6)))
+
+def get_watch_mode():
+    """off, auto (inotify when available, else polling) or poll."""
+    mode = os.getenv("WATCH_MODE", "off").lower()
+    return mode if mode in ("off", "auto", "poll") else "off"
+
+# Folders that hold dependencies or build output, never repos worth listing
+DEFAULT_PRUNE_PATTERNS = [
+    "node_modules", "bower_components", "venv", "env", "site-packages",
+    "__pycache__", "target", "build", "dist", "*.egg-info",
+]
+
+def get_prune_patterns():
+    value = os.getenv("PRUNE_PATTERNS")
+    if value is None:
+        return list(DEFAULT_PRUNE_PATTERNS)
+    return [p.strip() for p in value.split(",") if p.strip()]
+
+def get_max_dir_entries():
+    """Folders with more entries than this are not descended (0 disables)."""
+    return int(os.getenv("MAX_DIR_ENTRIES", 10000))
+
+def get_dir_time_budget():
+    """Seconds we're willing to spend listing a single folder (0 disables)."""
+    return int(os.getenv("DIR_TIME_BUDGET_MS", 2000)) / 1000
+
+def get_scan_roots():
+    """Search paths as [{"path", "depth", "prune"}], from SCAN_ROOTS (JSON).
+
+    Falls back to the single BASE_PATH / DEPTH pair when no list is configured.
+    """
+    value = os.getenv("SCAN_ROOTS")
+    if value:
+        try:
+            roots = [
+                {
+                    "path": r["path"],
+                    "depth": int(r.get("depth", 1)),
+                    "prune": list(r.get("prune", [])),
+                }
+                for r in json.loads(value)
+            ]
+            if roots:
+                return roots
+        except (ValueError, KeyError, TypeError):
+            print("Ignoring malformed SCAN_ROOTS")
+    return [{"path": get_base_path(), "depth": get_search_depth(), "prune": []}]
+
+def get_status_workers():
+    """How many `git status` processes may run at once."""
+    return max(1, int(os.getenv("STATUS_WORKERS", 4)))
+
+def get_status_timeout():
+    """Seconds before a single repo's `git status` is given up on."""
+    return float(os.getenv("STATUS_TIMEOUT", 10))
@@ -0,0 +1,21 @@
+import os
+import subprocess
+import sys
+
+import services.config as config
+
+
+def open_in_editor(path):
+    """Opens a repo in the configured editor, or the file manager if it's missing."""
+    try:
+        subprocess.Popen(
+            [config.get_editor(), path],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+    except FileNotFoundError:
+        if sys.platform == "win32":
+            os.startfile(path)  # Opens in default File Explorer
+        else:
+            cmd = "open" if sys.platform == "darwin" else "xdg-open"
+            subprocess.Popen([cmd, path])
@@ -0,0 +1,388 @@
+import math
+import re
+import time
+from bisect import bisect_left
+from collections import OrderedDict
+from itertools import chain, compress, repeat
+from operator import add, contains, eq, not_
+
+from services.trigrams import FIELDS, TrigramIndex, field_texts, parse_query, relative_paths
+
+# Word boundaries are marked with \x01 in the precomputed keys, so a boundary
+# test is a plain substring test and a boundary never matches a query char.
+BOUNDARY = "\x01"
+SEPARATORS_RE = re.compile(r"[\s\-_./\\]+")
+CAMEL_RE = re.compile(r"(?<=[a-z])(?=[A-Z])|(?<=[A-Za-z])(?=[0-9])|(?<=[0-9])(?=[A-Za-z])")
+
+SCORE_MATCH = 16
+BONUS_BOUNDARY = 8
+BONUS_CONSECUTIVE = 4
+PENALTY_GAP_START = 3
+PENALTY_GAP_EXTENSION = 1
+RECENCY_BONUS = 12  # For a commit today, fading out over ~2 months
+
+# Scoring each fuzzy hit is the one step that runs Python code per repo, so
+# it's skipped for tiers bigger than this (they keep the recency order)
+FULL_SCORE_LIMIT = 200
+# Above this many matches (a few letters typed) only names starting with the
+# text are pulled to the top: that's a bisect of the sorted names, and every
+# other tier is another pass over all the matches
+BROAD_MATCHES = 1000
+CACHE_SIZE = 64
+RESULTS_CACHE_SIZE = 16  # Whole result lists, for backspacing over a query
+# Free text this long also matches remotes and branches
+TRIGRAM_MIN = 3
+OTHER_FIELDS = ("remote", "branch")
+
+
+def bounded_key(text):
+    """Lowercased text with every word start (after a separator, camelCase or
+    letter/digit switch) marked by a leading BOUNDARY."""
+    text = CAMEL_RE.sub(BOUNDARY, text)
+    return BOUNDARY + SEPARATORS_RE.sub(BOUNDARY, text).lower()
+
+
+def bounded_keys(texts):
+    """bounded_key() for a whole list, as two regex passes over one string
+    rather than two per text. NUL never shows up in names or paths."""
+    joined = CAMEL_RE.sub(BOUNDARY, "\0".join(texts))
+    joined = SEPARATORS_RE.sub(BOUNDARY, joined).lower()
+    return [BOUNDARY + key for key in joined.split("\0")] if texts else []
+
+
+def recency_bonus(mtime, now):
+    age_days = max(0.0, (now - (mtime or 0)) / 86400)
+    return max(0.0, RECENCY_BONUS - 2 * math.log2(1 + age_days))
+
+
+def fuzzy_score(key, query):
+    """fzf-style score of `query` (compact, lowercase) as a subsequence of a
+    bounded key, or None if it doesn't match.
+
+    Finds the leftmost end of a match, then walks back from there to get the
+    tightest window, and scores that alignment: points per char, bonuses for
+    word starts and consecutive runs, penalties for gaps.
+    """
+    pos = -1
+    for ch in query:
+        pos = key.find(ch, pos + 1)
+        if pos < 0:
+            return None
+    positions = [pos]
+    for ch in reversed(query[:-1]):
+        pos = key.rfind(ch, 0, pos)
+        positions.append(pos)
+    positions.reverse()
+
+    score = 0
+    prev = None
+    for p in positions:
+        bonus = BONUS_BOUNDARY if key[p - 1] == BOUNDARY else 0
+        score += SCORE_MATCH
+        if prev is None:
+            score += 2 * bonus
+        elif p == prev + 1:
+            score += max(bonus, BONUS_CONSECUTIVE)
+        else:
+            gap = p - prev - 1
+            score += bonus - PENALTY_GAP_START - PENALTY_GAP_EXTENSION * (gap - 1)
+        prev = p
+    return score
+
+
+def _split(idxs, mask):
+    """Splits idxs by a parallel truthiness mask, keeping order."""
+    mask = list(mask)
+    return list(compress(idxs, mask)), list(compress(idxs, map(not_, mask)))
+
+
+def _split_by(idxs, keys, test, arg):
+    """Splits idxs by test(keys[i], arg). The loop runs in C, not Python."""
+    return _split(idxs, map(test, map(keys.__getitem__, idxs), repeat(arg)))
+
+
+def _narrow(match, ch):
+    """One more typed char: keeps the idxs of a match (idxs, their keys, where
+    the query so far ends in each) whose key has `ch` at or after that end,
+    and moves the end past it. Greedy leftmost matching is exact for "is it
+    a subsequence", and it's a few C-level passes with no regex."""
+    idxs, keys, starts = match
+    # find() gives -1 for a miss, so a new start of 0 is one
+    starts = list(map(add, map(str.find, keys, repeat(ch), starts), repeat(1)))
+    return list(compress(idxs, starts)), list(compress(keys, starts)), list(filter(None, starts))
+
+
+class FuzzyIndex:
+    """Ranked fuzzy search over a list of repos.
+
+    Normalized keys are built once per repo (and carried over from `previous`,
+    the index for the last repo list). Queries narrow incrementally: one that
+    extends a query seen before only checks the new characters against that
+    query's matches, from where each match ended.
+
+    Results come back in tiers (exact name, name prefix, word start, substring,
+    path segment, fuzzy name, fuzzy path, remote or branch), most recently
+    committed first within a tier, except fuzzy tiers small enough to score.
+    Field filters (`org:acme`, `path:clients/`, see trigrams.FIELDS) narrow
+    the results, or list everything they match when there's no free text.
+
+    `prepare()` adds the trigram index, which makes filters and the remote or
+    branch tier cheap, the matches and results of every one-char query (which
+    match most repos) and the sorted names. It's slow to build, so call it off
+    the UI thread before handing the index over. Everything works without
+    it, just slower.
+    """
+
+    def __init__(self, repos, previous=None, now=None):
+        self.now = time.time() if now is None else now
+        # Index order is recency order, so order-preserving filters keep it
+        self.repos = sorted(repos, key=lambda r: r.get("mtime") or 0, reverse=True)
+        self.keys = self._build_keys(self.repos, previous.keys if previous else {})
+        paths = [r["path"] for r in self.repos]
+        entries = list(map(self.keys.__getitem__, paths))
+        _, self.names, self.name_keys, self.path_keys = zip(*entries) if entries else ((),) * 4
+        self.all = list(range(len(self.repos)))
+        self.index_of = dict(zip(paths, self.all))
+        self.trigrams = None  # Set by prepare()
+        self._first = {}  # char -> its _narrow() match in path_keys, set by prepare()
+        self._by_name = None  # (sorted names, their idxs), for broad queries
+        self._singles = {}  # char -> its search results, set by prepare()
+        self._fields = None  # Lowercase FIELDS texts of each repo, in index order
+        self._texts = {}  # fields -> their texts per repo, joined
+        # (fields, value) -> idxs whose text in any of fields contains value
+        self._filters = OrderedDict()
+        # compact query -> [its _narrow() match in path_keys, and in name_keys
+        #     once asked for]
+        self._matches = OrderedDict()
+        self._results = OrderedDict()  # query -> result list
+
+    @staticmethod
+    def _build_keys(repos, known):
+        """path -> (name, lowercase name, name key, path key), reusing entries
+        from the last index for repos whose name hasn't changed."""
+        keys = {}
+        new = []
+        for repo in repos:
+            entry = known.get(repo["path"])
+            if entry is not None and entry[0] == repo["name"]:
+                keys[repo["path"]] = entry
+            else:
+                new.append(repo)
+        names = [repo["name"] for repo in new]
+        for repo, name_key, path_key in zip(
+            new, bounded_keys(names), bounded_keys(relative_paths(new))
+        ):
+            keys[repo["path"]] = (repo["name"], repo["name"].lower(), name_key, path_key)
+        return keys
+
+    def prepare(self, trigrams=None):
+        """Builds the trigram index (from `trigrams`, the last one, when
+        given), the one-char matches and results, the name order and the
+        field texts. Slow; returns self."""
+        for field in FIELDS:
+            self._joined_texts((field,))
+        self._joined_texts(OTHER_FIELDS)
+        self._name_order()
+        self.trigrams = (trigrams or TrigramIndex()).updated(self.repos)
+        # Every one-char search, since those match nearly everything
+        everything = (self.all, self.path_keys, [0] * len(self.all))
+        chars = set().union(*self.path_keys) - {BOUNDARY}
+        self._first = {ch: _narrow(everything, ch) for ch in chars}
+        self._singles = {ch: self._remember(None, self._tiers(ch, ch)) for ch in chars}
+        return self
+
+    def _name_order(self):
+        if self._by_name is None:
+            order = sorted(self.all, key=self.names.__getitem__)
+            self._by_name = (list(map(self.names.__getitem__, order)), order)
+        return self._by_name
+
+    def _name_prefix(self, text):
+        """Idxs, in recency order, of the names starting with text: a bisect
+        of the sorted names, not a check of each."""
+        names, order = self._name_order()
+        start = bisect_left(names, text)
+        end = bisect_left(names, text + "\U0010ffff", start)
+        return sorted(order[start:end])
+
+    def _field_texts(self):
+        if self._fields is None:
+            self._fields = field_texts(self.repos)
+        return self._fields
+
+    def _joined_texts(self, fields):
+        """The text of `fields` for each repo, joined by NUL (which no search
+        has), so one substring test covers all of them."""
+        texts = self._texts.get(fields)
+        if texts is None:
+            columns = [FIELDS.index(field) for field in fields]
+            texts = self._texts[fields] = [
+                "\0".join([entry[column] for column in columns]) for entry in self._field_texts()
+            ]
+        return texts
+
+    def _filter(self, fields, value):
+        """Idxs, in recency order, whose text in any of `fields` contains
+        `value`. Narrows the results for a prefix of value when there are
+        some, else the trigram candidates. Don't modify the list."""
+        found = self._filters.get((fields, value))
+        if found is not None:
+            self._filters.move_to_end((fields, value))
+            return found
+        texts = self._joined_texts(fields)
+        candidates = None
+        for end in range(len(value) - 1, 0, -1):
+            candidates = self._filters.get((fields, value[:end]))
+            if candidates is not None:
+                break
+        if candidates is None and self.trigrams is not None:
+            paths = self.trigrams.candidates(value)
+            # Checking every repo in order beats sorting a lot of candidates
+            if paths is not None and len(paths) < len(self.all) // 8:
+                candidates = self._idxs(paths)
+        if candidates is None:
+            found = list(compress(self.all, map(contains, texts, repeat(value))))
+        else:
+            texts = map(texts.__getitem__, candidates)
+            found = list(compress(candidates, map(contains, texts, repeat(value))))
+
+        self._filters[fields, value] = found
+        if len(self._filters) > CACHE_SIZE:
+            self._filters.popitem(last=False)
+        return found
+
+    def _idxs(self, paths):
+        """Index positions of a set of repo paths, in recency order."""
+        return sorted(map(self.index_of.__getitem__, paths))
+
+    def _match(self, compact):
+        """[path match, name match] for a query, as _narrow() returns them:
+        the repos it matches in path_keys and, once asked for, in name_keys."""
+        state = self._matches.get(compact)
+        if state is not None:
+            self._matches.move_to_end(compact)
+            return state
+        # Pick up from the longest query seen before that this one extends
+        done, state = 0, None
+        for end in range(len(compact) - 1, 0, -1):
+            state = self._matches.get(compact[:end])
+            if state is not None:
+                done = end
+                break
+        if state is not None:
+            match, name_match = state
+        elif self._first:
+            done, match, name_match = 1, self._first.get(compact[0], ([], [], [])), None
+        else:
+            match, name_match = (self.all, self.path_keys, [0] * len(self.all)), None
+        for ch in compact[done:]:
+            match = _narrow(match, ch)
+            if name_match is not None:
+                name_match = _narrow(name_match, ch)
+        state = [match, name_match]
+        self._matches[compact] = state
+        if len(self._matches) > CACHE_SIZE:
+            self._matches.popitem(last=False)
+        return state
+
+    def _narrowed(self, idxs, compact, keys):
+        """The _narrow() match of compact among idxs in keys, from scratch."""
+        match = (idxs, list(map(keys.__getitem__, idxs)), [0] * len(idxs))
+        for ch in compact:
+            match = _narrow(match, ch)
+        return match
+
+    def _score_sorted(self, idxs, keys, compact):
+        if len(idxs) > FULL_SCORE_LIMIT or len(compact) < 2:
+            return idxs
+        scores = {
+            i: (fuzzy_score(keys[i], compact) or 0) + recency_bonus(self.repos[i].get("mtime"), self.now)
+            for i in idxs
+        }
+        return sorted(idxs, key=scores.__getitem__, reverse=True)
+
+    def search(self, query):
+        """Repos matching `query`, best first. An empty query returns []."""
+        query = query.strip().lower()
+        result = self._singles.get(query)
+        if result is not None:
+            return result
+        result = self._results.get(query)
+        if result is not None:
+            self._results.move_to_end(query)
+            return result
+        text, filters = parse_query(query)
+        compact = SEPARATORS_RE.sub("", text)
+        if not filters:
+            return self._remember(query, self._tiers(text, compact) if compact else ())
+
+        # `org:` alone, mid-typing, doesn't narrow anything yet
+        allowed = None
+        for field, value in filters:
+            if not value:
+                continue
+            found = self._filter((field,), value)
+            if allowed is None:
+                allowed = found
+            else:
+                keep = set(allowed)
+                allowed = [i for i in found if i in keep]
+        if not compact:
+            return self._remember(query, (self.all if allowed is None else allowed,))
+        return self._remember(query, self._tiers(text, compact, allowed))
+
+    def _tiers(self, text, compact, allowed=None):
+        """Matches for free text, best tier first, only among the idxs in
+        `allowed` (in recency order) if given."""
+        boundary = bounded_key(text)  # "\x01" + text with separators as boundaries
+        if allowed is None:
+            state = self._match(compact)
+        else:
+            # What the filters left is narrowed from scratch, and not cached
+            state = [self._narrowed(allowed, compact, self.path_keys), None]
+            allowed = set(allowed)
+        matches = state[0][0]
+        if len(matches) > BROAD_MATCHES:
+            # Only the first page or so is looked at this broad: the names
+            # starting with the text, then the rest by recency. Name hits are
+            # always path matches.
+            prefix = self._name_prefix(text)
+            if allowed is not None:
+                prefix = [i for i in prefix if i in allowed]
+            if not prefix:
+                return (matches,)
+            exact, prefix = _split_by(prefix, self.names, eq, text)
+            ranked = set(prefix).union(exact)
+            rest = compress(matches, map(not_, map(ranked.__contains__, matches)))
+            return (exact, prefix, rest)
+
+        if state[1] is None:
+            # Name matches are path matches too, so only those need checking
+            state[1] = self._narrowed(matches, compact, self.name_keys)
+        in_name = state[1][0]
+        path_only = list(compress(matches, map(not_, map(set(in_name).__contains__, matches))))
+        exact, rest = _split_by(in_name, self.names, eq, text)
+        prefix, rest = _split_by(rest, self.names, str.startswith, text)
+        word, rest = _split_by(rest, self.name_keys, contains, boundary)
+        substring, rest = _split_by(rest, self.names, contains, text)
+        name_fuzzy = self._score_sorted(rest, self.name_keys, compact)
+
+        segment, rest = _split_by(path_only, self.path_keys, contains, boundary)
+        path_fuzzy = self._score_sorted(rest, self.path_keys, compact)
+
+        # Repos found only by their remote (the GitHub org, say) or branch
+        other = []
+        if len(text) >= TRIGRAM_MIN:
+            matched = set(matches)
+            other = [i for i in self._filter(OTHER_FIELDS, text)
+                     if i not in matched and (allowed is None or i in allowed)]
+        return (exact, prefix, word, substring, segment, name_fuzzy, path_fuzzy, other)
+
+    def _remember(self, query, tiers):
+        result = list(map(self.repos.__getitem__, chain.from_iterable(tiers)))
+        if query is None:
+            return result
+        self._results[query] = result
+        if len(self._results) > RESULTS_CACHE_SIZE:
+            self._results.popitem(last=False)
+        return result
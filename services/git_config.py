@@ -0,0 +1,364 @@
+import os
+import re
+import threading
+import time
+
+from services.git_meta import cached_parse
+
+# Global and system config are shared by every repo, so they're re-checked at
+# most this often (seconds) instead of once per repo.
+GLOBAL_TTL = 2.0
+MAX_INCLUDE_DEPTH = 10
+
+_global_lock = threading.Lock()
+_global_state = {"checked_at": 0.0, "paths": []}
+
+ESCAPES = {"n": "\n", "t": "\t", "b": "\b", "\\": "\\", '"': '"'}
+HEADER_RE = re.compile(r'\s*([A-Za-z0-9.-]+)\s*(?:"((?:[^"\\]|\\.)*)")?\s*$')
+KEY_RE = re.compile(r"([A-Za-z][A-Za-z0-9-]*)[ \t]*")
+
+
+def _parse_value(text, pos):
+    """Reads a value starting at text[pos], up to the end of its (logical) line.
+
+    Handles quoting, backslash escapes, line continuations and trailing
+    comments. Returns (value, position after the line).
+    """
+    out = []
+    quoted = False
+    pending_space = ""
+    while pos < len(text):
+        ch = text[pos]
+        if ch == "\n":
+            if quoted:
+                raise ValueError("newline in quoted value")
+            pos += 1
+            break
+        if ch == "\\":
+            nxt = text[pos + 1:pos + 2]
+            if nxt == "\n":  # Continuation line
+                pos += 2
+                continue
+            if nxt == "\r" and text[pos + 2:pos + 3] == "\n":
+                pos += 3
+                continue
+            if nxt not in ESCAPES:
+                raise ValueError("bad escape in value")
+            if out:
+                out.append(pending_space)
+            pending_space = ""
+            out.append(ESCAPES[nxt])
+            pos += 2
+            continue
+        if ch == '"':
+            quoted = not quoted
+            pos += 1
+            continue
+        if not quoted and ch in "#;":
+            # Comment to the end of the line
+            while pos < len(text) and text[pos] != "\n":
+                pos += 1
+            continue
+        if not quoted and ch in " \t\r":
+            pending_space += ch if ch != "\r" else ""
+            pos += 1
+            continue
+        if out:
+            out.append(pending_space)
+        pending_space = ""
+        out.append(ch)
+        pos += 1
+    if quoted:
+        raise ValueError("unterminated quote")
+    return "".join(out), pos
+
+
+def _parse_config_text(text):
+    """Parses git config text into a list of (section, subsection, key, value).
+
+    Section and key names are lowercased, subsections keep their case (except
+    in the old `[section.sub]` form). A key with no `=` is a boolean true and
+    gets the value None, like git itself. Malformed lines are skipped.
+    """
+    entries = []
+    section, sub = "", None
+    pos = 0
+    length = len(text)
+    while pos < length:
+        # Skip blank space and comment lines
+        ch = text[pos]
+        if ch in " \t\r\n":
+            pos += 1
+            continue
+        if ch in "#;":
+            end = text.find("\n", pos)
+            pos = length if end < 0 else end + 1
+            continue
+
+        if ch == "[":
+            end = text.find("]", pos)
+            header = text[pos + 1:end] if end >= 0 else ""
+            match = HEADER_RE.match(header)
+            if not match:
+                end = text.find("\n", pos)
+                pos = length if end < 0 else end + 1
+                continue
+            name, quoted_sub = match.group(1), match.group(2)
+            if quoted_sub is not None:
+                section, sub = name.lower(), re.sub(r"\\(.)", r"\1", quoted_sub)
+            elif "." in name:
+                # Deprecated [section.subsection] syntax
+                section, _, sub = name.lower().partition(".")
+            else:
+                section, sub = name.lower(), None
+            pos = end + 1
+            continue
+
+        match = KEY_RE.match(text, pos)
+        if not match:
+            end = text.find("\n", pos)
+            pos = length if end < 0 else end + 1
+            continue
+        key = match.group(1).lower()
+        pos = match.end()
+        if pos < length and text[pos] == "=":
+            try:
+                value, pos = _parse_value(text, pos + 1)
+            except ValueError:
+                end = text.find("\n", pos)
+                pos = length if end < 0 else end + 1
+                continue
+        else:
+            value = None
+            # Rest of the line can only be a comment
+            end = text.find("\n", pos)
+            pos = length if end < 0 else end + 1
+        entries.append((section, sub, key, value))
+    return entries
+
+
+def _parse_config_file(path):
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        return _parse_config_text(f.read())
+
+
+def _glob_regex(pattern, ignore_case=False):
+    """Translates git's wildmatch subset (*, ?, **, [..]) into a regex."""
+    out = []
+    i = 0
+    while i < len(pattern):
+        if pattern.startswith("**/", i):
+            out.append("(?:.*/)?")
+            i += 3
+        elif pattern.startswith("**", i):
+            out.append(".*")
+            i += 2
+        elif pattern[i] == "*":
+            out.append("[^/]*")
+            i += 1
+        elif pattern[i] == "?":
+            out.append("[^/]")
+            i += 1
+        elif pattern[i] == "[":
+            end = pattern.find("]", i + 1)
+            if end < 0:
+                out.append(re.escape(pattern[i]))
+                i += 1
+            else:
+                out.append("[" + pattern[i + 1:end].replace("!", "^", 1) + "]")
+                i = end + 1
+        else:
+            out.append(re.escape(pattern[i]))
+            i += 1
+    return re.compile("".join(out) + r"\Z", re.IGNORECASE if ignore_case else 0)
+
+
+def _include_matches(condition, context, config_dir):
+    """Evaluates an [includeIf "<condition>"] against the repo being read."""
+    kind, _, pattern = condition.partition(":")
+    if kind in ("gitdir", "gitdir/i"):
+        git_dir = context.get("git_dir")
+        if not git_dir:
+            return False
+        if pattern.startswith("~/"):
+            pattern = os.path.expanduser(pattern)
+        elif pattern.startswith("./"):
+            pattern = os.path.join(config_dir, pattern[2:])
+        elif not os.path.isabs(pattern):
+            pattern = "**/" + pattern
+        if pattern.endswith("/"):
+            pattern += "**"
+        regex = _glob_regex(pattern, ignore_case=kind == "gitdir/i")
+        candidates = {git_dir, os.path.realpath(git_dir)}
+        return any(regex.match(path) for path in candidates)
+    if kind == "onbranch":
+        branch = context.get("branch")
+        if not branch:
+            return False
+        if pattern.endswith("/"):
+            pattern += "**"
+        return bool(_glob_regex(pattern).match(branch))
+    return False  # hasconfig: and anything newer than us
+
+
+def _expand_file(path, context, out, depth=0):
+    """Appends path's entries to out, following include and includeIf."""
+    if depth > MAX_INCLUDE_DEPTH:
+        return
+    entries = cached_parse(path, _parse_config_file)
+    if entries is None:
+        return
+    config_dir = os.path.dirname(path)
+    for entry in entries:
+        out.append(entry)
+        section, sub, key, value = entry
+        if key != "path" or not value:
+            continue
+        if section == "include" or (section == "includeif" and sub
+                                    and _include_matches(sub, context, config_dir)):
+            target = os.path.expanduser(value)
+            if not os.path.isabs(target):
+                target = os.path.join(config_dir, target)
+            _expand_file(target, context, out, depth + 1)
+
+
+def _global_paths():
+    """System and global config files that exist, re-checked every GLOBAL_TTL."""
+    with _global_lock:
+        now = time.monotonic()
+        if now - _global_state["checked_at"] < GLOBAL_TTL:
+            return _global_state["paths"]
+        candidates = []
+        if not os.environ.get("GIT_CONFIG_NOSYSTEM"):
+            candidates.append(os.environ.get("GIT_CONFIG_SYSTEM") or "/etc/gitconfig")
+        xdg = os.environ.get("XDG_CONFIG_HOME") or os.path.expanduser("~/.config")
+        candidates.append(os.path.join(xdg, "git", "config"))
+        candidates.append(os.environ.get("GIT_CONFIG_GLOBAL") or os.path.expanduser("~/.gitconfig"))
+        _global_state["paths"] = [p for p in candidates if os.path.exists(p)]
+        _global_state["checked_at"] = now
+        return _global_state["paths"]
+
+
+class GitConfig:
+    """Flattened config for one repo: system, global, repo and worktree files in
+    the order git reads them, with includes expanded in place. Later values win.
+    """
+
+    def __init__(self, entries):
+        self.entries = entries
+        self._index = {}
+        for section, sub, key, value in entries:
+            self._index.setdefault((section, sub, key), []).append(value)
+
+    def get_all(self, section, sub, key):
+        return self._index.get((section, sub, key), [])
+
+    def get(self, section, sub, key, default=None):
+        values = self.get_all(section, sub, key)
+        return values[-1] if values else default
+
+    def subsections(self, section):
+        """Subsection names of a section, in first-seen order (e.g. remote names)."""
+        seen = []
+        for entry_section, sub, _, _ in self.entries:
+            if entry_section == section and sub is not None and sub not in seen:
+                seen.append(sub)
+        return seen
+
+
+def load_config(git_dir, common_dir, branch=None):
+    """Reads the effective config for a repo.
+
+    Each file is parsed once and then cached by (inode, mtime, size), so an
+    unchanged repo config costs one stat per refresh.
+    """
+    context = {"git_dir": git_dir, "branch": branch}
+    entries = []
+    for path in _global_paths():
+        _expand_file(path, context, entries)
+    _expand_file(os.path.join(common_dir, "config"), context, entries)
+    if git_dir != common_dir:
+        _expand_file(os.path.join(git_dir, "config.worktree"), context, entries)
+    return GitConfig(entries)
+
+
+def rewrite_url(config, url, push=False):
+    """Applies url.<base>.insteadOf (or pushInsteadOf) rules, longest prefix wins."""
+    key = "pushinsteadof" if push else "insteadof"
+    best = None
+    for section, base, entry_key, prefix in config.entries:
+        if section == "url" and entry_key == key and prefix and url.startswith(prefix):
+            if best is None or len(prefix) > len(best[0]):
+                best = (prefix, base)
+    if best is None:
+        return url
+    return best[1] + url[len(best[0]):]
+
+
+def parse_remote_url(url):
+    """Splits a remote URL into (host, path), or None for local paths.
+
+    Understands scheme URLs (https://, ssh://, git://, with user and port) and
+    scp-like `user@host:owner/repo` forms. The path loses its `.git` suffix.
+    """
+    url = (url or "").strip()
+    if "://" in url:
+        scheme, _, rest = url.partition("://")
+        if scheme.lower() == "file":
+            return None
+        netloc, _, path = rest.partition("/")
+        host = netloc.rpartition("@")[2]
+        if host.startswith("["):
+            host = host[1:host.find("]")] if "]" in host else host
+        else:
+            host = host.partition(":")[0]
+    else:
+        match = re.match(r"^(?:[^@/]+@)?([^:/]+):(.*)$", url)
+        # A single letter before the colon is a Windows drive, not a host
+        if not match or len(match.group(1)) == 1:
+            return None
+        host, path = match.group(1), match.group(2)
+    path = path.strip("/")
+    if path.endswith(".git"):
+        path = path[:-4].rstrip("/")
+    if not host or not path:
+        return None
+    return host.lower(), path
+
+
+def remote_key(url):
+    """Canonical `host/owner/repo` key for a remote URL, or None."""
+    parsed = parse_remote_url(url)
+    return f"{parsed[0]}/{parsed[1]}".lower() if parsed else None
+
+
+def web_url(url):
+    """Browser URL for a remote (https, no credentials or .git suffix), or None."""
+    parsed = parse_remote_url(url)
+    return f"https://{parsed[0]}/{parsed[1]}" if parsed else None
+
+
+def get_remotes(config):
+    """{name: {"url", "pushurl", "key"}} for every remote with a url."""
+    remotes = {}
+    for name in config.subsections("remote"):
+        urls = [u for u in config.get_all("remote", name, "url") if u]
+        if not urls:
+            continue
+        url = rewrite_url(config, urls[0])
+        push_urls = [u for u in config.get_all("remote", name, "pushurl") if u]
+        if push_urls:
+            push_url = rewrite_url(config, push_urls[0])
+        else:
+            push_url = rewrite_url(config, urls[0], push=True)
+            if push_url == urls[0]:
+                push_url = url
+        remotes[name] = {"url": url, "pushurl": push_url, "key": remote_key(url)}
+    return remotes
+
+
+def primary_remote(remotes):
+    """The remote the dashboard links to: origin if there is one, else the first."""
+    if "origin" in remotes:
+        return remotes["origin"]
+    return next(iter(remotes.values()), None)
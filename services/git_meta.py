@@ -0,0 +1,162 @@
+import os
+import threading
+
+# Parsed files keyed by path -> ((inode, mtime_ns, size), parsed value). Repos
+# that haven't changed since the last refresh cost one stat per file.
+_file_cache = {}
+_cache_lock = threading.Lock()
+
+
+def cached_parse(path, parser):
+    """Returns parser(path) using the cached result while the file's stat is unchanged."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    # The inode catches files replaced by rename within one mtime tick
+    key = (st.st_ino, st.st_mtime_ns, st.st_size)
+    with _cache_lock:
+        hit = _file_cache.get((path, parser))
+    if hit and hit[0] == key:
+        return hit[1]
+    try:
+        value = parser(path)
+    except (OSError, UnicodeDecodeError):
+        return None
+    with _cache_lock:
+        _file_cache[(path, parser)] = (key, value)
+    return value
+
+
+def _read_text(path):
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        return f.read()
+
+
+def _parse_head(path):
+    return _read_text(path).strip()
+
+
+def _parse_packed_refs(path):
+    refs = {}
+    for line in _read_text(path).splitlines():
+        # Skip the header and peeled tag lines ("^<sha>")
+        if not line or line[0] in "#^":
+            continue
+        sha, _, name = line.partition(" ")
+        refs[name.strip()] = sha
+    return refs
+
+
+def resolve_git_dir(repo_path):
+    """Returns (git_dir, common_dir) for a checkout.
+
+    `.git` may be a gitfile ("gitdir: <path>") for worktrees and submodules.
+    Worktrees keep HEAD in their own git dir but share refs, packed-refs and
+    config with the main repo, which `commondir` points at.
+    """
+    git_dir = os.path.join(repo_path, ".git")
+    if os.path.isfile(git_dir):
+        content = cached_parse(git_dir, _parse_head) or ""
+        if not content.startswith("gitdir:"):
+            return None, None
+        git_dir = os.path.normpath(os.path.join(repo_path, content[len("gitdir:"):].strip()))
+
+    common_dir = git_dir
+    commondir_file = os.path.join(git_dir, "commondir")
+    if os.path.exists(commondir_file):
+        common = cached_parse(commondir_file, _parse_head)
+        if common:
+            common_dir = os.path.normpath(os.path.join(git_dir, common))
+    return git_dir, common_dir
+
+
+def resolve_ref(git_dir, common_dir, ref, _depth=0):
+    """Follows a ref name to a commit SHA via loose refs, then packed-refs."""
+    if _depth > 5:
+        return None  # Symbolic ref cycle
+    for base in (git_dir,) if git_dir == common_dir else (git_dir, common_dir):
+        value = cached_parse(os.path.join(base, ref), _parse_head)
+        if value:
+            if value.startswith("ref:"):
+                return resolve_ref(git_dir, common_dir, value[4:].strip(), _depth + 1)
+            return value
+    packed = cached_parse(os.path.join(common_dir, "packed-refs"), _parse_packed_refs) or {}
+    return packed.get(ref)
+
+
+def get_upstream(config, branch):
+    """Short upstream name ("origin/main") from the branch's tracking section."""
+    remote = config.get("branch", branch, "remote")
+    merge = config.get("branch", branch, "merge")
+    if not remote or not merge:
+        return None
+    merge = merge[len("refs/heads/"):] if merge.startswith("refs/heads/") else merge
+    if remote == ".":
+        return merge  # Tracks another local branch
+    return f"{remote}/{merge}"
+
+
+def upstream_ref(config, branch):
+    """Full ref the upstream lives at locally ("refs/remotes/origin/main")."""
+    remote = config.get("branch", branch, "remote")
+    upstream = get_upstream(config, branch)
+    if not upstream:
+        return None
+    if remote == ".":
+        return f"refs/heads/{upstream}"
+    return f"refs/remotes/{upstream}"
+
+
+def get_repo_meta(repo_path):
+    """Branch, HEAD commit, upstream and remotes for a repo, without running git.
+
+    Returns {"branch", "detached", "head_sha", "upstream", "upstream_sha",
+    "remotes"}; fields we can't determine are None (remotes is {}).
+    """
+    # Imported here because git_config builds on cached_parse above
+    from services.git_config import load_config, get_remotes
+
+    meta = {
+        "branch": None, "detached": False, "head_sha": None,
+        "upstream": None, "upstream_sha": None, "remotes": {},
+    }
+    git_dir, common_dir = resolve_git_dir(repo_path)
+    if not git_dir:
+        return meta
+
+    head = cached_parse(os.path.join(git_dir, "HEAD"), _parse_head)
+    if not head:
+        return meta
+
+    if head.startswith("ref:"):
+        ref = head[4:].strip()
+        meta["branch"] = ref[len("refs/heads/"):] if ref.startswith("refs/heads/") else ref
+        meta["head_sha"] = resolve_ref(git_dir, common_dir, ref)
+    else:
+        meta["detached"] = True
+        meta["head_sha"] = head
+
+    config = load_config(git_dir, common_dir, meta["branch"])
+    meta["remotes"] = get_remotes(config)
+    if meta["branch"]:
+        meta["upstream"] = get_upstream(config, meta["branch"])
+        ref = upstream_ref(config, meta["branch"])
+        if ref:
+            meta["upstream_sha"] = resolve_ref(git_dir, common_dir, ref)
+    return meta
+
+
+def format_branch(repo):
+    """Branch column text: the branch name, or the short SHA when detached."""
+    if repo.get("detached"):
+        sha = repo.get("head_sha") or ""
+        return f"({sha[:7]})" if sha else "(detached)"
+    return repo.get("branch") or ""
+
+
+def format_count(count):
+    """Ahead/behind column text: blank when there's no upstream, "·" for zero."""
+    if count is None:
+        return ""
+    return str(count) if count else "·"
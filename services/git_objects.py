@@ -0,0 +1,336 @@
+import glob
+import mmap
+import os
+import struct
+import threading
+import zlib
+from collections import OrderedDict
+
+from services.git_meta import resolve_git_dir
+
+OBJ_COMMIT, OBJ_TREE, OBJ_BLOB, OBJ_TAG = 1, 2, 3, 4
+OBJ_OFS_DELTA, OBJ_REF_DELTA = 6, 7
+TYPE_NAMES = {b"commit": OBJ_COMMIT, b"tree": OBJ_TREE, b"blob": OBJ_BLOB, b"tag": OBJ_TAG}
+
+IDX_V2_MAGIC = b"\377tOc"
+
+# Commits are immutable, so anything we learn about one is cached by SHA forever
+_commit_cache = {}
+# Open pack indexes keyed by .idx path -> (mtime_ns, PackIndex), least
+# recently used first. Each one holds two maps and so two file descriptors,
+# which run out (256 by default on macOS) long before memory does
+_pack_cache = OrderedDict()
+PACK_CACHE_SIZE = 32
+_lock = threading.Lock()
+
+
+class PackIndex:
+    """Looks up object offsets in a pack through its memory-mapped .idx file."""
+
+    def __init__(self, idx_path):
+        self.idx_path = idx_path
+        self.pack_path = idx_path[:-4] + ".pack"
+        with open(idx_path, "rb") as f:
+            self.idx = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            with open(self.pack_path, "rb") as f:
+                self.pack = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except OSError:
+            self.idx.close()
+            raise
+        self.users = 0  # Reads in progress, counted under _lock
+        self.retired = False  # Out of the cache: closed once users drops to 0
+
+        if self.idx[:4] == IDX_V2_MAGIC:
+            self.version = 2
+            self.fanout_at = 8
+        else:
+            self.version = 1
+            self.fanout_at = 0
+        self.count = struct.unpack_from(">I", self.idx, self.fanout_at + 255 * 4)[0]
+        names_at = self.fanout_at + 256 * 4
+        self.names_at = names_at
+        self.offsets_at = names_at + self.count * 24  # names (20) + crc32 (4)
+        self.large_at = self.offsets_at + self.count * 4
+
+    def _name(self, i):
+        if self.version == 2:
+            start = self.names_at + i * 20
+        else:
+            start = self.names_at + i * 24 + 4
+        return self.idx[start:start + 20]
+
+    def find(self, sha_bin):
+        """Returns the pack offset of an object, or None if it isn't in this pack."""
+        first = sha_bin[0]
+        lo = struct.unpack_from(">I", self.idx, self.fanout_at + (first - 1) * 4)[0] if first else 0
+        hi = struct.unpack_from(">I", self.idx, self.fanout_at + first * 4)[0]
+        while lo < hi:
+            mid = (lo + hi) // 2
+            name = self._name(mid)
+            if name < sha_bin:
+                lo = mid + 1
+            elif name > sha_bin:
+                hi = mid
+            else:
+                return self._offset(mid)
+        return None
+
+    def _offset(self, i):
+        if self.version == 1:
+            return struct.unpack_from(">I", self.idx, self.names_at + i * 24)[0]
+        offset = struct.unpack_from(">I", self.idx, self.offsets_at + i * 4)[0]
+        if offset & 0x80000000:
+            offset = struct.unpack_from(">Q", self.idx, self.large_at + (offset & 0x7FFFFFFF) * 8)[0]
+        return offset
+
+    def close(self):
+        self.idx.close()
+        self.pack.close()
+
+
+def _retire(pack):
+    """Closes a pack taken out of the cache, or has the last read still
+    using it do so. Call with _lock held."""
+    pack.retired = True
+    if not pack.users:
+        pack.close()
+
+
+def _release(packs):
+    """Ends a read of packs from ObjectStore._packs()."""
+    with _lock:
+        for pack in packs:
+            pack.users -= 1
+            if pack.retired and not pack.users:
+                pack.close()
+
+
+def _evict_packs(pack_dir, idx_paths):
+    """Drops the cached packs of `pack_dir` that are no longer among
+    `idx_paths` (gone after a gc or repack), so their maps are let go."""
+    prefix = os.path.join(pack_dir, "")
+    keep = set(idx_paths)
+    with _lock:
+        gone = [path for path in _pack_cache if path.startswith(prefix) and path not in keep]
+        for path in gone:
+            _retire(_pack_cache.pop(path)[1])
+
+
+def close_packs():
+    """Drops every cached pack."""
+    with _lock:
+        while _pack_cache:
+            _retire(_pack_cache.popitem()[1][1])
+
+
+def _inflate(buf, pos, size=None):
+    """Decompresses the zlib stream starting at buf[pos]."""
+    d = zlib.decompressobj()
+    out = []
+    got = 0
+    chunk = 4096
+    while not d.eof:
+        piece = buf[pos:pos + chunk]
+        if not piece:
+            break
+        pos += len(piece)
+        data = d.decompress(piece)
+        out.append(data)
+        got += len(data)
+        if size is not None and got >= size:
+            break
+        chunk = min(chunk * 4, 1 << 20)
+    return b"".join(out)
+
+
+def _apply_delta(base, delta):
+    def varint(pos):
+        value = shift = 0
+        while True:
+            byte = delta[pos]
+            pos += 1
+            value |= (byte & 0x7F) << shift
+            shift += 7
+            if not byte & 0x80:
+                return value, pos
+
+    _, pos = varint(0)  # source size
+    _, pos = varint(pos)  # result size
+    out = bytearray()
+    while pos < len(delta):
+        op = delta[pos]
+        pos += 1
+        if op & 0x80:
+            # Copy a range of the base object
+            offset = size = 0
+            for i in range(4):
+                if op & (1 << i):
+                    offset |= delta[pos] << (8 * i)
+                    pos += 1
+            for i in range(3):
+                if op & (1 << (4 + i)):
+                    size |= delta[pos] << (8 * i)
+                    pos += 1
+            out += base[offset:offset + (size or 0x10000)]
+        elif op:
+            # Insert literal bytes
+            out += delta[pos:pos + op]
+            pos += op
+        else:
+            raise ValueError("invalid delta opcode")
+    return bytes(out)
+
+
+class ObjectStore:
+    """Read-only access to a repo's loose and packed objects."""
+
+    def __init__(self, common_dir):
+        self.objects_dir = os.path.join(common_dir, "objects")
+        self.object_dirs = [self.objects_dir] + self._alternates(self.objects_dir)
+
+    def _alternates(self, objects_dir):
+        try:
+            with open(os.path.join(objects_dir, "info", "alternates")) as f:
+                return [
+                    os.path.normpath(os.path.join(objects_dir, line.strip()))
+                    for line in f
+                    if line.strip() and not line.startswith("#")
+                ]
+        except OSError:
+            return []
+
+    def _packs(self):
+        """The packs of every objects dir, held open until _release()."""
+        packs = []
+        for objects_dir in self.object_dirs:
+            pack_dir = os.path.join(objects_dir, "pack")
+            idx_paths = glob.glob(os.path.join(pack_dir, "*.idx"))
+            _evict_packs(pack_dir, idx_paths)
+            for idx_path in idx_paths:
+                try:
+                    mtime_ns = os.stat(idx_path).st_mtime_ns
+                except OSError:
+                    continue
+                with _lock:
+                    cached = _pack_cache.get(idx_path)
+                    if not cached or cached[0] != mtime_ns:
+                        if cached:
+                            _retire(_pack_cache.pop(idx_path)[1])
+                        try:
+                            cached = (mtime_ns, PackIndex(idx_path))
+                        except (OSError, ValueError):
+                            continue
+                        _pack_cache[idx_path] = cached
+                        while len(_pack_cache) > PACK_CACHE_SIZE:
+                            _retire(_pack_cache.popitem(last=False)[1][1])
+                    else:
+                        _pack_cache.move_to_end(idx_path)
+                    cached[1].users += 1
+                packs.append(cached[1])
+        return packs
+
+    def read(self, sha):
+        """Returns (type, data) for an object, or None if we can't find it."""
+        for objects_dir in self.object_dirs:
+            path = os.path.join(objects_dir, sha[:2], sha[2:])
+            try:
+                with open(path, "rb") as f:
+                    raw = zlib.decompress(f.read())
+            except OSError:
+                continue
+            header, _, data = raw.partition(b"\0")
+            return TYPE_NAMES.get(header.split(b" ")[0]), data
+
+        sha_bin = bytes.fromhex(sha)
+        packs = self._packs()
+        try:
+            for pack in packs:
+                offset = pack.find(sha_bin)
+                if offset is not None:
+                    return self._read_packed(pack, offset)
+        finally:
+            _release(packs)
+        return None
+
+    def _read_packed(self, pack, offset, _depth=0):
+        if _depth > 50:
+            raise ValueError("delta chain too long")
+        buf = pack.pack
+        byte = buf[offset]
+        obj_type = (byte >> 4) & 7
+        size = byte & 15
+        shift = 4
+        pos = offset + 1
+        while byte & 0x80:
+            byte = buf[pos]
+            pos += 1
+            size |= (byte & 0x7F) << shift
+            shift += 7
+
+        if obj_type == OBJ_OFS_DELTA:
+            byte = buf[pos]
+            pos += 1
+            rel = byte & 0x7F
+            while byte & 0x80:
+                byte = buf[pos]
+                pos += 1
+                rel = ((rel + 1) << 7) | (byte & 0x7F)
+            base_type, base = self._read_packed(pack, offset - rel, _depth + 1)
+            return base_type, _apply_delta(base, _inflate(buf, pos, size))
+        if obj_type == OBJ_REF_DELTA:
+            base_sha = buf[pos:pos + 20].hex()
+            base_obj = self.read(base_sha)
+            if base_obj is None:
+                raise ValueError(f"missing delta base {base_sha}")
+            return base_obj[0], _apply_delta(base_obj[1], _inflate(buf, pos + 20, size))
+        return obj_type, _inflate(buf, pos, size)
+
+
+def parse_commit(data):
+    """Pulls parents and timestamps out of a raw commit object."""
+    commit = {"parents": [], "tree": None, "author_time": None, "commit_time": None}
+    for line in data.split(b"\n"):
+        if not line:
+            break  # End of headers, the message follows
+        key, _, value = line.partition(b" ")
+        if key == b"tree":
+            commit["tree"] = value.decode()
+        elif key == b"parent":
+            commit["parents"].append(value.decode())
+        elif key in (b"author", b"committer"):
+            # "Name <email> 1700000000 +0100"
+            stamp = value.rsplit(b" ", 2)
+            try:
+                commit["author_time" if key == b"author" else "commit_time"] = int(stamp[-2])
+            except (IndexError, ValueError):
+                pass
+    return commit
+
+
+def read_commit(common_dir, sha):
+    """Parsed commit headers for `sha`, cached by SHA. None if unreadable."""
+    with _lock:
+        if sha in _commit_cache:
+            return _commit_cache[sha]
+    try:
+        obj = ObjectStore(common_dir).read(sha)
+    except (OSError, ValueError, zlib.error, IndexError):
+        obj = None
+    if obj is None or obj[0] != OBJ_COMMIT:
+        return None
+    commit = parse_commit(obj[1])
+    with _lock:
+        _commit_cache[sha] = commit
+    return commit
+
+
+def get_commit_time(repo_path, sha):
+    """Committer timestamp of a commit in this repo, or None on any failure."""
+    if not sha:
+        return None
+    _, common_dir = resolve_git_dir(repo_path)
+    if not common_dir:
+        return None
+    commit = read_commit(common_dir, sha)
+    return commit["commit_time"] if commit else None
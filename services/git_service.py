@@ -1,10 +1,15 @@
 import os
-import re
-import asyncio
-import httpx
+import threading
+import time
 from datetime import datetime
-from services.auth_service import AuthService
-import requests
+from services.repo_index import RepoIndex
+from services.scanner import walk_parallel
+from services.prune import PruneRules
+from services.git_meta import get_repo_meta, resolve_git_dir
+from services.git_config import load_config, get_remotes, primary_remote, web_url
+from services.git_objects import get_commit_time
+from services.commit_graph import get_ahead_behind
+import services.config as config
 
 def get_time_ago(timestamp):
     if timestamp == 0: return "Never"
@@ -15,152 +20,273 @@ def get_time_ago(timestamp):
     if s < 86400: return f"{int(s // 3600)}h ago"
     return f"{int(s // 86400)}d ago"
 
-def extract_git_url(repo_path):
-    config_path = os.path.join(repo_path, ".git", "config")
-    if not os.path.exists(config_path): return None
+def extract_git_url(repo_path, remotes=None):
+    """Browser URL of the repo's origin (or first) remote, or None."""
+    if remotes is None:
+        git_dir, common_dir = resolve_git_dir(repo_path)
+        if not git_dir:
+            return None
+        remotes = get_remotes(load_config(git_dir, common_dir))
+    remote = primary_remote(remotes)
+    return web_url(remote["url"]) if remote else None
+
+def get_heuristic_mtime(path):
+    """Guess at the last commit from .git file mtimes (wrong after pulls, rebases, clones)."""
+    git_dir = os.path.join(path, ".git")
+    # One stat in the common case instead of exists() + getmtime()
     try:
-        with open(config_path, "r") as f:
-            content = f.read()
-            match = re.search(r'\[remote "origin"\][^\[]*url = ([^\s\n]+)', content)
-            if match:
-                url = match.group(1)
-                if url.startswith("git@"):
-                    url = url.replace(":", "/").replace("git@", "https://").replace(".git", "")
-                return url
-    except: return None
-    return None
-
-def get_git_repos(base_path, max_depth=1):
-    repos = []
-    expanded_root = os.path.expanduser(base_path)
-    
-    if not os.path.exists(expanded_root):
-        return []
-
-    def scan_dir(current_path, current_depth):
-        # Base case: don't go deeper than allowed
-        if current_depth > max_depth:
-            return
+        return os.stat(os.path.join(git_dir, "COMMIT_EDITMSG")).st_mtime
+    except OSError:
+        return os.stat(git_dir).st_mtime
+
+def build_repo_entry(name, path):
+    meta = get_repo_meta(path)
+    # The real committer time of HEAD, read from the object store; the
+    # mtime heuristic is only a fallback for unborn or unreadable repos
+    mtime = get_commit_time(path, meta["head_sha"]) or get_heuristic_mtime(path)
+    repo = {
+        "name": name,
+        "path": path,
+        "mtime": mtime,
+        "time_ago": get_time_ago(mtime),
+    }
+    repo.update(meta)
+    repo["remote_url"] = extract_git_url(path, meta["remotes"])
+    remote = primary_remote(meta["remotes"])
+    repo["remote_key"] = remote["key"] if remote else None
+    repo["ahead"], repo["behind"] = get_ahead_behind(path, meta["head_sha"], meta["upstream_sha"])
+    return repo
+
+def read_dir(path, depth, max_depth, known_dirs, rules=None, st=None):
+    """Returns (mtime_ns, is_repo, subdirs, pruned) for a directory.
+
+    If the index saw this directory with the same mtime, its listing can't have
+    changed, so we reuse it and skip the scandir entirely. `pruned` counts the
+    subfolders the prune rules kept us out of (including this folder itself if
+    it blew the entry or time budget).
+    """
+    mtime_ns = (st or os.stat(path)).st_mtime_ns
+    cached = known_dirs.get(path)
+    if cached and cached[0] == mtime_ns:
+        return cached
+
+    if depth >= max_depth:
+        # Leaf level: we only need to know whether it's a repo
+        return (mtime_ns, os.path.exists(os.path.join(path, ".git")), [], 0)
+
+    is_repo = False
+    subdirs = []
+    pruned = 0
+    started = time.perf_counter()
+    with os.scandir(path) as entries:
+        for count, entry in enumerate(entries, 1):
+            if entry.name == ".git":
+                is_repo = True
+            # Skip hidden folders (.cache, .local, ...); symlink loops are caught by inode
+            elif not entry.name.startswith(".") and entry.is_dir():
+                if rules and rules.excludes(entry.name, entry.path):
+                    pruned += 1
+                else:
+                    subdirs.append(entry.name)
+
+            # Huge or painfully slow folders are data, not a place repos live
+            if rules and count % 64 == 0 and (
+                (rules.max_entries and count > rules.max_entries)
+                or (rules.time_budget and time.perf_counter() - started > rules.time_budget)
+            ):
+                is_repo = is_repo or os.path.exists(os.path.join(path, ".git"))
+                return (mtime_ns, is_repo, [], 1)
+    return (mtime_ns, is_repo, subdirs, pruned)
+
+class ScanRoot:
+    """One search path with its own depth, prune rules and walk results.
 
+    `visited` maps every directory walked under this root to (mtime_ns,
+    is_repo, subdirs, pruned), which is what the index persists and the watcher
+    keeps watching. `known_dirs` is the previous walk, used to skip unchanged
+    folders.
+    """
+
+    def __init__(self, path, max_depth=1, prune=(), rules=None, known_dirs=None):
+        self.path = os.path.expanduser(path)
+        self.max_depth = max_depth
+        self.rules = rules if rules is not None else PruneRules.from_config(self.path, extra=prune)
+        self.known_dirs = known_dirs or {}
+        self.visited = {}
+
+    @classmethod
+    def from_config(cls):
+        return [cls(r["path"], r["depth"], r.get("prune", ())) for r in config.get_scan_roots()]
+
+def walk_roots(items, workers=1, cancel=None, repos=None, seen=None, stats=None):
+    """Walks (path, depth, ScanRoot) work items in one shared pool.
+
+    `seen` maps (st_dev, st_ino) to the depth budget left when it was walked,
+    so a folder reachable from two overlapping roots or through a symlink is
+    only walked again if that reaches deeper, a repo is only listed once, and a
+    symlink pointing back up the tree just stops. A `stats` dict
+    gets the time spent listing folders added to it.
+    """
+    repos = [] if repos is None else repos
+    seen = {} if seen is None else seen
+    stats_lock = threading.Lock()
+    claim_lock = threading.Lock()
+
+    def scan_dir(current_path, current_depth, root):
+        if cancel is not None and cancel.is_set():
+            return []
+        started = time.perf_counter()
         try:
-            with os.scandir(current_path) as entries:
-                for entry in entries:
-                    if not entry.is_dir():
-                        continue
-                    
-                    # Prevent infinite loops with symlinks or scanning .git itself
-                    if entry.name.startswith('.') and entry.name != ".git":
-                        continue
-
-                    git_dir = os.path.join(entry.path, ".git")
-                    
-                    if os.path.exists(git_dir):
-                        # Found a repo! 
-                        msg_file = os.path.join(git_dir, "COMMIT_EDITMSG")
-                        mtime = os.path.getmtime(msg_file) if os.path.exists(msg_file) else os.path.getmtime(git_dir)
-                        
-                        repos.append({
-                            "name": entry.name,
-                            "path": entry.path,
-                            "mtime": mtime,
-                            "time_ago": get_time_ago(mtime),
-                            "remote_url": extract_git_url(entry.path),
-                        })
-                        # Usually, repos aren't nested inside repos, 
-                        # so we don't scan deeper once a .git is found.
-                    else:
-                        # Not a repo, search one level deeper
-                        scan_dir(entry.path, current_depth + 1)
-        except PermissionError:
-            pass # Skip folders we can't access
-
-    scan_dir(expanded_root, 1)
+            st = os.stat(current_path)
+            info = read_dir(current_path, current_depth, root.max_depth, root.known_dirs, root.rules, st)
+        except OSError:
+            return [] # Skip folders we can't access (or that vanished mid-scan)
+
+        # Claim the folder by inode. A repo is claimed once; a plain folder can
+        # be taken over by a walk that is allowed to go deeper below it (a
+        # nested root with a bigger depth), never by a shallower or equal one,
+        # which is also what stops symlink loops.
+        remaining = -1 if info[1] and current_depth > 0 else root.max_depth - current_depth
+        with claim_lock:
+            previous = seen.get((st.st_dev, st.st_ino))
+            if previous is not None and (remaining < 0 or previous >= remaining):
+                return []
+            seen[(st.st_dev, st.st_ino)] = remaining
+        root.visited[current_path] = info
+        if stats is not None:
+            with stats_lock:
+                stats["list_seconds"] = stats.get("list_seconds", 0) + time.perf_counter() - started
+                stats["dirs_listed"] = stats.get("dirs_listed", 0) + 1
+        _, is_repo, subdirs, _ = info
+
+        if is_repo and current_depth > 0:
+            try:
+                repo = build_repo_entry(os.path.basename(current_path), current_path)
+            except OSError:
+                return []
+            repo["root"] = root.path
+            repos.append(repo)
+            # Usually, repos aren't nested inside repos,
+            # so we don't scan deeper once a .git is found.
+            return []
+
+        # Base case: don't go deeper than allowed
+        if current_depth >= root.max_depth:
+            return []
+        return [(os.path.join(current_path, name), current_depth + 1, root) for name in subdirs]
+
+    walk_parallel(items, scan_dir, workers=workers)
     return repos
 
-async def fetch_pr_details(client, item, headers):
-    """Fetches Review and CI status for a single PR in parallel."""
-    repo_full_name = "/".join(item["repository_url"].split("/")[-2:])
-    pr_number = item["number"]
-    
-    # Define the individual detail calls
-    reviews_url = f"https://api.github.com/repos/{repo_full_name}/pulls/{pr_number}/reviews"
-    pr_detail_url = f"https://api.github.com/repos/{repo_full_name}/pulls/{pr_number}"
-    
-    try:
-        # Fetch review list and PR details (to get head SHA) concurrently
-        res_rev, res_pr = await asyncio.gather(
-            client.get(reviews_url, headers=headers, timeout=3),
-            client.get(pr_detail_url, headers=headers, timeout=3)
-        )
-
-        # Process Review Status
-        review_status = "Pending"
-        if res_rev.status_code == 200:
-            revs = res_rev.json()
-            if any(rv["state"] == "APPROVED" for rv in revs): review_status = "Approved"
-            elif any(rv["state"] == "CHANGES_REQUESTED" for rv in revs): review_status = "Needs Work"
-
-        # Process CI Status (Requires a second hop to the Status API using the SHA)
-        actions_status = "NA"
-        if res_pr.status_code == 200:
-            head_sha = res_pr.json()["head"]["sha"]
-            status_url = f"https://api.github.com/repos/{repo_full_name}/commits/{head_sha}/status"
-            res_st = await client.get(status_url, headers=headers, timeout=3)
-            if res_st.status_code == 200:
-                data = res_st.json()
-                state = data.get("state", "None")
-                actions_status = state.capitalize() if data.get("total_count", 0) > 0 else "NA"
-
-        return {
-            "repo": repo_full_name.split("/")[-1],
-            "title": item["title"],
-            "review_status": review_status,
-            "ci_status": actions_status,
-            "url": item["html_url"]
-        }
-    except Exception as e:
-        print(f"Error fetching details for PR {pr_number}: {e}")
-        return None
-
-async def fetch_open_prs_async():
-    token = AuthService.get_token()
-    if not token: return []
-    
-    headers = {"Authorization": f"token {token}", "Accept": "application/vnd.github.v3+json"}
-    query = "is:open is:pr author:@me"
-    search_url = f"https://api.github.com/search/issues?q={query}"
-    
-    async with httpx.AsyncClient() as client:
-        r = await client.get(search_url, headers=headers, timeout=5)
-        if r.status_code != 200: return []
-        
-        items = r.json().get("items", [])
-        # Trigger all PR detail fetches at once!
-        tasks = [fetch_pr_details(client, item, headers) for item in items]
-        results = await asyncio.gather(*tasks)
-        
-        return [res for res in results if res]
-
-def fetch_open_prs():
-    return asyncio.run(fetch_open_prs_async())
-
-async def fetch_review_requests_async():
-    token = AuthService.get_token()
-    if not token: return []
-    
-    query = "is:open is:pr review-requested:@me"
-    url = f"https://api.github.com/search/issues?q={query}"
-    headers = {"Authorization": f"token {token}"}
-    
-    async with httpx.AsyncClient() as client:
-        r = await client.get(url, headers=headers, timeout=5)
-        if r.status_code != 200: return []
-        return [{
-            "repo": i["repository_url"].split("/")[-1],
-            "author": i["user"]["login"],
-            "title": i["title"],
-            "url": i["html_url"]
-        } for i in r.json().get("items", [])]
-
-def fetch_review_requests():
-    return asyncio.run(fetch_review_requests_async())
\ No newline at end of file
+def scan_tree(start_path, start_depth, max_depth, known_dirs=None, workers=1,
+              cancel=None, repos=None, visited=None, rules=None, stats=None, root_path=None):
+    """Walks one subtree of a root and returns (repos, visited)."""
+    root = ScanRoot(root_path or start_path, max_depth, rules=rules, known_dirs=known_dirs)
+    if visited is not None:
+        root.visited = visited
+    repos = walk_roots([(start_path, start_depth, root)], workers, cancel, repos, stats=stats)
+    return repos, root.visited
+
+def load_cached_repos(roots):
+    """Repos recorded by the last scan, for rendering before the disk is walked."""
+    index = RepoIndex()
+    by_path = {}
+    for root in roots:
+        for repo in index.load_repos(root.path, root.max_depth, root.rules):
+            repo["time_ago"] = get_time_ago(repo["mtime"])
+            by_path.setdefault(repo["path"], repo)
+    return list(by_path.values())
+
+class RepoScan:
+    """A cancellable scan of one or more ScanRoots that can stream its results.
+
+    All roots share one worker pool and one inode set, so overlapping roots are
+    merged rather than walked twice. `run()` scans synchronously. Iterating over
+    `batches()` instead runs the walk on a background thread and yields lists
+    of newly found repos every `interval` seconds (possibly empty, so callers
+    can show progress from `dirs_scanned` / `repos_found`).
+    """
+
+    def __init__(self, roots, use_index=True, workers=None):
+        self.roots = roots
+        self.use_index = use_index
+        self.workers = config.get_scan_workers() if workers is None else workers
+        self.repos = []
+        self.stats = {}
+        self.finished = False
+        self._cancel = threading.Event()
+
+    @property
+    def visited(self):
+        merged = {}
+        for root in self.roots:
+            merged.update(root.visited)
+        return merged
+
+    @property
+    def dirs_scanned(self):
+        return sum(len(root.visited) for root in self.roots)
+
+    @property
+    def repos_found(self):
+        return len(self.repos)
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    def cancel(self):
+        self._cancel.set()
+
+    @property
+    def dirs_pruned(self):
+        return sum(info[3] for root in self.roots for info in list(root.visited.values()))
+
+    def estimated_time_saved(self):
+        """Lower bound: each pruned folder would have cost at least one average listing."""
+        listed = self.stats.get("dirs_listed", 0)
+        if not listed:
+            return 0.0
+        return self.dirs_pruned * self.stats.get("list_seconds", 0) / listed
+
+    def run(self):
+        roots = [root for root in self.roots if os.path.exists(root.path)]
+        index = RepoIndex() if self.use_index else None
+        if index:
+            for root in roots:
+                root.known_dirs = index.load_dirs(root.path, root.max_depth, root.rules)
+
+        walk_roots([(root.path, 0, root) for root in roots], self.workers,
+                   cancel=self._cancel, repos=self.repos, stats=self.stats)
+
+        # A cancelled walk is incomplete, so it must not overwrite the index
+        if index and not self.cancelled:
+            for root in roots:
+                root_repos = [r for r in self.repos if r["root"] == root.path]
+                index.save(root.path, root.max_depth, root.visited, root_repos, root.rules)
+            index.forget_roots_except([root.path for root in self.roots])
+        self.finished = not self.cancelled
+        return self.repos
+
+    def batches(self, interval=0.1):
+        thread = threading.Thread(target=self.run, daemon=True)
+        thread.start()
+        sent = 0
+        while True:
+            thread.join(interval)
+            done = not thread.is_alive()
+            if self.cancelled:
+                return
+            found = len(self.repos)
+            yield self.repos[sent:found]
+            sent = found
+            if done:
+                return
+
+def get_git_repos(base_path, max_depth=1, use_index=True, workers=None, visited=None):
+    """Scans base_path for repos. Pass a dict as `visited` to get the walked directories back."""
+    scan = RepoScan([ScanRoot(base_path, max_depth)], use_index=use_index, workers=workers)
+    scan.run()
+    if visited is not None:
+        visited.update(scan.visited)
+    return scan.repos
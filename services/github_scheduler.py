@@ -0,0 +1,175 @@
+import asyncio
+import contextvars
+import heapq
+import itertools
+import random
+import time
+
+import httpx
+
+# Lower runs first: something the user just asked for goes ahead of a
+# re-sync nobody is waiting on
+INTERACTIVE, BACKGROUND = 0, 1
+_priority = contextvars.ContextVar("priority", default=INTERACTIVE)
+
+BASE_DELAY = 1.0  # First backoff when GitHub says slow down without saying how long
+JITTER = 0.5  # Up to this fraction is added to every backoff, so retries don't line up
+
+
+def set_priority(priority):
+    """Priority of the requests made from here on, in this task and the ones it starts."""
+    _priority.set(priority)
+
+
+def resource_for(url):
+    """The rate limit bucket a request counts against."""
+    if url.path.startswith("/search/"):
+        return "search"
+    if url.path == "/graphql":
+        return "graphql"
+    return "core"
+
+
+class RateLimited(Exception):
+    """GitHub won't take more requests (of `resource`) until `reset`."""
+
+    def __init__(self, resource, reset):
+        self.resource = resource
+        self.reset = reset
+        until = time.strftime("%H:%M", time.localtime(reset))
+        super().__init__(f"GitHub rate limit reached ({resource}) until {until}")
+
+
+class RequestScheduler:
+    """Paces every GitHub request: at most `max_concurrent` in flight, taken in
+    priority order, and within the rate limits GitHub reports.
+
+    Budgets come from the X-RateLimit-* headers of each response. A request
+    whose budget is spent waits for the reset if it's within `max_wait`
+    seconds, and fails with RateLimited otherwise. A 403/429 from a rate limit
+    is retried after Retry-After (or the reset, or an exponential backoff),
+    plus jitter, holding back every other request meanwhile since secondary
+    limits apply to the whole account. Only used from the session loop.
+    """
+
+    def __init__(self, max_concurrent=6, max_retries=3, max_wait=60):
+        self.max_concurrent = max_concurrent
+        self.max_retries = max_retries
+        self.max_wait = max_wait
+        self.active = 0
+        self.waiting = []  # heap of (priority, arrival, future)
+        self.arrivals = itertools.count()
+        self.budgets = {}  # resource -> (remaining, limit, reset time)
+        self.paused_until = 0
+
+    async def acquire(self, priority):
+        if self.active < self.max_concurrent and not self.waiting:
+            self.active += 1
+            return
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self.waiting, (priority, next(self.arrivals), future))
+        try:
+            await future  # release() hands its slot over
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self.release()
+            raise
+
+    def release(self):
+        while self.waiting:
+            future = heapq.heappop(self.waiting)[2]
+            if not future.done():
+                future.set_result(None)
+                return
+        self.active -= 1
+
+    async def wait_for_budget(self, resource):
+        now = time.time()
+        remaining, _, reset = self.budgets.get(resource, (None, None, 0))
+        if remaining == 0 and reset > now:
+            if reset - now > self.max_wait:
+                raise RateLimited(resource, reset)
+            await asyncio.sleep(reset - now + 1)
+        pause = self.paused_until - time.time()
+        if pause > 0:
+            await asyncio.sleep(pause)
+
+    def observe(self, headers):
+        """Records the budget a response reports."""
+        remaining = headers.get("X-RateLimit-Remaining")
+        if remaining is None:
+            return
+        try:
+            self.budgets[headers.get("X-RateLimit-Resource", "core")] = (
+                int(remaining), int(headers.get("X-RateLimit-Limit", 0)),
+                int(headers.get("X-RateLimit-Reset", 0)),
+            )
+        except ValueError:
+            pass
+
+    def backoff(self, response, attempt):
+        """Seconds to wait before retrying, or None if this isn't a rate limit."""
+        if response.status_code not in (403, 429):
+            return None
+        headers = response.headers
+        retry_after = headers.get("Retry-After")
+        if retry_after:
+            try:
+                delay = float(retry_after)
+            except ValueError:
+                delay = BASE_DELAY * 2 ** attempt
+        elif headers.get("X-RateLimit-Remaining") == "0":
+            delay = max(0, int(headers.get("X-RateLimit-Reset", 0)) - time.time()) + 1
+        elif response.status_code == 429:
+            delay = BASE_DELAY * 2 ** attempt
+        else:
+            return None  # A plain 403: no access, retrying won't help
+        return delay + random.uniform(0, delay * JITTER)
+
+    def budget(self):
+        """(remaining, limit, reset, resource) of the bucket closest to running
+        out, or None before any response has said."""
+        if not self.budgets:
+            return None
+        resource, (remaining, limit, reset) = min(
+            self.budgets.items(), key=lambda item: item[1][0] / (item[1][1] or 1)
+        )
+        return remaining, limit, reset, resource
+
+
+class ScheduledTransport(httpx.AsyncBaseTransport):
+    """Sends requests through a RequestScheduler, retrying rate limited ones.
+    Waits are counted via `note("throttled")` for whoever made the request."""
+
+    def __init__(self, transport, scheduler, note=None):
+        self.transport = transport
+        self.scheduler = scheduler
+        self.note = note or (lambda name: None)
+
+    async def handle_async_request(self, request):
+        scheduler = self.scheduler
+        resource = resource_for(request.url)
+        for attempt in range(scheduler.max_retries + 1):
+            await scheduler.wait_for_budget(resource)
+            await scheduler.acquire(_priority.get())
+            try:
+                response = await self.transport.handle_async_request(request)
+            finally:
+                scheduler.release()
+            scheduler.observe(response.headers)
+
+            delay = scheduler.backoff(response, attempt)
+            if delay is None:
+                return response
+            await response.aclose()
+            if delay > scheduler.max_wait or attempt == scheduler.max_retries:
+                reset = time.time() + delay
+                if response.headers.get("X-RateLimit-Remaining") == "0":
+                    reset = int(response.headers.get("X-RateLimit-Reset", reset))
+                raise RateLimited(resource, reset)
+            self.note("throttled")
+            scheduler.paused_until = max(scheduler.paused_until, time.time() + delay)
+            await asyncio.sleep(delay)
+
+    async def aclose(self):
+        await self.transport.aclose()
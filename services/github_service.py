@@ -0,0 +1,284 @@
+import asyncio
+import time
+
+import httpx
+
+import services.config as config
+from services.auth_service import AuthService
+from services.github_scheduler import BACKGROUND, INTERACTIVE, RateLimited, set_priority
+from services.github_session import count_requests, get_session
+
+GRAPHQL_URL = "https://api.github.com/graphql"
+GRAPHQL_PAGE_SIZE = 50
+
+# Both lists, with review decision and CI rollup, in one query. A search that
+# has more pages is fetched again on its own, by switching the other one off.
+DASHBOARD_QUERY = """
+query($mine: Boolean!, $mineAfter: String, $requested: Boolean!, $requestedAfter: String) {
+  mine: search(query: "is:open is:pr author:@me", type: ISSUE,
+               first: %(page)d, after: $mineAfter) @include(if: $mine) {
+    pageInfo { hasNextPage endCursor }
+    nodes {
+      ... on PullRequest {
+        title
+        url
+        repository { name }
+        reviewDecision
+        latestReviews(first: 20) { nodes { state } }
+        commits(last: 1) { nodes { commit { statusCheckRollup { state } } } }
+      }
+    }
+  }
+  requested: search(query: "is:open is:pr review-requested:@me", type: ISSUE,
+                    first: %(page)d, after: $requestedAfter) @include(if: $requested) {
+    pageInfo { hasNextPage endCursor }
+    nodes {
+      ... on PullRequest {
+        title
+        url
+        repository { name }
+        author { login }
+      }
+    }
+  }
+}
+""" % {"page": GRAPHQL_PAGE_SIZE}
+
+class PRStateStore:
+    """What the REST refreshes have learned about each open PR, so the next one
+    only asks again about PRs that changed.
+
+    A push, review or comment moves a PR's updated_at, so an unchanged PR
+    keeps its review status and head SHA. CI doesn't move it: CI status is
+    kept per head SHA once it's final (SETTLED_CI), and polled again while
+    it's Pending or NA, which right after a push just means CI hasn't posted
+    yet. Used only from the session loop.
+    """
+
+    def __init__(self):
+        self.prs = {}  # PR url -> {"updated_at", "head_sha", "review_status"}
+        self.ci = {}  # head SHA -> settled CI status
+
+    def keep_only(self, urls):
+        """Forgets PRs that are no longer open, and CI for SHAs no longer at a head."""
+        self.prs = {url: self.prs[url] for url in urls if url in self.prs}
+        heads = {pr["head_sha"] for pr in self.prs.values()}
+        self.ci = {sha: status for sha, status in self.ci.items() if sha in heads}
+
+pr_state = PRStateStore()
+SETTLED_CI = ("Success", "Failure", "Error")
+
+async def fetch_ci_status(client, repo_full_name, head_sha, headers):
+    """Success/Failure/Pending for a commit's statuses, NA if it has none, None if
+    the call failed. Settled results are cached per SHA."""
+    status = pr_state.ci.get(head_sha)
+    if status is not None:
+        return status
+
+    status_url = f"https://api.github.com/repos/{repo_full_name}/commits/{head_sha}/status"
+    res_st = await client.get(status_url, headers=headers, timeout=3)
+    if res_st.status_code != 200:
+        return None
+    data = res_st.json()
+    state = data.get("state", "None")
+    status = state.capitalize() if data.get("total_count", 0) > 0 else "NA"
+    if status in SETTLED_CI:
+        pr_state.ci[head_sha] = status
+    return status
+
+async def fetch_pr_details(client, item, headers):
+    """Fetches Review and CI status for a single PR, skipping what hasn't changed
+    since the last refresh (see PRStateStore)."""
+    repo_full_name = "/".join(item["repository_url"].split("/")[-2:])
+    pr_number = item["number"]
+    url = item["html_url"]
+    
+    # Define the individual detail calls
+    reviews_url = f"https://api.github.com/repos/{repo_full_name}/pulls/{pr_number}/reviews"
+    pr_detail_url = f"https://api.github.com/repos/{repo_full_name}/pulls/{pr_number}"
+    
+    try:
+        known = pr_state.prs.get(url)
+        if known and known["updated_at"] == item.get("updated_at"):
+            review_status, head_sha = known["review_status"], known["head_sha"]
+        else:
+            # Fetch review list and PR details (to get head SHA) concurrently
+            res_rev, res_pr = await asyncio.gather(
+                client.get(reviews_url, headers=headers, timeout=3),
+                client.get(pr_detail_url, headers=headers, timeout=3)
+            )
+
+            # Process Review Status
+            review_status = "Pending"
+            if res_rev.status_code == 200:
+                revs = res_rev.json()
+                if any(rv["state"] == "APPROVED" for rv in revs): review_status = "Approved"
+                elif any(rv["state"] == "CHANGES_REQUESTED" for rv in revs): review_status = "Needs Work"
+
+            head_sha = res_pr.json()["head"]["sha"] if res_pr.status_code == 200 else None
+            # Only a complete answer is worth skipping the calls for next time
+            if res_rev.status_code == 200 and head_sha:
+                pr_state.prs[url] = {
+                    "updated_at": item.get("updated_at"),
+                    "head_sha": head_sha,
+                    "review_status": review_status,
+                }
+
+        # Process CI Status (Requires a second hop to the Status API using the SHA)
+        actions_status = None
+        if head_sha:
+            actions_status = await fetch_ci_status(client, repo_full_name, head_sha, headers)
+
+        return {
+            "repo": repo_full_name.split("/")[-1],
+            "title": item["title"],
+            "review_status": review_status,
+            "ci_status": actions_status or "NA",
+            "url": url
+        }
+    except RateLimited:
+        raise  # The whole sync is stale then, not just this PR
+    except Exception as e:
+        print(f"Error fetching details for PR {pr_number}: {e}")
+        return None
+
+async def rest_open_prs(client, token):
+    """My open PRs over REST: a search, then reviews and CI for the PRs that
+    changed since the last refresh (up to 3 calls each)."""
+    headers = {"Authorization": f"token {token}", "Accept": "application/vnd.github.v3+json"}
+    query = "is:open is:pr author:@me"
+    search_url = f"https://api.github.com/search/issues?q={query}"
+
+    r = await client.get(search_url, headers=headers, timeout=5)
+    if r.status_code != 200: return []
+
+    items = r.json().get("items", [])
+    # Trigger all PR detail fetches at once! (the scheduler paces them)
+    tasks = [fetch_pr_details(client, item, headers) for item in items]
+    results = await asyncio.gather(*tasks)
+    pr_state.keep_only([item["html_url"] for item in items])
+
+    return [res for res in results if res]
+
+async def rest_review_requests(client, token):
+    query = "is:open is:pr review-requested:@me"
+    url = f"https://api.github.com/search/issues?q={query}"
+    headers = {"Authorization": f"token {token}"}
+
+    r = await client.get(url, headers=headers, timeout=5)
+    if r.status_code != 200: return []
+    return [{
+        "repo": i["repository_url"].split("/")[-1],
+        "author": i["user"]["login"],
+        "title": i["title"],
+        "url": i["html_url"]
+    } for i in r.json().get("items", [])]
+
+def graphql_review_status(pr):
+    """Same labels as the REST path: the review decision when the repo requires
+    reviews, otherwise the latest review from each reviewer."""
+    decision = pr.get("reviewDecision")
+    if decision == "APPROVED": return "Approved"
+    if decision == "CHANGES_REQUESTED": return "Needs Work"
+    states = {rv["state"] for rv in (pr.get("latestReviews") or {}).get("nodes", [])}
+    if "APPROVED" in states: return "Approved"
+    if "CHANGES_REQUESTED" in states: return "Needs Work"
+    return "Pending"
+
+def graphql_ci_status(pr):
+    """Success/Failure/Pending/Error for the head commit's checks and statuses, or NA."""
+    commits = pr["commits"]["nodes"]
+    rollup = commits[0]["commit"]["statusCheckRollup"] if commits else None
+    return rollup["state"].capitalize() if rollup else "NA"
+
+async def graphql_dashboard(client, token):
+    """(my open PRs, PRs waiting on my review) in one query per page.
+
+    Raises on any HTTP or GraphQL error, so the caller can fall back to REST.
+    """
+    headers = {"Authorization": f"bearer {token}"}
+    variables = {"mine": True, "mineAfter": None, "requested": True, "requestedAfter": None}
+    prs, reviews = [], []
+    while variables["mine"] or variables["requested"]:
+        r = await client.post(
+            GRAPHQL_URL, json={"query": DASHBOARD_QUERY, "variables": variables},
+            headers=headers, timeout=10
+        )
+        r.raise_for_status()
+        body = r.json()
+        if body.get("errors"):
+            raise RuntimeError(body["errors"][0].get("message", "GraphQL error"))
+        data = body["data"]
+
+        # Search can also return issues; those come back as empty nodes
+        for pr in data.get("mine", {}).get("nodes", []):
+            if not pr: continue
+            prs.append({
+                "repo": pr["repository"]["name"],
+                "title": pr["title"],
+                "review_status": graphql_review_status(pr),
+                "ci_status": graphql_ci_status(pr),
+                "url": pr["url"]
+            })
+        for pr in data.get("requested", {}).get("nodes", []):
+            if not pr: continue
+            reviews.append({
+                "repo": pr["repository"]["name"],
+                "author": (pr.get("author") or {}).get("login", "ghost"),
+                "title": pr["title"],
+                "url": pr["url"]
+            })
+
+        for name in ("mine", "requested"):
+            if variables[name]:
+                page = data[name]["pageInfo"]
+                variables[name] = page["hasNextPage"]
+                variables[f"{name}After"] = page["endCursor"]
+    return prs, reviews
+
+# The *_async functions use the shared session's client, so they must run on
+# its loop: get_session().run(...) or .submit(...)
+
+async def fetch_dashboard_async(stats=None, api=None, background=False):
+    """(my open PRs, PRs waiting on my review), as the PR and review tables show them.
+
+    Uses GraphQL (config.get_github_api(), unless `api` says otherwise) and
+    falls back to REST if that fails. A `stats` dict gets the API that
+    answered, the request counters (see count_requests), the wall time in
+    seconds and the rate limit budget left. Raises RateLimited if GitHub
+    won't answer until a reset too far off to wait for. `background` lets
+    anything interactive go first.
+    """
+    token = AuthService.get_token()
+    if not token: return [], []
+
+    stats = {} if stats is None else stats
+    count_requests(stats)
+    set_priority(BACKGROUND if background else INTERACTIVE)
+    started = time.perf_counter()
+    session = get_session()
+    client = session.client
+
+    result = None
+    if (api or config.get_github_api()) == "graphql":
+        try:
+            result = await graphql_dashboard(client, token)
+            stats["api"] = "GraphQL"
+        except (httpx.HTTPError, RuntimeError, KeyError, TypeError, ValueError) as e:
+            print(f"GraphQL sync failed, using REST: {e}")
+        except RateLimited as e:
+            if e.resource != "graphql": raise
+            print(f"{e}, using REST")  # REST has its own budget
+    if result is None:
+        result = tuple(await asyncio.gather(
+            rest_open_prs(client, token),
+            rest_review_requests(client, token)
+        ))
+        stats["api"] = "REST"
+
+    stats["seconds"] = time.perf_counter() - started
+    stats["budget"] = session.scheduler.budget()
+    return result
+
+def fetch_dashboard(stats=None, api=None, background=False):
+    return get_session().run(fetch_dashboard_async(stats, api, background))
@@ -0,0 +1,108 @@
+import asyncio
+import contextvars
+import importlib.util
+import threading
+
+import httpx
+
+import services.config as config
+from services.github_scheduler import RequestScheduler, ScheduledTransport
+from services.http_cache import CachingTransport, HttpCache
+
+# A sync is one GraphQL query, or a few dozen REST calls over the fallback
+LIMITS = httpx.Limits(max_connections=20, max_keepalive_connections=10, keepalive_expiry=120)
+TIMEOUT = httpx.Timeout(10, connect=5)
+
+# The stats dict of the call being made, so concurrent calls count their own requests
+_request_stats = contextvars.ContextVar("request_stats", default=None)
+
+_lock = threading.Lock()
+_session = None
+
+
+def count_requests(stats):
+    """Counts the session requests made from here on, in this task and the
+    tasks it starts, into stats: "requests", "cache_hits", "cache_misses" and
+    "throttled" (rate limit waits)."""
+    stats.update(requests=0, cache_hits=0, cache_misses=0, throttled=0)
+    _request_stats.set(stats)
+
+
+def note(name):
+    """Bumps a counter in the stats of whoever is making the current request."""
+    stats = _request_stats.get()
+    if stats is not None:
+        stats[name] = stats.get(name, 0) + 1
+
+
+async def _count_request(request):
+    note("requests")
+
+
+class GitHubSession:
+    """One pooled HTTP client for every GitHub call, on its own event loop.
+
+    The loop runs on a daemon thread for the life of the app, so connections
+    (and their TLS sessions) are kept alive between syncs instead of being
+    set up again for each one. Uses HTTP/2 when the h2 package is installed,
+    which puts concurrent requests on a single connection. GETs go through the
+    ETag cache (http_cache) unless GITHUB_CACHE_MB is 0, and every request
+    through the scheduler, which keeps them within GitHub's rate limits.
+    """
+
+    def __init__(self):
+        self.http2 = importlib.util.find_spec("h2") is not None
+        cache_mb = config.get_github_cache_mb()
+        self.cache = HttpCache(max_bytes=cache_mb * 1024 * 1024) if cache_mb else None
+        self.scheduler = RequestScheduler(max_concurrent=config.get_github_concurrency())
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, name="github", daemon=True)
+        self.thread.start()
+        self.client = self.run(self._open())
+
+    async def _open(self):
+        # Created on the loop it'll be used from
+        transport = httpx.AsyncHTTPTransport(http2=self.http2, limits=LIMITS)
+        if self.cache:
+            transport = CachingTransport(transport, self.cache, note)
+        transport = ScheduledTransport(transport, self.scheduler, note)
+        return httpx.AsyncClient(
+            transport=transport, timeout=TIMEOUT,
+            event_hooks={"request": [_count_request]},
+        )
+
+    def submit(self, coro):
+        """Schedules a coroutine on the session loop; returns a concurrent Future."""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro):
+        """Runs a coroutine on the session loop and waits for its result.
+        Not for use from the loop itself."""
+        return self.submit(coro).result()
+
+    def close(self, timeout=2):
+        """Closes the pooled connections and stops the loop."""
+        try:
+            self.submit(self.client.aclose()).result(timeout)
+        except Exception as e:
+            print(f"Error closing GitHub session: {e}")
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join(timeout)
+
+
+def get_session():
+    """The shared session, started on first use."""
+    global _session
+    with _lock:
+        if _session is None:
+            _session = GitHubSession()
+        return _session
+
+
+def close_session():
+    """Closes the shared session if one was started."""
+    global _session
+    with _lock:
+        session, _session = _session, None
+    if session:
+        session.close()
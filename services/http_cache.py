@@ -0,0 +1,194 @@
+import hashlib
+import json
+import os
+import sqlite3
+import time
+
+import httpx
+
+from services.config import SCRIPT_DIR
+
+# GITHUB_CACHE_PATH lets benchmarks and scripts keep their own cache
+CACHE_PATH = os.getenv("GITHUB_CACHE_PATH") or os.path.join(SCRIPT_DIR, ".github_cache.db")
+CACHE_VERSION = 1
+
+# Headers that describe the bytes on the wire, which no longer apply once the
+# body has been decoded and stored
+WIRE_HEADERS = ("content-encoding", "content-length", "transfer-encoding")
+
+
+def token_partition(authorization):
+    """Cache partition for an Authorization header: a hash, never the token."""
+    if not authorization:
+        return ""
+    return hashlib.sha256(authorization.split()[-1].encode()).hexdigest()[:16]
+
+
+class HttpCache:
+    """Disk-backed store of GitHub responses by ETag / Last-Modified.
+
+    Rows are partitioned by token, so one account never sees another's
+    responses, and kept to `max_bytes` by evicting the least recently used.
+    Used only from the GitHub session's loop thread, so one connection is kept
+    open for it.
+    """
+
+    def __init__(self, path=CACHE_PATH, max_bytes=20 * 1024 * 1024):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._conn = None
+        self._size = 0
+
+    def _connect(self):
+        if self._conn is None:
+            conn = sqlite3.connect(self.path, timeout=5)
+            if conn.execute("PRAGMA user_version").fetchone()[0] != CACHE_VERSION:
+                conn.executescript(
+                    f"""
+                    DROP TABLE IF EXISTS responses;
+                    PRAGMA user_version = {CACHE_VERSION};
+                    """
+                )
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS responses (
+                    partition TEXT,
+                    key TEXT,
+                    etag TEXT,
+                    last_modified TEXT,
+                    headers TEXT,
+                    body BLOB,
+                    size INTEGER,
+                    used REAL,
+                    PRIMARY KEY (partition, key)
+                )
+                """
+            )
+            self._size = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+            self._conn = conn
+        return self._conn
+
+    def get(self, partition, key):
+        """(etag, last_modified, headers, body) or None."""
+        row = self._connect().execute(
+            "SELECT etag, last_modified, headers, body FROM responses WHERE partition = ? AND key = ?",
+            (partition, key),
+        ).fetchone()
+        if row is None:
+            return None
+        return row[0], row[1], json.loads(row[2]), row[3]
+
+    def touch(self, partition, key):
+        conn = self._connect()
+        with conn:
+            conn.execute(
+                "UPDATE responses SET used = ? WHERE partition = ? AND key = ?",
+                (time.time(), partition, key),
+            )
+
+    def put(self, partition, key, etag, last_modified, headers, body):
+        conn = self._connect()
+        size = len(body) + len(key)
+        if size > self.max_bytes:
+            return
+        with conn:
+            old = conn.execute(
+                "SELECT size FROM responses WHERE partition = ? AND key = ?", (partition, key)
+            ).fetchone()
+            conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (partition, key, etag, last_modified, json.dumps(headers), body, size, time.time()),
+            )
+            self._size += size - (old[0] if old else 0)
+            if self._size > self.max_bytes:
+                self._evict(conn)
+
+    def _evict(self, conn):
+        # Keeps the most recently used rows that fit in three quarters of the
+        # budget, so a full cache isn't trimmed again on every write
+        conn.execute(
+            """
+            DELETE FROM responses WHERE rowid IN (
+                SELECT rowid FROM (
+                    SELECT rowid, SUM(size) OVER (ORDER BY used DESC) AS total FROM responses
+                ) WHERE total > ?
+            )
+            """,
+            (self.max_bytes * 3 // 4,),
+        )
+        self._size = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+class CachingTransport(httpx.AsyncBaseTransport):
+    """Revalidates GETs against the HttpCache instead of downloading them again.
+
+    Sends If-None-Match / If-Modified-Since for anything cached and answers
+    a 304 (which GitHub doesn't count against the rate limit) with the stored
+    body. The 304's own headers are kept, so rate limit headers stay current.
+    Hits and misses are counted on the cache and via `note` (a callable taking
+    a counter name), for whoever made the request.
+    """
+
+    def __init__(self, transport, cache, note=None):
+        self.transport = transport
+        self.cache = cache
+        self.note = note or (lambda name: None)
+
+    async def handle_async_request(self, request):
+        if request.method != "GET":
+            return await self.transport.handle_async_request(request)
+
+        partition = token_partition(request.headers.get("Authorization"))
+        # Responses vary by media type (v3 JSON, diffs, ...)
+        key = f"{request.url}\n{request.headers.get('Accept', '')}"
+        try:
+            entry = self.cache.get(partition, key)
+        except sqlite3.Error as e:
+            print(f"GitHub cache unavailable: {e}")
+            return await self.transport.handle_async_request(request)
+        if entry:
+            etag, last_modified = entry[0], entry[1]
+            if etag:
+                request.headers["If-None-Match"] = etag
+            if last_modified:
+                request.headers["If-Modified-Since"] = last_modified
+
+        response = await self.transport.handle_async_request(request)
+        if response.status_code == 304 and entry:
+            await response.aclose()
+            self.cache.touch(partition, key)
+            self.cache.hits += 1
+            self.note("cache_hits")
+            headers = [(k, v) for k, v in response.headers.items() if k.lower() not in WIRE_HEADERS]
+            headers += [(k, v) for k, v in entry[2].items() if k.lower() not in response.headers]
+            return httpx.Response(200, headers=headers, content=entry[3], request=request)
+
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if response.status_code != 200 or not (etag or last_modified):
+            return response
+
+        # Read (and decode) the body here to store it; the client then gets
+        # the plain bytes, so the encoding headers are dropped
+        body = await response.aread()
+        await response.aclose()
+        self.cache.misses += 1
+        self.note("cache_misses")
+        headers = [(k, v) for k, v in response.headers.items() if k.lower() not in WIRE_HEADERS]
+        stored = {k: v for k, v in headers if k.lower() in ("content-type", "link")}
+        try:
+            self.cache.put(partition, key, etag, last_modified, stored, body)
+        except sqlite3.Error as e:
+            print(f"Could not cache {request.url}: {e}")
+        return httpx.Response(200, headers=headers, content=body, request=request)
+
+    async def aclose(self):
+        await self.transport.aclose()
+        self.cache.close()
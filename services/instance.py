@@ -0,0 +1,165 @@
+import json
+import os
+import socket
+import tempfile
+import threading
+
+CONNECT_TIMEOUT = 0.5
+
+
+def socket_path():
+    """Per-user socket path: $XDG_RUNTIME_DIR when there is one, else the temp dir."""
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir and os.path.isdir(runtime_dir):
+        return os.path.join(runtime_dir, "git-dashboard.sock")
+    return os.path.join(tempfile.gettempdir(), f"git-dashboard-{os.getuid()}.sock")
+
+
+def supported():
+    return hasattr(socket, "AF_UNIX") and hasattr(os, "getuid")
+
+
+def send_to_running(message, path=None):
+    """Hands `message` to a running instance. Returns False if there isn't one.
+
+    A socket file nobody is listening on (left behind by a crash) reads as
+    "not running"; the next InstanceServer cleans it up.
+    """
+    if not supported():
+        return False
+    path = path or socket_path()
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(CONNECT_TIMEOUT)
+            sock.connect(path)
+            sock.sendall(json.dumps(message).encode() + b"\n")
+            return sock.makefile("rb").readline().strip() == b"ok"
+    except OSError:  # Includes refused, missing file and timeouts
+        return False
+
+
+class InstanceServer:
+    """Listens for other launches and passes their messages to `on_message`.
+
+    `on_message(dict)` runs on the server thread, so Tk callers should hop back
+    with `root.after`. `start()` returns False if another live instance already
+    owns the socket, or if there can't be one (the app then runs standalone).
+    """
+
+    def __init__(self, on_message, path=None):
+        self.on_message = on_message
+        self.path = path or socket_path()
+        self.sock = None
+        self._inode = None
+
+    def start(self):
+        """Starts listening. False if another live instance owns the socket, or
+        if the socket can't be set up at all (then this runs standalone)."""
+        if not supported():
+            return False
+        try:
+            sock = self._bind()
+        except OSError as e:
+            print(f"Single-instance socket unavailable, running standalone: {e}")
+            return False
+        if sock is None:
+            return False
+        self.sock = sock
+        threading.Thread(target=self._serve, daemon=True).start()
+        return True
+
+    def _bind(self):
+        # Bound and listening under a private name first, then linked into
+        # place, so the socket is never visible at `path` without a listener
+        # (a peer probing it then would take it for stale and remove it).
+        # link() doesn't replace an existing file, unlike rename().
+        temp_path = f"{self.path}.{os.getpid()}"
+        try:
+            os.unlink(temp_path)
+        except FileNotFoundError:
+            pass
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        old_umask = os.umask(0o177)  # Owner-only from the moment it exists
+        try:
+            sock.bind(temp_path)
+            sock.listen(4)
+            for _ in range(2):
+                try:
+                    os.link(temp_path, self.path)
+                    self._inode = os.stat(self.path).st_ino
+                    return sock
+                except FileExistsError:
+                    pass
+                # Something is at the path: a live instance, or a stale socket
+                if not self._remove_stale():
+                    break
+            sock.close()
+            return None
+        except OSError:
+            sock.close()
+            raise
+        finally:
+            os.umask(old_umask)
+            try:
+                os.unlink(temp_path)
+            except OSError:
+                pass
+
+    def _remove_stale(self):
+        """Removes the socket at `path` if nobody is listening on it. False if
+        it belongs to a live instance."""
+        try:
+            inode = os.stat(self.path).st_ino
+        except FileNotFoundError:
+            return True
+        if self._is_alive():
+            return False
+        try:
+            # Only the file we probed, not one a concurrent launch just put there
+            if os.stat(self.path).st_ino == inode:
+                os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+        return True
+
+    def _is_alive(self):
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+                probe.settimeout(CONNECT_TIMEOUT)
+                probe.connect(self.path)
+                return True
+        except OSError:
+            return False
+
+    def _serve(self):
+        while True:
+            try:
+                conn, _ = self.sock.accept()
+            except OSError:
+                return  # Closed
+            with conn:
+                try:
+                    conn.settimeout(CONNECT_TIMEOUT)
+                    line = conn.makefile("rb").readline()
+                    if not line:
+                        continue  # A liveness probe
+                    message = json.loads(line)
+                    conn.sendall(b"ok\n")
+                except (OSError, ValueError):
+                    continue
+            try:
+                self.on_message(message)
+            except Exception as e:
+                print(f"Instance message error: {e}")
+
+    def close(self):
+        if self.sock is None:
+            return
+        self.sock.close()
+        self.sock = None
+        # Only remove the socket if it's still ours, not a newer instance's
+        try:
+            if os.stat(self.path).st_ino == self._inode:
+                os.unlink(self.path)
+        except OSError:
+            pass
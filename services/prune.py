@@ -0,0 +1,67 @@
+import os
+from fnmatch import fnmatch
+
+import services.config as config
+
+IGNORE_FILE = ".reposignore"
+
+
+class PruneRules:
+    """Decides which folders the scanner shouldn't bother descending into.
+
+    Patterns are shell globs. A pattern without a slash matches a folder name
+    anywhere (`node_modules`, `*.egg-info`); a pattern with a slash matches the
+    path relative to the scan root (`clients/*/data`). On top of that, a folder
+    with more than `max_entries` entries or that takes longer than
+    `time_budget` seconds to list is treated as a data dump and not descended.
+    """
+
+    def __init__(self, root, patterns=(), max_entries=0, time_budget=0):
+        self.root = root
+        self.name_patterns = []
+        self.path_patterns = []
+        for pattern in patterns:
+            pattern = pattern.strip().strip("/")
+            if not pattern:
+                continue
+            (self.path_patterns if "/" in pattern else self.name_patterns).append(pattern)
+        self.max_entries = max_entries
+        self.time_budget = time_budget
+
+    @classmethod
+    def from_config(cls, root, extra=()):
+        """Global patterns, plus the root's own patterns and .reposignore."""
+        patterns = config.get_prune_patterns() + list(extra) + read_ignore_file(root)
+        return cls(
+            root,
+            patterns,
+            max_entries=config.get_max_dir_entries(),
+            time_budget=config.get_dir_time_budget(),
+        )
+
+    def fingerprint(self):
+        """Changes whenever the rules would produce a different walk."""
+        return "|".join([
+            ",".join(self.name_patterns),
+            ",".join(self.path_patterns),
+            str(self.max_entries),
+            str(self.time_budget),
+        ])
+
+    def excludes(self, name, path):
+        if any(fnmatch(name, p) for p in self.name_patterns):
+            return True
+        if self.path_patterns:
+            rel = os.path.relpath(path, self.root).replace(os.sep, "/")
+            return any(fnmatch(rel, p) for p in self.path_patterns)
+        return False
+
+
+def read_ignore_file(root):
+    """Returns the patterns listed in <root>/.reposignore (one per line, # comments)."""
+    try:
+        with open(os.path.join(root, IGNORE_FILE), "r") as f:
+            lines = f.read().splitlines()
+    except OSError:
+        return []
+    return [line.strip() for line in lines if line.strip() and not line.lstrip().startswith("#")]
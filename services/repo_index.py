@@ -0,0 +1,151 @@
+import json
+import os
+import sqlite3
+
+from services.config import SCRIPT_DIR
+
+# REPO_INDEX_PATH lets benchmarks and scripts keep their own index
+INDEX_PATH = os.getenv("REPO_INDEX_PATH") or os.path.join(SCRIPT_DIR, ".repo_index.db")
+
+# Bump whenever the on-disk layout or the walker semantics change so stale
+# indexes from older versions are thrown away instead of misread.
+INDEX_VERSION = "4"
+
+
+def make_fingerprint(base_path, max_depth, rules=None):
+    """Identifies the scan settings an index was built for."""
+    prune = rules.fingerprint() if rules else ""
+    return f"{INDEX_VERSION}|{root_key(base_path)}|{max_depth}|{prune}"
+
+
+def root_key(base_path):
+    return os.path.realpath(os.path.expanduser(base_path))
+
+
+class RepoIndex:
+    """Persistent record of discovered repos and visited directory mtimes.
+
+    Lives next to .env as a small SQLite file, with rows partitioned by scan
+    root so each root is invalidated on its own. Each directory row remembers the
+    mtime it had when we listed it, whether it holds a .git entry, which
+    subdirectories it contained and how many it pruned, so a refresh can skip
+    `scandir` on anything that hasn't changed since.
+    """
+
+    def __init__(self, path=INDEX_PATH):
+        self.path = path
+
+    def _connect(self):
+        # One short-lived connection per call keeps us safe to use from
+        # whichever thread happens to run the scan.
+        conn = sqlite3.connect(self.path, timeout=5)
+        if conn.execute("PRAGMA user_version").fetchone()[0] != int(INDEX_VERSION):
+            # Written by another version: the table layout may differ, start over
+            conn.executescript(
+                f"""
+                DROP TABLE IF EXISTS meta;
+                DROP TABLE IF EXISTS dirs;
+                DROP TABLE IF EXISTS repos;
+                PRAGMA user_version = {int(INDEX_VERSION)};
+                """
+            )
+        conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS meta (root TEXT PRIMARY KEY, fingerprint TEXT);
+            CREATE TABLE IF NOT EXISTS dirs (
+                root TEXT,
+                path TEXT,
+                mtime_ns INTEGER,
+                is_repo INTEGER,
+                subdirs TEXT,
+                pruned INTEGER,
+                PRIMARY KEY (root, path)
+            );
+            CREATE TABLE IF NOT EXISTS repos (
+                root TEXT,
+                path TEXT,
+                data TEXT,
+                PRIMARY KEY (root, path)
+            );
+            """
+        )
+        return conn
+
+    def _is_current(self, conn, base_path, fingerprint):
+        row = conn.execute(
+            "SELECT fingerprint FROM meta WHERE root = ?", (root_key(base_path),)
+        ).fetchone()
+        return row is not None and row[0] == fingerprint
+
+    def load_dirs(self, base_path, max_depth, rules=None):
+        """Returns {path: (mtime_ns, is_repo, subdirs, pruned)} or {} if the index is stale."""
+        try:
+            with self._connect() as conn:
+                if not self._is_current(conn, base_path, make_fingerprint(base_path, max_depth, rules)):
+                    return {}
+                return {
+                    path: (mtime_ns, bool(is_repo), subdirs.split("\0") if subdirs else [], pruned)
+                    for path, mtime_ns, is_repo, subdirs, pruned in conn.execute(
+                        "SELECT path, mtime_ns, is_repo, subdirs, pruned FROM dirs WHERE root = ?",
+                        (root_key(base_path),),
+                    )
+                }
+        except sqlite3.Error:
+            return {}
+
+    def load_repos(self, base_path, max_depth, rules=None):
+        """Returns the repo dicts recorded by the last scan, without touching the disk tree."""
+        try:
+            with self._connect() as conn:
+                if not self._is_current(conn, base_path, make_fingerprint(base_path, max_depth, rules)):
+                    return []
+                return [
+                    json.loads(data)
+                    for (data,) in conn.execute(
+                        "SELECT data FROM repos WHERE root = ?", (root_key(base_path),)
+                    )
+                ]
+        except sqlite3.Error:
+            return []
+
+    def save(self, base_path, max_depth, dirs, repos, rules=None):
+        """Replaces one root's rows with the results of a finished scan."""
+        key = root_key(base_path)
+        try:
+            with self._connect() as conn:
+                conn.execute("DELETE FROM dirs WHERE root = ?", (key,))
+                conn.execute("DELETE FROM repos WHERE root = ?", (key,))
+                conn.executemany(
+                    "INSERT INTO dirs VALUES (?, ?, ?, ?, ?, ?)",
+                    [
+                        (key, path, mtime_ns, int(is_repo), "\0".join(subdirs), pruned)
+                        for path, (mtime_ns, is_repo, subdirs, pruned) in dirs.items()
+                    ],
+                )
+                conn.executemany(
+                    "INSERT INTO repos VALUES (?, ?, ?)",
+                    [(key, r["path"], json.dumps(r)) for r in repos],
+                )
+                conn.execute(
+                    "INSERT OR REPLACE INTO meta VALUES (?, ?)",
+                    (key, make_fingerprint(base_path, max_depth, rules)),
+                )
+        except sqlite3.Error as e:
+            print(f"Could not save repo index: {e}")
+
+    def forget_roots_except(self, base_paths):
+        """Drops rows for roots that are no longer configured."""
+        keep = [root_key(p) for p in base_paths]
+        marks = ",".join("?" * len(keep))
+        try:
+            with self._connect() as conn:
+                for table in ("meta", "dirs", "repos"):
+                    conn.execute(f"DELETE FROM {table} WHERE root NOT IN ({marks})", keep)
+        except sqlite3.Error as e:
+            print(f"Could not prune repo index: {e}")
+
+    def clear(self):
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
@@ -0,0 +1,74 @@
+import threading
+from collections import deque
+
+
+def walk_parallel(roots, visit, workers=8):
+    """Runs `visit(*item)` over a directory frontier with a work-stealing pool.
+
+    `roots` is a list of work items and `visit` returns the list of child items
+    to explore next. Each worker drains its own deque depth-first (LIFO) and,
+    when it runs dry, steals the oldest item from another worker's deque, which
+    tends to be a shallow directory with a lot of work underneath. That keeps
+    every thread busy on a slow network mount where each scandir/stat is
+    dominated by round-trip latency rather than CPU.
+    """
+    items = list(roots)
+    if workers <= 1:
+        # Plain depth-first walk, no threads involved
+        stack = items[::-1]
+        while stack:
+            stack.extend(reversed(visit(*stack.pop())))
+        return
+
+    queues = [deque() for _ in range(workers)]
+    for i, item in enumerate(items):
+        queues[i % workers].append(item)
+
+    cond = threading.Condition()
+    state = {"pending": len(items)}
+
+    def take(i):
+        try:
+            return queues[i].pop()
+        except IndexError:
+            pass
+        for offset in range(1, workers):
+            try:
+                return queues[(i + offset) % workers].popleft()
+            except IndexError:
+                continue
+        return None
+
+    def worker(i):
+        while True:
+            item = take(i)
+            if item is None:
+                with cond:
+                    if state["pending"] == 0:
+                        cond.notify_all()
+                        return
+                    cond.wait(0.005)
+                continue
+
+            try:
+                children = visit(*item)
+            except Exception as e:
+                print(f"Scan error in {item[0]}: {e}")
+                children = []
+
+            with cond:
+                # Count the children before publishing them so `pending` can
+                # never reach zero while work is still queued.
+                state["pending"] += len(children)
+            queues[i].extend(children)
+            with cond:
+                state["pending"] -= 1
+                cond.notify_all()
+
+    threads = [
+        threading.Thread(target=worker, args=(i,), daemon=True) for i in range(workers)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
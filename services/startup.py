@@ -0,0 +1,32 @@
+import sys
+import time
+
+# What "fast" means for the GUI: a painted window this soon after launch
+FIRST_PAINT_TARGET_MS = 150
+
+_state = {"start": None, "last": None, "seen": set()}
+
+
+def enable(start):
+    """Turns on `mark()` output; `start` is a perf_counter() taken at launch."""
+    _state["start"] = _state["last"] = start
+    print("Startup profile (ms since launch, +ms since previous step):", file=sys.stderr)
+
+
+def mark(step):
+    """Prints how long startup took to reach `step` the first time it's reached.
+
+    A no-op unless enabled, so it's safe to call from code that runs again later.
+    """
+    if _state["start"] is None or step in _state["seen"]:
+        return
+    _state["seen"].add(step)
+    now = time.perf_counter()
+    total = (now - _state["start"]) * 1000
+    delta = (now - _state["last"]) * 1000
+    _state["last"] = now
+    note = ""
+    if step == "window painted":
+        verdict = "ok" if total < FIRST_PAINT_TARGET_MS else "MISSED"
+        note = f"  (target <{FIRST_PAINT_TARGET_MS} ms: {verdict})"
+    print(f"  {total:8.1f}  +{delta:7.1f}  {step}{note}", file=sys.stderr, flush=True)
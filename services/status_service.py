@@ -0,0 +1,168 @@
+import os
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import services.config as config
+from services.git_meta import resolve_git_dir
+
+# Editing a file without staging it doesn't touch .git/index, so even an
+# unchanged key is re-checked once it's this old (seconds).
+STATUS_TTL = 300
+
+# path -> (key, checked_at, status)
+_cache = {}
+_cache_lock = threading.Lock()
+
+# Don't take .git/index.lock behind the user's back while they work in the repo
+GIT_ENV = dict(os.environ, GIT_OPTIONAL_LOCKS="0", GIT_TERMINAL_PROMPT="0")
+
+
+def status_key(repo_path):
+    """(index mtime, HEAD mtime): changes on stage, commit, checkout, reset, pull."""
+    git_dir, _ = resolve_git_dir(repo_path)
+    if not git_dir:
+        return None
+    key = []
+    for name in ("index", "HEAD"):
+        try:
+            key.append(os.stat(os.path.join(git_dir, name)).st_mtime_ns)
+        except OSError:
+            key.append(None)
+    return tuple(key)
+
+
+def stash_count(repo_path):
+    """Stash entries, counted from the stash reflog instead of running git."""
+    _, common_dir = resolve_git_dir(repo_path)
+    if not common_dir:
+        return 0
+    try:
+        with open(os.path.join(common_dir, "logs", "refs", "stash"), "rb") as f:
+            return sum(1 for _ in f)
+    except OSError:
+        return 0
+
+
+def parse_porcelain_v2(text):
+    status = {"changed": 0, "untracked": 0, "ahead": None, "behind": None, "error": None}
+    for line in text.splitlines():
+        if line.startswith("# branch.ab "):
+            ahead, behind = line.split()[2:4]
+            status["ahead"] = int(ahead)
+            status["behind"] = -int(behind)
+        elif line[:2] in ("1 ", "2 ", "u "):
+            status["changed"] += 1
+        elif line.startswith("? "):
+            status["untracked"] += 1
+    return status
+
+
+def get_repo_status(repo_path, timeout):
+    """Runs `git status --porcelain=v2 --branch` for one repo."""
+    try:
+        result = subprocess.run(
+            ["git", "status", "--porcelain=v2", "--branch"],
+            cwd=repo_path,
+            capture_output=True,
+            text=True,
+            timeout=timeout,
+            env=GIT_ENV,
+        )
+    except subprocess.TimeoutExpired:
+        return {"error": "timeout"}
+    except OSError as e:
+        return {"error": str(e)}
+    if result.returncode != 0:
+        return {"error": result.stderr.strip() or "git status failed"}
+    status = parse_porcelain_v2(result.stdout)
+    status["stash"] = stash_count(repo_path)
+    return status
+
+
+def cached_status(repo_path):
+    """The last known status for a repo, even if it may be stale."""
+    with _cache_lock:
+        hit = _cache.get(repo_path)
+    return hit[2] if hit else None
+
+
+def format_status(status):
+    """Compact STATUS column text: ●changed ?untracked ≡stash.
+
+    Ahead/behind have their own columns, filled from the commit-graph.
+    """
+    if not status:
+        return "…"
+    if status.get("error"):
+        return "⌛" if status["error"] == "timeout" else "!"
+    parts = []
+    if status.get("changed"):
+        parts.append(f"●{status['changed']}")
+    if status.get("untracked"):
+        parts.append(f"?{status['untracked']}")
+    if status.get("stash"):
+        parts.append(f"≡{status['stash']}")
+    return " ".join(parts) or "✓"
+
+
+class StatusEngine:
+    """Runs working-tree status checks across many repos in a bounded pool.
+
+    Each `refresh()` supersedes the previous one. Repos whose index and HEAD
+    are unchanged since their last check are answered from the cache without
+    spawning git. `on_result(path, status)` is called from worker threads as
+    results come in, so UI callers should hop back to Tk with `root.after`.
+    """
+
+    def __init__(self, workers=None, timeout=None):
+        self.workers = workers or config.get_status_workers()
+        self.timeout = timeout or config.get_status_timeout()
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def cancel(self):
+        with self._lock:
+            self._generation += 1
+
+    def refresh(self, repo_paths, on_result, supersede=True):
+        """Checks repo_paths; with supersede=False, runs alongside the current refresh."""
+        with self._lock:
+            if supersede:
+                self._generation += 1
+            generation = self._generation
+        threading.Thread(
+            target=self._run, args=(list(repo_paths), on_result, generation), daemon=True
+        ).start()
+
+    def _current(self, generation):
+        return generation == self._generation
+
+    def _check(self, path, key, on_result, generation):
+        if not self._current(generation):
+            return
+        status = get_repo_status(path, self.timeout)
+        if not status.get("error"):  # Let timeouts and failures retry next time
+            with _cache_lock:
+                _cache[path] = (key, time.time(), status)
+        if self._current(generation):
+            on_result(path, status)
+
+    def _run(self, repo_paths, on_result, generation):
+        now = time.time()
+        stale = []
+        for path in repo_paths:
+            if not self._current(generation):
+                return
+            key = status_key(path)
+            with _cache_lock:
+                hit = _cache.get(path)
+            if hit and key is not None and hit[0] == key and now - hit[1] < STATUS_TTL:
+                on_result(path, hit[2])
+            else:
+                stale.append((path, key))
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            for path, key in stale:
+                pool.submit(self._check, path, key, on_result, generation)
@@ -0,0 +1,166 @@
+import os
+import re
+from collections import defaultdict
+from itertools import chain, repeat
+
+# What a search term can be scoped to with a prefix, e.g. `org:acme` or
+# `path:clients/`. `org` is the owner part of the remote (`acme` in
+# github.com/acme/api), `remote` the whole normalized host/owner/repo.
+FIELDS = ("name", "path", "remote", "branch", "org")
+FIELD_ALIASES = {"url": "remote"}
+FILTER_RE = re.compile(r"(name|path|remote|url|branch|org):(.*)")
+
+# Every trigram of a string, overlapping, in one C-level pass
+GRAM_RE = re.compile(r"(?=(...))", re.S)
+# Joins documents in a bulk add; trigrams that span it are junk and dropped
+DOC_SEPARATOR = "\n\n"
+
+
+def parse_query(query):
+    """Splits a search into free text and (field, value) filters:
+    `org:acme billing` -> ("billing", [("org", "acme")]). Values may be empty
+    while the user is still typing them."""
+    text, filters = [], []
+    for token in query.split():
+        match = FILTER_RE.fullmatch(token)
+        if match:
+            field = FIELD_ALIASES.get(match.group(1), match.group(1))
+            filters.append((field, match.group(2)))
+        else:
+            text.append(token)
+    return " ".join(text), filters
+
+
+def relative_paths(repos):
+    """Each repo's path under its scan root (the whole path if it has none),
+    always ending in the repo's name so name matches are path matches too."""
+    prefixes = {}
+    paths = []
+    for repo in repos:
+        root = repo.get("root")
+        if root not in prefixes:
+            prefixes[root] = os.path.join(os.path.expanduser(root), "") if root else None
+        prefix = prefixes[root]
+        path = repo["path"]
+        if prefix and path.startswith(prefix):
+            path = path[len(prefix):]
+        if not path.endswith(repo["name"]):
+            path = f"{path}/{repo['name']}"
+        paths.append(path)
+    return paths
+
+
+def field_texts(repos):
+    """Lowercase text of every search field for each repo: FIELDS in order,
+    one tuple per repo."""
+    texts = []
+    for repo, relative in zip(repos, relative_paths(repos)):
+        remote = (repo.get("remote_key") or "").lower()
+        texts.append((
+            repo["name"].lower(),
+            relative.replace("\\", "/").lower(),
+            remote,
+            (repo.get("branch") or "").lower(),
+            remote.partition("/")[2].rpartition("/")[0],
+        ))
+    return texts
+
+
+def _signature(repo):
+    return (repo["name"], repo.get("root"), repo.get("remote_key"), repo.get("branch"))
+
+
+class TrigramIndex:
+    """Inverted index from trigrams to repo paths, over the search FIELDS.
+
+    `candidates` narrows a substring search to the repos holding all of its
+    trigrams (intersected rarest first), so checking them costs the size of
+    the answer rather than the number of repos.
+
+    An index is never changed once built, so it can be searched on one thread
+    while the next one is made on another: `updated` returns a new index for a
+    new repo list, re-indexing only the repos that are new or changed and
+    sharing every posting they don't touch. Building from scratch is the slow
+    part (about a second at 20k repos), so it belongs off the UI thread.
+    """
+
+    def __init__(self):
+        self.postings = {}  # trigram -> paths
+        self.docs = {}  # path -> the text its trigrams came from
+        self.signatures = {}  # path -> what the text was built from
+
+    def __len__(self):
+        return len(self.signatures)
+
+    def updated(self, repos):
+        """A new index over `repos`, built from this one."""
+        index = TrigramIndex()
+        index.postings = dict(self.postings)
+        index.docs = dict(self.docs)
+        index.signatures = dict(self.signatures)
+        seen = set()
+        fresh = []
+        for repo in repos:
+            seen.add(repo["path"])
+            if self.signatures.get(repo["path"]) != _signature(repo):
+                fresh.append(repo)
+        gone = [path for path in self.signatures if path not in seen]
+        copied = set()  # Postings shared with self, copied before they're changed
+        for path in chain(gone, (repo["path"] for repo in fresh)):
+            if path in index.signatures:
+                index._remove(path, copied)
+        if fresh:
+            index._add(fresh, copied)
+        return index
+
+    def _own(self, grams, copied):
+        for gram in grams:
+            if gram not in copied:
+                copied.add(gram)
+                if gram in self.postings:
+                    self.postings[gram] = set(self.postings[gram])
+
+    def _add(self, repos, copied):
+        paths = [repo["path"] for repo in repos]
+        # Name is part of the path and org part of the remote, so those three
+        # cover every field's trigrams
+        docs = ["\0".join(texts[1:4]) for texts in field_texts(repos)]
+        for repo, path, doc in zip(repos, paths, docs):
+            self.docs[path] = doc
+            self.signatures[path] = _signature(repo)
+
+        # All trigrams of all new repos in one pass, each paired with the repo
+        # it starts in, and added to their postings without a Python loop
+        joined = DOC_SEPARATOR.join(docs) + DOC_SEPARATOR
+        owners = chain.from_iterable(
+            map(repeat, paths, [len(doc) + len(DOC_SEPARATOR) for doc in docs])
+        )
+        grams = GRAM_RE.findall(joined)
+        self._own(set(grams), copied)
+        postings = defaultdict(set, self.postings)
+        list(map(set.add, map(postings.__getitem__, grams), owners))
+        self.postings = {gram: paths for gram, paths in postings.items() if "\n" not in gram}
+
+    def _remove(self, path, copied):
+        grams = set(GRAM_RE.findall(self.docs.pop(path)))
+        self._own(grams, copied)
+        for gram in grams:
+            posting = self.postings.get(gram)
+            if posting is not None:
+                posting.discard(path)
+                if not posting:
+                    del self.postings[gram]
+        del self.signatures[path]
+
+    def candidates(self, value):
+        """Paths that may contain `value` in some field: a superset, to be
+        checked by the caller. None when `value` is too short to have a
+        trigram, which rules nothing out."""
+        grams = set(GRAM_RE.findall(value))
+        if not grams:
+            return None
+        postings = [self.postings.get(gram) for gram in grams]
+        if None in postings:
+            return set()
+        postings.sort(key=len)
+        return postings[0].intersection(*postings[1:])
@@ -0,0 +1,301 @@
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import threading
+
+from services.git_service import build_repo_entry, scan_tree
+
+# inotify(7) constants
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+
+# Folders we walk through: we care about entries appearing and disappearing
+DIR_MASK = IN_CREATE | IN_DELETE | IN_MOVED_FROM | IN_MOVED_TO | IN_ONLYDIR
+# A repo's .git: commits, checkouts and fetches all write or rename files here
+GIT_MASK = IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_MODIFY | IN_ONLYDIR
+
+EVENT_HEADER = struct.Struct("iIII")
+
+# How long to wait for a burst of events (a clone, a rebase) to settle
+SETTLE_DELAY = 0.3
+POLL_INTERVAL = 5.0
+
+
+class Inotify:
+    """Minimal ctypes binding for the Linux inotify API."""
+
+    def __init__(self):
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._libc = libc
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err))
+
+    def add_watch(self, path, mask):
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(path), mask)
+        if wd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err), path)
+        return wd
+
+    def rm_watch(self, wd):
+        self._libc.inotify_rm_watch(self.fd, wd)
+
+    def read_events(self, timeout):
+        """Yields (wd, mask, name) tuples, waiting at most `timeout` seconds."""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return []
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+        events = []
+        offset = 0
+        while offset < len(data):
+            wd, mask, _cookie, length = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b"\0")
+            offset += length
+            events.append((wd, mask, os.fsdecode(name)))
+        return events
+
+    def close(self):
+        os.close(self.fd)
+
+
+def repo_changed(old, new):
+    """Whether anything we display differs (time_ago is derived, so ignored)."""
+    return {k: v for k, v in old.items() if k != "time_ago"} != {k: v for k, v in new.items() if k != "time_ago"}
+
+
+def repo_signature(path):
+    """Cheap fingerprint of the .git files that change on commit, checkout, fetch or remote edits."""
+    git_dir = os.path.join(path, ".git")
+    sig = []
+    for target in (git_dir, os.path.join(git_dir, "COMMIT_EDITMSG"), os.path.join(git_dir, "config"),
+                   os.path.join(git_dir, "HEAD"), os.path.join(git_dir, "FETCH_HEAD")):
+        try:
+            sig.append(os.stat(target).st_mtime_ns)
+        except OSError:
+            sig.append(None)
+    return tuple(sig)
+
+
+class RepoWatcher:
+    """Keeps a scanned repo set up to date without rescanning the whole tree.
+
+    Starts from the result of a full scan and watches every folder that was
+    walked (for repos appearing, vanishing or being renamed) plus each repo's
+    .git folder (for commits). Changes are reported through
+    `on_change(added, removed, updated)` from the watcher thread, so UI callers
+    should hop back to Tk with `root.after`.
+    """
+
+    def __init__(self, base_path, max_depth, repos, visited, on_change, mode="auto", rules=None):
+        self.root = os.path.expanduser(base_path)
+        self.max_depth = max_depth
+        self.rules = rules
+        self.on_change = on_change
+        self.mode = mode
+        self.repos = {r["path"]: r for r in repos if r.get("root", self.root) == self.root}
+        self.visited = dict(visited)
+        self._stop = threading.Event()
+        self._thread = None
+        self._inotify = None
+        self._wd_to_path = {}
+        self._path_to_wd = {}
+
+    # --- Lifecycle ---
+    def start(self):
+        if self.mode == "auto" and sys.platform.startswith("linux"):
+            try:
+                self._inotify = Inotify()
+                for path in self.visited:
+                    self._watch(path)
+            except OSError as e:
+                # Typically ENOSPC when fs.inotify.max_user_watches is too low
+                print(f"inotify unavailable ({e}), falling back to polling")
+                self._close_inotify()
+
+        target = self._run_inotify if self._inotify else self._run_polling
+        self._thread = threading.Thread(target=target, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    @property
+    def backend(self):
+        return "inotify" if self._inotify else "polling"
+
+    def _close_inotify(self):
+        if self._inotify:
+            self._inotify.close()
+        self._inotify = None
+        self._wd_to_path.clear()
+        self._path_to_wd.clear()
+
+    # --- Helpers ---
+    def _depth(self, path):
+        if path == self.root:
+            return 0
+        return os.path.relpath(path, self.root).count(os.sep) + 1
+
+    def _is_repo_dir(self, path):
+        return path != self.root and self.visited.get(path, (None, False))[1]
+
+    def _watch(self, path):
+        target, mask = (os.path.join(path, ".git"), GIT_MASK) if self._is_repo_dir(path) else (path, DIR_MASK)
+        try:
+            wd = self._inotify.add_watch(target, mask)
+        except OSError as e:
+            if e.errno == 28:  # ENOSPC: out of watches, nothing more we can do here
+                raise
+            return
+        self._wd_to_path[wd] = path
+        self._path_to_wd[path] = wd
+
+    def _unwatch(self, path):
+        wd = self._path_to_wd.pop(path, None)
+        if wd is not None:
+            self._wd_to_path.pop(wd, None)
+            self._inotify.rm_watch(wd)
+
+    def _under(self, path, prefix):
+        return path == prefix or path.startswith(prefix + os.sep)
+
+    def _rescan(self, path):
+        """Re-walks one subtree and returns (added, removed, updated) for it."""
+        old_repos = {p: r for p, r in self.repos.items() if self._under(p, path)}
+        old_dirs = {p for p in self.visited if self._under(p, path)}
+
+        if os.path.isdir(path):
+            new_list, new_visited = scan_tree(path, self._depth(path), self.max_depth, self.visited, rules=self.rules, root_path=self.root)
+        else:
+            new_list, new_visited = [], {}
+        new_repos = {r["path"]: r for r in new_list}
+
+        for p in old_dirs - set(new_visited):
+            self.visited.pop(p, None)
+            if self._inotify:
+                self._unwatch(p)
+        for p, info in new_visited.items():
+            was_repo = self._is_repo_dir(p)
+            self.visited[p] = info
+            if self._inotify and (p not in self._path_to_wd or was_repo != self._is_repo_dir(p)):
+                self._unwatch(p)
+                self._watch(p)
+
+        added = [r for p, r in new_repos.items() if p not in old_repos]
+        removed = [p for p in old_repos if p not in new_repos]
+        updated = [
+            r for p, r in new_repos.items()
+            if p in old_repos and repo_changed(old_repos[p], r)
+        ]
+        for p in removed:
+            del self.repos[p]
+        self.repos.update(new_repos)
+        return added, removed, updated
+
+    def _refresh_repo(self, path):
+        try:
+            repo = build_repo_entry(os.path.basename(path), path)
+        except OSError:
+            return None
+        old = self.repos.get(path)
+        if old:
+            repo["root"] = old.get("root", self.root)
+            if not repo_changed(old, repo):
+                return None
+        self.repos[path] = repo
+        return repo
+
+    def _apply(self, dirty_dirs, dirty_repos):
+        added, removed, updated = [], [], []
+        # Rescan outermost folders only; nested ones are covered by their parent
+        for path in sorted(dirty_dirs):
+            if any(self._under(path, d) and path != d for d in dirty_dirs):
+                continue
+            a, r, u = self._rescan(path)
+            added += a
+            removed += r
+            updated += u
+        for path in dirty_repos:
+            if path in self.repos and not any(self._under(path, d) for d in dirty_dirs):
+                repo = self._refresh_repo(path)
+                if repo:
+                    updated.append(repo)
+        if added or removed or updated:
+            self.on_change(added, removed, updated)
+
+    # --- Backends ---
+    def _run_inotify(self):
+        dirty_dirs, dirty_repos = set(), set()
+        try:
+            while not self._stop.is_set():
+                events = self._inotify.read_events(SETTLE_DELAY if (dirty_dirs or dirty_repos) else 1.0)
+                if not events:
+                    if dirty_dirs or dirty_repos:
+                        self._apply(dirty_dirs, dirty_repos)
+                        dirty_dirs, dirty_repos = set(), set()
+                    continue
+                for wd, mask, name in events:
+                    path = self._wd_to_path.get(wd)
+                    if path is None or mask & IN_IGNORED:
+                        continue
+                    if self._is_repo_dir(path):
+                        if mask & (IN_DELETE_SELF | IN_MOVE_SELF):
+                            dirty_dirs.add(os.path.dirname(path))
+                        else:
+                            dirty_repos.add(path)
+                    else:
+                        dirty_dirs.add(path)
+        except Exception as e:
+            print(f"Watcher error: {e}")
+        finally:
+            self._close_inotify()
+        if not self._stop.is_set():
+            # Lost inotify (e.g. ran out of watches mid-run): keep going by polling
+            print("inotify watcher stopped, falling back to polling")
+            self._run_polling()
+
+    def _run_polling(self):
+        signatures = {p: repo_signature(p) for p in self.repos}
+        while not self._stop.wait(POLL_INTERVAL):
+            try:
+                dirty_dirs = set()
+                for path, (mtime_ns, is_repo, _, _) in list(self.visited.items()):
+                    if is_repo and path != self.root:
+                        continue
+                    try:
+                        if os.stat(path).st_mtime_ns != mtime_ns:
+                            dirty_dirs.add(path)
+                    except OSError:
+                        if path != self.root:
+                            dirty_dirs.add(os.path.dirname(path))
+
+                dirty_repos = set()
+                for path in list(self.repos):
+                    sig = repo_signature(path)
+                    if sig != signatures.get(path):
+                        signatures[path] = sig
+                        dirty_repos.add(path)
+
+                self._apply(dirty_dirs, dirty_repos)
+                signatures = {p: signatures.get(p) or repo_signature(p) for p in self.repos}
+            except Exception as e:
+                print(f"Watcher error: {e}")
@@ -19,7 +19,8 @@ pip install python-dotenv --quiet
 
 # 3. Create a wrapper script 
 # We use single quotes for the outer string so the inner double quotes stay intact
-$WrapperContent = 'Start-Process pythonw -ArgumentList "' + $ScriptPath + '" -WindowStyle Hidden'
+# repos list / repos open NAME run in the console, anything else starts the GUI hidden
+$WrapperContent = 'if ($args.Count -gt 0 -and $args[0] -in "list", "open") { python "' + $ScriptPath + '" @args } else { Start-Process pythonw -ArgumentList (@(''"' + $ScriptPath + '"'') + $args) -WindowStyle Hidden }'
 Set-Content -Path $BinLink -Value $WrapperContent
 
 # 4. Add to PowerShell Profile
@@ -27,7 +28,7 @@ if (-not (Test-Path $PROFILE)) {
     New-Item -ItemType File -Path $PROFILE -Force | Out-Null
 }
 
-$FuncCmd = "`nfunction repos { & `"$BinLink`" }"
+$FuncCmd = "`nfunction repos { & `"$BinLink`" @args }"
 
 # Clean up old versions and add the new function
 $ProfileContent = Get-Content $PROFILE -ErrorAction SilentlyContinue
@@ -5,7 +5,9 @@ DASHBOARD_FILE="app.py"
 SCRIPT_PATH="$(pwd)/$DASHBOARD_FILE"
 BIN_DIR="$HOME/.local/bin"
 BIN_LINK="$BIN_DIR/repos"
-FUNC_CMD="repos() { nohup $BIN_LINK >/dev/null 2>&1 & }"
+# repos list / repos open NAME run in the terminal; anything else (repos, repos SEARCH)
+# detaches the GUI, which hands over to an already running window if there is one
+FUNC_CMD="repos() { case \"\$1\" in list|open) $BIN_LINK \"\$@\" ;; *) nohup $BIN_LINK \"\$@\" >/dev/null 2>&1 & ;; esac; }"
 
 echo "🚀 Starting Git Repo Dashboard Unified Setup..."
 
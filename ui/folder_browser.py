@@ -8,12 +8,14 @@ from ui.theme import *
 import services.config as config
 
 class DarkFolderBrowser(tk.Toplevel):
-    def __init__(self, parent, initial_dir):
+    def __init__(self, parent, initial_dir, marked=()):
         super().__init__(parent)
         self.title("Select Directory")
         self.geometry("500x500")
         self.configure(bg=BG_MAIN)
         self.result = None
+        # Folders already in the search path list get a check mark
+        self.marked = {os.path.realpath(os.path.expanduser(p)) for p in marked}
         
         # Ensure we handle the initial path safely
         start_path = initial_dir or "~"
@@ -57,7 +59,8 @@ class DarkFolderBrowser(tk.Toplevel):
     def load_dir(self):
         for item in self.tree.get_children():
             self.tree.delete(item)
-        self.path_label.config(text=self.current_dir)
+        marker = "  ✓ already a search path" if os.path.realpath(self.current_dir) in self.marked else ""
+        self.path_label.config(text=self.current_dir + marker)
         try:
             entries = sorted(
                 [f.name for f in os.scandir(self.current_dir) 
@@ -65,7 +68,9 @@ class DarkFolderBrowser(tk.Toplevel):
                 key=str.lower
             )
             for entry in entries:
-                self.tree.insert("", tk.END, values=(entry,))
+                full = os.path.realpath(os.path.join(self.current_dir, entry))
+                label = f"✓ {entry}" if full in self.marked else entry
+                self.tree.insert("", tk.END, iid=entry, values=(label,))
         except Exception:
             self.go_up()
 
@@ -76,7 +81,7 @@ class DarkFolderBrowser(tk.Toplevel):
     def on_double_click(self, event):
         sel = self.tree.selection()
         if sel:
-            folder_name = self.tree.item(sel[0])["values"][0]
+            folder_name = sel[0]
             self.current_dir = os.path.join(self.current_dir, folder_name)
             self.load_dir()
 
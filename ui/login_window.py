@@ -83,7 +83,7 @@ class LoginWindow(tk.Toplevel):
         thread.start()
 
     def run_validation(self, token):
-        # We use asyncio.run here because this is a fresh background thread
+        # Runs on the shared GitHub session's loop; this thread just waits for it
         result = AuthService.validate_and_save(token)
 
         # 3. Use .after() to send result back to the main UI thread
@@ -2,26 +2,47 @@ import os
 import subprocess
 import sys
 import threading
+import time
 import tkinter as tk
 import webbrowser
-import asyncio
 from tkinter import messagebox, ttk
 
-from PIL import Image, ImageTk
-
+# Only what the first frame needs is imported up front. PIL, keyring, httpx
+# and asyncio (GitHub sync, login) are pulled in after the window is up.
 import services.config as config
-from services.auth_service import AuthService
+from services import startup
 from services.git_service import *
-from ui.login_window import LoginWindow
-from ui.settings import SettingsWindow
+from services.editor import open_in_editor
+from services.fuzzy import FuzzyIndex
+from services.git_meta import format_branch, format_count
+from services.status_service import StatusEngine, cached_status, format_status
 from ui.theme import *
+from ui.tree_rows import TreeRows
+
+
+# Re-sync PRs and reviews when a resident window is re-shown after this long (seconds)
+GITHUB_STALE_AFTER = 300
+# Typing faster than this only filters the table once, after the last key (ms)
+SEARCH_DEBOUNCE_MS = 60
+# Warn in the status bar when a GitHub rate limit bucket is below this fraction
+RATE_LIMIT_LOW = 0.1
+
+
+def pr_row_values(pr):
+    ci_status = pr.get("ci_status", "Running")
+    ci_icon = "✓" if ci_status == "Success" else "✗" if ci_status == "Failure" else "●"
+    return (pr["repo"], pr["title"], pr.get("review_status", "Pending"), ci_icon)
+
+
+def review_row_values(rev):
+    return (rev["repo"], f"@{rev['author']}", rev["title"])
 
 
 class DarkRepoLauncher:
     def __init__(self, root):
         self.root = root
         self.root.title("Git Repo Dashboard")
-        self.root.geometry("550x700")
+        self.root.geometry("900x700")
         self.root.configure(bg=BG_MAIN)
 
         self.root.protocol("WM_DELETE_WINDOW", self.quit_app)
@@ -30,6 +51,18 @@ class DarkRepoLauncher:
         self.sort_reverse = {"Name": False, "Last Commit": True}
         self.all_repos = []
         self.filtered_repos = []
+        self.matcher = None  # The last FuzzyIndex built, swapped in by use_index()
+        self.index_source = None  # The all_repos list a search index is being built for
+        self.index_lock = threading.Lock()  # One index build at a time
+        self.indexed = None  # The last prepared FuzzyIndex (index thread only)
+        self.rows_source = None  # The all_repos list the table's items were pruned against
+        self.link_row = None  # The row showing the globe icon
+        self.search_after = None
+        self.watchers = []
+        self.scan = None
+        self.status_engine = StatusEngine()
+        self.instance_server = None
+        self.github_synced_at = 0
 
         # --- CENTRALIZED STYLING ---
         self.style = ttk.Style()
@@ -51,7 +84,7 @@ class DarkRepoLauncher:
         ).pack(side=tk.LEFT, padx=(10, 0))
 
         self.search_var = tk.StringVar()
-        self.search_var.trace("w", self.update_list)
+        self.search_var.trace("w", self.schedule_search)
         self.search_entry = tk.Entry(
             search_container,
             textvariable=self.search_var,
@@ -111,16 +144,33 @@ class DarkRepoLauncher:
         # repo_scroll = ttk.Scrollbar(self.tree_frame, orient="vertical", command=self.tree.yview)
         # self.tree.configure(yscrollcommand=repo_scroll.set)
 
-        self.tree = ttk.Treeview(
-            self.tree_frame, columns=("Name", "Link", "Last Commit"), show="headings"
+        # The virtual list only draws the rows on screen; same API as the Treeview
+        if config.get_virtual_table():
+            from ui.virtual_list import VirtualList as table_class
+        else:
+            table_class = ttk.Treeview
+        self.tree = table_class(
+            self.tree_frame,
+            columns=("Name", "Link", "Status", "Branch", "Upstream", "Ahead", "Behind", "Last Commit"),
+            show="headings",
         )
 
         self.tree.heading("Name", text=" NAME")
         self.tree.heading("Link", text="")
+        self.tree.heading("Status", text=" STATUS")
+        self.tree.heading("Branch", text=" BRANCH")
+        self.tree.heading("Upstream", text=" UPSTREAM")
+        self.tree.heading("Ahead", text="↑")
+        self.tree.heading("Behind", text="↓")
         self.tree.heading("Last Commit", text=" LAST COMMIT")
 
-        self.tree.column("Name", width=300, anchor="w")
+        self.tree.column("Name", width=260, anchor="w")
         self.tree.column("Link", width=50, anchor="center")  # Centering the icon
+        self.tree.column("Status", width=110, anchor="w")
+        self.tree.column("Branch", width=140, anchor="w")
+        self.tree.column("Upstream", width=160, anchor="w")
+        self.tree.column("Ahead", width=40, anchor="center")
+        self.tree.column("Behind", width=40, anchor="center")
         self.tree.column("Last Commit", width=100, anchor="e")
 
         # Use ONLY the selection event for the icon toggle
@@ -130,6 +180,8 @@ class DarkRepoLauncher:
 
         self.tree.tag_configure("oddrow", background=BG_MAIN)
         self.tree.tag_configure("evenrow", background=BG_STRIPE)
+        # Rows are keyed by repo path, so they survive filtering and re-sorting
+        self.rows = TreeRows(self.tree, key=lambda repo: repo["path"], values=self.row_values)
 
         self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         # repo_scroll.pack(side=tk.RIGHT, fill=tk.Y)
@@ -196,6 +248,7 @@ class DarkRepoLauncher:
         self.pr_tree.pack(fill=tk.X)
 
         self.pr_tree.bind("<Double-1>", self.open_selected_pr)
+        self.pr_rows = TreeRows(self.pr_tree, key=lambda pr: pr["url"], values=pr_row_values)
         # --- REVIEWS SECTION ---
         self.rev_frame = tk.Frame(root, bg=BG_MAIN)
         self.rev_frame.pack(fill=tk.X, padx=15, pady=(0, 10))
@@ -228,6 +281,7 @@ class DarkRepoLauncher:
         self.rev_tree.pack(fill=tk.X)
 
         self.rev_tree.bind("<Double-1>", self.open_selected_review)
+        self.rev_rows = TreeRows(self.rev_tree, key=lambda rev: rev["url"], values=review_row_values)
 
         # --- BOTTOM BAR (Status, Sign In, and Logo) ---
         bottom_frame = tk.Frame(root, bg=BG_MAIN)
@@ -243,22 +297,8 @@ class DarkRepoLauncher:
             font=FONT_SMALL,
         ).pack(side=tk.LEFT)
 
-        # --- LOGO LOADING ---
-        try:
-            # Safer pathing: looks for 'assets' inside the same folder as this file
-            current_dir = os.path.dirname(os.path.abspath(__file__))
-            asset_path = os.path.join(current_dir, "assets", "git-icon-white.png")
-
-            img = Image.open(asset_path)
-            img = img.resize(
-                (24, 24), Image.Resampling.LANCZOS
-            )  # Slightly smaller than 32 for better fit
-            self.logo_img = ImageTk.PhotoImage(img)
-
-            logo_label = tk.Label(bottom_frame, image=self.logo_img, bg=BG_MAIN)
-            logo_label.pack(side=tk.RIGHT, padx=(10, 0))
-        except Exception as e:
-            print(f"Could not load logo: {e}")
+        # The logo goes to the right of Sign In once the window is up (load_logo)
+        self.bottom_frame = bottom_frame
 
         # Sign In Link (Next to Logo)
         self.btn_signin = tk.Label(
@@ -276,30 +316,58 @@ class DarkRepoLauncher:
         self.btn_signin.bind("<Leave>", lambda e: self.btn_signin.configure(fg=ACCENT))
         self.btn_signin.bind("<Button-1>", lambda e: self.handle_signin())
 
-        self.setUser()
+        # Signed out until the keyring answers (setUser, after first paint)
+        self.current_user = None
+        self.update_auth_ui()
+
+        # Paint the empty window first; everything slow happens after that
+        self.root.after_idle(lambda: self.root.after(0, self.finish_startup))
 
+    def finish_startup(self):
+        """Deferred init, run once the first frame is on screen."""
+        startup.mark("window painted")
+
+        # Warm start: show whatever the index remembers while the
+        # incremental rescan runs in the background
+        self.load_cached_repos()
+        startup.mark("cached repos shown")
+        self.load_logo()
+        startup.mark("logo loaded")
         self.refresh_data()
+        self.setUser()
+
+    def load_logo(self):
+        # Safer pathing: looks for 'assets' inside the same folder as this file
+        assets = os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets")
+        try:
+            # Tk reads the pre-scaled PNG itself, no PIL needed
+            self.logo_img = tk.PhotoImage(file=os.path.join(assets, "git-icon-white-24.png"))
+        except tk.TclError:
+            try:
+                from PIL import Image, ImageTk
+
+                img = Image.open(os.path.join(assets, "git-icon-white.png"))
+                img = img.resize((24, 24), Image.Resampling.LANCZOS)
+                self.logo_img = ImageTk.PhotoImage(img)
+            except Exception as e:
+                print(f"Could not load logo: {e}")
+                return
+        logo_label = tk.Label(self.bottom_frame, image=self.logo_img, bg=BG_MAIN)
+        logo_label.pack(side=tk.RIGHT, padx=(10, 0), before=self.btn_signin)
 
     def handle_selection(self, event):
-        """Toggles the globe icon based on the current selection."""
-        # 1. Clear icons from all rows
-        for item in self.tree.get_children():
-            vals = list(self.tree.item(item, "values"))
-            if vals[1] != "":  # Only update if not already empty to save performance
-                vals[1] = ""
-                self.tree.item(item, values=vals)
-
-        # 2. Add icon to the selected row
-        selection = self.tree.selection()
-        if selection:
-            item_id = selection[0]
-            index = self.tree.index(item_id)
-            repo = self.filtered_repos[index]
-
-            if repo.get("remote_url"):
-                vals = list(self.tree.item(item_id, "values"))
-                vals[1] = ICONS["GLOBE_ICON"]
-                self.tree.item(item_id, values=vals)
+        """Moves the globe icon to the selected row, if it has a remote."""
+        repo = self.rows.selected()
+        link_row = repo["path"] if repo and repo.get("remote_url") else None
+        if link_row == self.link_row:
+            return
+
+        # Only the row that had the icon and the one getting it are touched
+        if self.link_row:
+            self.rows.set(self.link_row, "Link", "")
+        if link_row:
+            self.rows.set(link_row, "Link", ICONS["GLOBE_ICON"])
+        self.link_row = link_row
 
     def handle_click(self, event):
         """Detects if the user clicked specifically on the globe icon."""
@@ -307,105 +375,273 @@ class DarkRepoLauncher:
         if region == "cell":
             column = self.tree.identify_column(event.x)
             if column == "#2":  # The Link column
-                item_id = self.tree.identify_row(event.y)
-                if item_id:
-                    index = self.tree.index(item_id)
-                    repo = self.filtered_repos[index]
-                    if repo.get("remote_url"):
-                        webbrowser.open(repo["remote_url"])
+                repo = self.rows.get(self.tree.identify_row(event.y))
+                if repo and repo.get("remote_url"):
+                    webbrowser.open(repo["remote_url"])
 
     def open_browser(self, event):
         if hasattr(self, "current_url"):
             webbrowser.open(self.current_url)
 
+    def load_cached_repos(self):
+        """Fills the table from the on-disk index without walking the tree."""
+        self.all_repos = load_cached_repos(ScanRoot.from_config())
+        if self.all_repos:
+            col = "Last Commit" if self.sort_reverse["Last Commit"] else "Name"
+            self.sort_column(col, toggle=False)
+            self.index_repos()
+
     def refresh_data(self):
-        """Refreshes local repos (sync) and GitHub data (async thread)."""
+        """Refreshes local repos and GitHub data, both in background threads."""
         config.reload_config()
-        
-        # Local file system scanning is usually fast enough to stay sync, 
-        # but we scan the drive first.
-        self.all_repos = get_git_repos(
-            config.get_base_path(), max_depth=config.get_search_depth()
-        )
-        col = "Last Commit" if self.sort_reverse["Last Commit"] else "Name"
-        self.sort_column(col, toggle=False)
 
+        # A new refresh supersedes whatever scan (or watcher) is still running
+        self.cancel_scan()
+        self.stop_watchers()
+
+        scan = self.scan = RepoScan(ScanRoot.from_config())
+        self.status_var.set("Scanning...")
+        threading.Thread(target=self.run_scan, args=(scan,), daemon=True).start()
+
+        self.refresh_github()
+
+    def refresh_github(self, background=False):
         # Trigger GitHub data fetch in a background thread if logged in
         if self.current_user:
             self.status_var.set("Syncing with GitHub...")
-            threading.Thread(target=self.run_async_refresh, daemon=True).start()
+            threading.Thread(target=self.run_async_refresh, args=(background,), daemon=True).start()
+
+    def cancel_scan(self):
+        if self.scan:
+            self.scan.cancel()
+            self.scan = None
 
-    def run_async_refresh(self):
-        """Background thread to handle asyncio calls."""
+    def run_scan(self, scan):
+        """Background thread: forwards scan batches to the main UI thread."""
         try:
-            # Create a new event loop for this thread to run our async services
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            
-            # Run PRs and Reviews concurrently
-            prs, reviews = loop.run_until_complete(asyncio.gather(
-                fetch_open_prs_async(),
-                fetch_review_requests_async()
-            ))
+            for batch in scan.batches():
+                self.root.after(0, lambda b=batch: self.add_scan_batch(scan, b))
+            if scan.finished:
+                self.root.after(0, lambda: self.finish_scan(scan))
+        except Exception as e:
+            print(f"Scan error: {e}")
+            self.root.after(0, lambda: self.status_var.set("Scan Failed"))
+
+    def add_scan_batch(self, scan, batch):
+        """Merges a batch of freshly scanned repos into the table (Main Thread)."""
+        if scan is not self.scan:
+            return  # Superseded by a newer refresh
+
+        if batch:
+            by_path = {repo["path"]: repo for repo in self.all_repos}
+            for repo in batch:
+                by_path[repo["path"]] = repo
+            self.all_repos = list(by_path.values())
+            col = "Last Commit" if self.sort_reverse["Last Commit"] else "Name"
+            self.sort_column(col, toggle=False)
+            self.index_repos()
+
+        self.status_var.set(
+            f"Scanning... {scan.dirs_scanned} dirs / {scan.repos_found} repos"
+        )
+
+    def finish_scan(self, scan):
+        """Swaps in the complete scan result and starts watching it (Main Thread)."""
+        if scan is not self.scan:
+            return
+        self.scan = None
+        startup.mark("scan finished")
+
+        # Anything only the index remembered has been deleted since
+        self.all_repos = list(scan.repos)
+        col = "Last Commit" if self.sort_reverse["Last Commit"] else "Name"
+        self.sort_column(col, toggle=False)
+        self.start_watchers(scan.roots)
+        self.index_repos()
+        self.status_engine.refresh(
+            [repo["path"] for repo in self.all_repos], self.on_repo_status
+        )
+
+        if scan.dirs_pruned:
+            self.status_var.set(
+                f"Found {len(self.filtered_repos)} repositories · pruned "
+                f"{scan.dirs_pruned} dirs (~{scan.estimated_time_saved():.1f}s saved)"
+            )
+
+    def stop_watchers(self):
+        for watcher in self.watchers:
+            watcher.stop()
+        self.watchers = []
+
+    def start_watchers(self, roots):
+        """(Re)starts live watching of each scanned root, if enabled in settings."""
+        self.stop_watchers()
+
+        mode = config.get_watch_mode()
+        if mode == "off":
+            return
+
+        from services.watcher import RepoWatcher
+
+        for root in roots:
+            self.watchers.append(RepoWatcher(
+                root.path,
+                root.max_depth,
+                self.all_repos,
+                root.visited,
+                on_change=lambda *delta: self.root.after(0, lambda: self.apply_repo_delta(*delta)),
+                mode=mode,
+                rules=root.rules,
+            ).start())
+
+    def apply_repo_delta(self, added, removed, updated):
+        """Merges watcher changes into all_repos (Main Thread)."""
+        by_path = {repo["path"]: repo for repo in self.all_repos}
+        for path in removed:
+            by_path.pop(path, None)
+        for repo in added + updated:
+            by_path[repo["path"]] = repo
+        self.all_repos = list(by_path.values())
+
+        col = "Last Commit" if self.sort_reverse["Last Commit"] else "Name"
+        self.sort_column(col, toggle=False)
+        self.index_repos()
+        self.status_engine.refresh(
+            [repo["path"] for repo in added + updated], self.on_repo_status, supersede=False
+        )
+
+    def on_repo_status(self, path, status):
+        """Called from status workers; hops to the main thread to update the row."""
+        self.root.after(0, lambda: self.show_repo_status(path, status))
+
+    def show_repo_status(self, path, status):
+        self.rows.set(path, "Status", format_status(status))
+
+    def run_async_refresh(self, background=False):
+        """Background thread: waits for the sync on the shared GitHub session."""
+        from services.github_scheduler import RateLimited
+        from services.github_service import fetch_dashboard
+
+        try:
+            # PRs and reviews together: one GraphQL query (or the REST fallback),
+            # over connections kept open from the last sync
+            stats = {}
+            prs, reviews = fetch_dashboard(stats, background=background)
             
             # Push the data back to the main UI thread
-            self.root.after(0, lambda: self.finalize_github_data(prs, reviews))
+            self.root.after(0, lambda: self.finalize_github_data(prs, reviews, stats))
+        except RateLimited as e:
+            # Say so rather than leave stale PRs looking current
+            self.root.after(0, lambda e=e: self.show_rate_limited(e))
         except Exception as e:
             print(f"Async refresh error: {e}")
             self.root.after(0, lambda: self.status_var.set("GitHub Sync Failed"))
 
-    def finalize_github_data(self, prs, reviews):
+    def finalize_github_data(self, prs, reviews, stats=None):
         """Updates the Treeviews with fetched data (Main Thread)."""
-        self.current_prs = prs
-        self.current_reviews = reviews
-        
-        # Update PR Table
-        for item in self.pr_tree.get_children():
-            self.pr_tree.delete(item)
-        for i, pr in enumerate(self.current_prs):
-            tag = "evenrow" if i % 2 == 0 else "oddrow"
-            review = pr.get("review_status", "Pending")
-            actions = pr.get("ci_status", "Running")
-            
-            # Visual Shorthand
-            ci_icon = "✓" if actions == "Success" else "✗" if actions == "Failure" else "●"
-            
-            self.pr_tree.insert("", tk.END, values=(pr["repo"], pr["title"], review, ci_icon), tags=(tag,))
-
-        # Update Review Table
-        for item in self.rev_tree.get_children():
-            self.rev_tree.delete(item)
-        for i, rev in enumerate(self.current_reviews):
-            tag = "evenrow" if i % 2 == 0 else "oddrow"
-            self.rev_tree.insert("", tk.END, values=(rev["repo"], f"@{rev['author']}", rev["title"]), tags=(tag,))
-        
-        self.status_var.set(f"Dashboard updated: {len(self.all_repos)} repos, {len(prs)} PRs")
-
+        startup.mark("GitHub synced")
+        self.github_synced_at = time.time()
+        # PRs still open keep their rows (and selection); only changed cells are written
+        self.pr_rows.replace(prs)
+        self.rev_rows.replace(reviews)
+        message = f"Dashboard updated: {len(self.all_repos)} repos, {len(prs)} PRs"
+        if stats and "api" in stats:
+            message += f" ({stats['api']}, {stats['requests']} requests, {stats['seconds']:.1f}s"
+            if stats.get("cache_hits") or stats.get("cache_misses"):
+                message += f", cache {stats['cache_hits']} hit / {stats['cache_misses']} miss"
+            if stats.get("throttled"):
+                message += f", throttled {stats['throttled']}x"
+            message += ")"
+            budget = stats.get("budget")
+            if budget and budget[0] < budget[1] * RATE_LIMIT_LOW:
+                resets = time.strftime("%H:%M", time.localtime(budget[2]))
+                message += f" - GitHub {budget[3]} rate limit low: {budget[0]} left until {resets}"
+        self.status_var.set(message)
+
+    def show_rate_limited(self, error):
+        resets = time.strftime("%H:%M", time.localtime(error.reset))
+        if self.github_synced_at:
+            synced = time.strftime("%H:%M", time.localtime(self.github_synced_at))
+            self.status_var.set(f"GitHub rate limit reached until {resets}; PRs are from {synced}")
+        else:
+            self.status_var.set(f"GitHub rate limit reached until {resets}")
+
+
+    def index_repos(self):
+        """Builds the search index for all_repos on a background thread and
+        swaps it in when it's done. Until then searches use the last one."""
+        # A copy, since sort_column sorts all_repos in place meanwhile
+        source = self.index_source = self.all_repos
+        threading.Thread(
+            target=self.build_index, args=(source, list(source)), daemon=True
+        ).start()
+
+    def build_index(self, source, repos):
+        """Background thread: prepares a FuzzyIndex, updating the last one's
+        trigrams rather than starting over."""
+        with self.index_lock:
+            if source is not self.index_source:
+                return  # Superseded while waiting for the last build
+            try:
+                matcher = FuzzyIndex(repos, previous=self.indexed)
+                matcher.prepare(self.indexed.trigrams if self.indexed else None)
+            except Exception as e:
+                print(f"Search index error: {e}")
+                return
+            self.indexed = matcher
+        self.root.after(0, lambda: self.use_index(matcher))
+
+    def use_index(self, matcher):
+        # Builds run one at a time and skip superseded lists, so this is
+        # always newer than the index in use, even if the repos changed again
+        self.matcher = matcher
+        if self.search_var.get().strip():
+            self.update_list()
+
+    def search_repos(self, search_term):
+        """Ranked fuzzy matches for the search box, best first, from the last
+        index built (which may trail the latest scan batch a little)."""
+        if self.matcher is None:
+            # Nothing indexed yet: plain name matches, as before there was one
+            term = search_term.lower()
+            return [repo for repo in self.all_repos if term in repo["name"].lower()]
+        return self.matcher.search(search_term)
+
+    def schedule_search(self, *args):
+        """Search box changed: filter once typing pauses, not on every key."""
+        if self.search_after:
+            self.root.after_cancel(self.search_after)
+        self.search_after = self.root.after(SEARCH_DEBOUNCE_MS, self.update_list)
+
+    def row_values(self, repo):
+        path = repo["path"]
+        return (
+            f"  {repo['name']}",
+            ICONS["GLOBE_ICON"] if path == self.link_row else "",
+            format_status(cached_status(path)),
+            format_branch(repo),
+            repo.get("upstream") or "",
+            format_count(repo.get("ahead")),
+            format_count(repo.get("behind")),
+            repo["time_ago"],
+        )
 
     def update_list(self, *args):
-        search_term = self.search_var.get().lower()
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-
-        self.filtered_repos = []
-        count = 0
-        for repo in self.all_repos:
-            if search_term in repo["name"].lower():
-                tag = "evenrow" if count % 2 == 0 else "oddrow"
-
-                self.tree.insert(
-                    "",
-                    tk.END,
-                    values=(
-                        f"  {repo['name']}",
-                        "",
-                        repo["time_ago"],
-                    ),  # Empty middle col
-                    tags=(tag,),
-                )
-                self.filtered_repos.append(repo)
-                count += 1
-        self.status_var.set(f"Found {count} repositories")
+        if self.search_after:  # Whatever was pending is covered by this update
+            self.root.after_cancel(self.search_after)
+            self.search_after = None
+        search_term = self.search_var.get().strip()
+
+        # No search keeps the column sort; a search lists the best matches first
+        self.filtered_repos = self.search_repos(search_term) if search_term else list(self.all_repos)
+
+        # Filtered-out rows are only detached; repos that are gone for good
+        # get their items deleted
+        if self.rows_source is not self.all_repos:
+            self.rows.prune({repo["path"] for repo in self.all_repos})
+            self.rows_source = self.all_repos
+        self.rows.show(self.filtered_repos)
+        self.status_var.set(f"Found {len(self.filtered_repos)} repositories")
 
     def sort_column(self, col, toggle=True):
         reverse = self.sort_reverse[col]
@@ -418,22 +654,9 @@ class DarkRepoLauncher:
         self.update_list()
 
     def open_repo(self, event=None):
-        selection = self.tree.selection()
-        if selection:
-            index = self.tree.index(selection[0])
-            path = self.filtered_repos[index]["path"]
-            try:
-                subprocess.Popen(
-                    [config.get_editor(), path],
-                    stdout=subprocess.DEVNULL,
-                    stderr=subprocess.DEVNULL,
-                )
-            except FileNotFoundError:
-                if sys.platform == "win32":
-                    os.startfile(path)  # Opens in default File Explorer
-                else:
-                    cmd = "open" if sys.platform == "darwin" else "xdg-open"
-                    subprocess.Popen([cmd, path])
+        repo = self.rows.selected()
+        if repo:
+            open_in_editor(repo["path"])
 
     def handle_signin(self):
         webbrowser.open("https://github.com/login")
@@ -460,6 +683,8 @@ class DarkRepoLauncher:
             self.btn_signin.bind("<Button-1>", lambda e: self.open_login())
 
     def open_login(self):
+        from ui.login_window import LoginWindow
+
         LoginWindow(self.root, on_success=self.handle_login_success)
 
     def handle_login_success(self, username):
@@ -470,88 +695,46 @@ class DarkRepoLauncher:
 
     def confirm_logout(self):
         if tk.messagebox.askyesno("Logout", "Are you sure you want to sign out?"):
+            from services.auth_service import AuthService
+
             AuthService.logout()
             self.current_user = None
             self.update_auth_ui()
             # Clear GitHub tables
-            for tree in [self.pr_tree, self.rev_tree]:
-                for item in tree.get_children():
-                    tree.delete(item)
+            self.pr_rows.replace([])
+            self.rev_rows.replace([])
             self.status_var.set("Logged out.")
 
     def setUser(self):
-        self.current_user = AuthService.get_current_user()
-        self.update_auth_ui()
-
-    def load_prs(self):
-        """Fetches and displays PRs with detailed Review and Actions status."""
-        for item in self.pr_tree.get_children():
-            self.pr_tree.delete(item)
-
-        if not self.current_user:
-            return
-
-        from services.git_service import fetch_open_prs
+        """Looks the user up in the keyring off the main thread (it can block on D-Bus)."""
+        threading.Thread(target=self.load_user, daemon=True).start()
 
-        self.current_prs = fetch_open_prs()
-
-        for i, pr in enumerate(self.current_prs):
-            tag = "evenrow" if i % 2 == 0 else "oddrow"
-
-            # Map statuses to icons/cleaner text if desired
-            review = pr.get("review_status", "Pending")
-            actions = pr.get("ci_status", "Running")
+    def load_user(self):
+        try:
+            from services.auth_service import AuthService
 
-            # Optional: Visual shorthand
-            if actions == "success":
-                actions = "✓"
-            if actions == "failure":
-                actions = "✗"
+            user = AuthService.get_current_user()
+        except Exception as e:
+            print(f"Keyring lookup failed: {e}")
+            user = None
+        self.root.after(0, lambda: self.show_user(user))
 
-            self.pr_tree.insert(
-                "",
-                tk.END,
-                values=(pr["repo"], pr["title"], review, actions),
-                tags=(tag,),
-            )
+    def show_user(self, user):
+        startup.mark("keyring read")
+        self.current_user = user
+        self.update_auth_ui()
+        self.refresh_github()
 
     def open_selected_pr(self, event):
         """Opens the selected PR URL in the default browser."""
-        selection = self.pr_tree.selection()
-        if selection:
-            # Get index of selected item to find the URL in our list
-            item_id = selection[0]
-            index = self.pr_tree.index(item_id)
-            if index < len(self.current_prs):
-                webbrowser.open(self.current_prs[index]["url"])
-
-    def load_reviews(self):
-        """Fetches and displays PRs where a review is requested from the user."""
-        for item in self.rev_tree.get_children():
-            self.rev_tree.delete(item)
-
-        if not self.current_user:
-            return
-
-        from services.git_service import fetch_review_requests
-
-        self.current_reviews = fetch_review_requests()
-
-        for i, rev in enumerate(self.current_reviews):
-            tag = "evenrow" if i % 2 == 0 else "oddrow"
-            self.rev_tree.insert(
-                "",
-                tk.END,
-                values=(rev["repo"], f"@{rev['author']}", rev["title"]),
-                tags=(tag,),
-            )
+        pr = self.pr_rows.selected()  # Row ids are PR URLs
+        if pr:
+            webbrowser.open(pr["url"])
 
     def open_selected_review(self, event):
-        selection = self.rev_tree.selection()
-        if selection:
-            index = self.rev_tree.index(selection[0])
-            if index < len(self.current_reviews):
-                webbrowser.open(self.current_reviews[index]["url"])
+        rev = self.rev_rows.selected()
+        if rev:
+            webbrowser.open(rev["url"])
 
     def handle_clone(self, url):
         """Initializes the background thread for git clone."""
@@ -607,9 +790,56 @@ class DarkRepoLauncher:
         CloneWindow(self.root, on_clone=self.handle_clone)
 
     def open_settings(self):
+        from ui.settings import SettingsWindow
+
         SettingsWindow(self)
 
+    def listen_for_instances(self):
+        """Lets later `repos` launches hand over to this window instead of starting another."""
+        from services.instance import InstanceServer
+
+        server = InstanceServer(lambda msg: self.root.after(0, lambda: self.handle_instance_message(msg)))
+        if server.start():
+            self.instance_server = server
+
+    def handle_instance_message(self, message):
+        if message.get("cmd") == "quit":
+            self.exit_app()
+        elif message.get("cmd") == "show":
+            self.bring_to_front(message.get("search"))
+
+    def bring_to_front(self, search=None):
+        self.root.deiconify()
+        self.root.lift()
+        # lift() alone doesn't beat focus-stealing prevention on most WMs
+        self.root.attributes("-topmost", True)
+        self.root.after(200, lambda: self.root.attributes("-topmost", False))
+        self.root.focus_force()
+        self.search_entry.focus_set()
+        if search is not None:
+            self.search_var.set(search)
+            self.search_entry.icursor(tk.END)
+        # The watchers kept the repos live while hidden; only GitHub can go stale
+        if time.time() - self.github_synced_at > GITHUB_STALE_AFTER:
+            self.refresh_github(background=True)
+
     def quit_app(self, event=None):
+        # Stay resident (hidden) so the next launch is instant, if enabled
+        if self.instance_server and config.get_stay_resident():
+            self.root.withdraw()
+            return
+        self.exit_app()
+
+    def exit_app(self):
+        self.status_engine.cancel()
+        self.cancel_scan()
+        self.stop_watchers()
+        if self.instance_server:
+            self.instance_server.close()
+        # Only if something used GitHub; importing it just to close it costs httpx
+        github_session = sys.modules.get("services.github_session")
+        if github_session:
+            github_session.close_session()
         self.root.quit()
         self.root.destroy()
         os._exit(0)
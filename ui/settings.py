@@ -1,3 +1,4 @@
+import json
 import os
 import sys
 import tkinter as tk
@@ -14,7 +15,7 @@ class SettingsWindow(tk.Toplevel):
         super().__init__(launcher_instance.root)
         self.launcher = launcher_instance
         self.title("Settings")
-        self.geometry("500x380") # Increased height
+        self.geometry("500x680") # Increased height
         self.configure(bg=BG_MAIN)
         self.transient(launcher_instance.root)
         self.wait_visibility()
@@ -30,29 +31,77 @@ class SettingsWindow(tk.Toplevel):
         self.ed_entry.insert(0, config.get_editor())
         self.ed_entry.pack(fill=tk.X, padx=20, pady=5, ipady=4)
 
-        # Search Path
-        tk.Label(self, text="Search Path:", bg=BG_MAIN, fg=FG_TEXT).pack(anchor="w", padx=20, pady=(10, 0))
-        path_frame = tk.Frame(self, bg=BG_MAIN)
-        path_frame.pack(fill=tk.X, padx=20, pady=5)
-        
-        self.path_entry = tk.Entry(path_frame, bg=BG_STRIPE, fg=FG_TEXT, insertbackground=FG_TEXT, borderwidth=0)
-        self.path_entry.insert(0, config.get_base_path())
-        self.path_entry.pack(side=tk.LEFT, fill=tk.X, expand=True, ipady=4)
+        # Search Paths: each root has its own depth
+        tk.Label(self, text="Search Paths:", bg=BG_MAIN, fg=FG_TEXT).pack(anchor="w", padx=20, pady=(10, 0))
+        self.roots = config.get_scan_roots()
+        self.roots_tree = ttk.Treeview(self, columns=("Path", "Depth"), show="headings", height=4)
+        self.roots_tree.heading("Path", text=" PATH", anchor="w")
+        self.roots_tree.heading("Depth", text="DEPTH")
+        self.roots_tree.column("Path", width=360, anchor="w")
+        self.roots_tree.column("Depth", width=60, anchor="center", stretch=False)
+        self.roots_tree.pack(fill=tk.X, padx=20, pady=5)
+        self.roots_tree.bind("<<TreeviewSelect>>", lambda e: self.on_root_selected())
+
+        roots_bar = tk.Frame(self, bg=BG_MAIN)
+        roots_bar.pack(fill=tk.X, padx=20)
 
-        self.btn_browse = tk.Label(path_frame, text="Browse...", bg=BG_HEADER, fg=FG_TEXT, padx=10, pady=4, cursor="hand2")
-        self.btn_browse.pack(side=tk.LEFT, padx=(5, 0))
+        self.btn_browse = tk.Label(roots_bar, text="Add...", bg=BG_HEADER, fg=FG_TEXT, padx=10, pady=4, cursor="hand2")
+        self.btn_browse.pack(side=tk.LEFT)
         self.btn_browse.bind("<Button-1>", lambda e: self.browse_folder())
 
-        # --- NEW: Search Depth ---
-        tk.Label(self, text="Search Depth:", bg=BG_MAIN, fg=FG_TEXT).pack(anchor="w", padx=20, pady=(10, 0))
-        
-        # Using a Spinbox for easier numeric selection
-        self.depth_var = tk.StringVar(value=str(config.get_search_depth()))
+        self.btn_remove = tk.Label(roots_bar, text="Remove", bg=BG_HEADER, fg=FG_TEXT, padx=10, pady=4, cursor="hand2")
+        self.btn_remove.pack(side=tk.LEFT, padx=(5, 0))
+        self.btn_remove.bind("<Button-1>", lambda e: self.remove_root())
+
+        # Search Depth of the selected root, using a Spinbox for easier numeric selection
+        self.depth_var = tk.StringVar(value="1")
         self.depth_spin = ttk.Spinbox(
-            self, from_=1, to=10, textvariable=self.depth_var,
+            roots_bar, from_=1, to=10, textvariable=self.depth_var, width=4,
+            style="TSpinbox", command=self.on_depth_changed
+        )
+        self.depth_spin.pack(side=tk.RIGHT)
+        tk.Label(roots_bar, text="Depth:", bg=BG_MAIN, fg=FG_TEXT).pack(side=tk.RIGHT, padx=(0, 5))
+
+        self.render_roots()
+
+        # Scan Workers: more threads help on network mounts where every stat waits on I/O
+        tk.Label(self, text="Scan Workers (threads):", bg=BG_MAIN, fg=FG_TEXT).pack(anchor="w", padx=20, pady=(10, 0))
+        self.workers_var = tk.StringVar(value=str(config.get_scan_workers()))
+        self.workers_spin = ttk.Spinbox(
+            self, from_=1, to=64, textvariable=self.workers_var,
             style="TSpinbox"
         )
-        self.depth_spin.pack(anchor="w", padx=20, pady=5)
+        self.workers_spin.pack(anchor="w", padx=20, pady=5)
+
+        # Prune patterns: folders the scanner never descends into
+        tk.Label(self, text="Skip Folders (comma-separated globs):", bg=BG_MAIN, fg=FG_TEXT).pack(anchor="w", padx=20, pady=(10, 0))
+        self.prune_entry = tk.Entry(self, bg=BG_STRIPE, fg=FG_TEXT, insertbackground=FG_TEXT, borderwidth=0)
+        self.prune_entry.insert(0, ", ".join(config.get_prune_patterns()))
+        self.prune_entry.pack(fill=tk.X, padx=20, pady=5, ipady=4)
+
+        # Live watching: pick up new, removed and committed-to repos without a rescan
+        self.watch_var = tk.BooleanVar(value=config.get_watch_mode() != "off")
+        tk.Checkbutton(
+            self, text="Watch folders for changes", variable=self.watch_var,
+            bg=BG_MAIN, fg=FG_TEXT, selectcolor=BG_STRIPE,
+            activebackground=BG_MAIN, activeforeground=FG_TEXT, highlightthickness=0
+        ).pack(anchor="w", padx=16, pady=(10, 0))
+
+        # Stay resident: closing hides the window, the next `repos` shows it instantly
+        self.resident_var = tk.BooleanVar(value=config.get_stay_resident())
+        tk.Checkbutton(
+            self, text="Keep running in the background after closing", variable=self.resident_var,
+            bg=BG_MAIN, fg=FG_TEXT, selectcolor=BG_STRIPE,
+            activebackground=BG_MAIN, activeforeground=FG_TEXT, highlightthickness=0
+        ).pack(anchor="w", padx=16)
+
+        # Virtual table: only the rows on screen exist, for tens of thousands of repos
+        self.virtual_var = tk.BooleanVar(value=config.get_virtual_table())
+        tk.Checkbutton(
+            self, text="Fast table for very large repo lists (after restart)", variable=self.virtual_var,
+            bg=BG_MAIN, fg=FG_TEXT, selectcolor=BG_STRIPE,
+            activebackground=BG_MAIN, activeforeground=FG_TEXT, highlightthickness=0
+        ).pack(anchor="w", padx=16)
 
         # Save Button
         self.btn_save = tk.Label(self, text="SAVE & REFRESH", bg=SUCCESS, fg="white", font=FONT_BOLD, pady=8, cursor="hand2")
@@ -61,22 +110,72 @@ class SettingsWindow(tk.Toplevel):
 
         self.ed_entry.focus_set()
 
+    def render_roots(self, select=0):
+        for item in self.roots_tree.get_children():
+            self.roots_tree.delete(item)
+        for root in self.roots:
+            self.roots_tree.insert("", tk.END, values=(root["path"], root["depth"]))
+        children = self.roots_tree.get_children()
+        if children:
+            self.roots_tree.selection_set(children[min(select, len(children) - 1)])
+
+    def selected_root_index(self):
+        selection = self.roots_tree.selection()
+        return self.roots_tree.index(selection[0]) if selection else None
+
+    def on_root_selected(self):
+        index = self.selected_root_index()
+        if index is not None:
+            self.depth_var.set(str(self.roots[index]["depth"]))
+
+    def on_depth_changed(self):
+        index = self.selected_root_index()
+        if index is None:
+            return
+        try:
+            self.roots[index]["depth"] = max(1, int(self.depth_var.get()))
+        except ValueError:
+            return
+        self.render_roots(select=index)
+
     def browse_folder(self):
-        browser = DarkFolderBrowser(self, self.path_entry.get())
+        index = self.selected_root_index()
+        start = self.roots[index]["path"] if index is not None else os.path.expanduser("~")
+        browser = DarkFolderBrowser(self, start, marked=[r["path"] for r in self.roots])
         self.wait_window(browser)
         if browser.result:
-            self.path_entry.delete(0, tk.END)
-            self.path_entry.insert(0, browser.result)
+            known = {os.path.realpath(os.path.expanduser(r["path"])) for r in self.roots}
+            if os.path.realpath(browser.result) not in known:
+                self.roots.append({"path": browser.result, "depth": 1, "prune": []})
+            self.render_roots(select=len(self.roots) - 1)
+
+    def remove_root(self):
+        index = self.selected_root_index()
+        # Always keep one root: it is also where new clones go
+        if index is not None and len(self.roots) > 1:
+            del self.roots[index]
+            self.render_roots(select=index)
 
     def save(self):
+        # Don't let a scan of the old path keep running while we switch settings
+        self.launcher.cancel_scan()
+
+        self.on_depth_changed()  # Pick up a depth typed in without using the arrows
         new_editor = self.ed_entry.get().strip()
-        new_path = self.path_entry.get().strip()
-        new_depth = self.depth_var.get().strip()
+        new_workers = self.workers_var.get().strip()
+        new_prune = ",".join(p.strip() for p in self.prune_entry.get().split(",") if p.strip())
 
         # Write directly to the .env file
         set_key(config.ENV_PATH, "EDITOR_COMMAND", new_editor)
-        set_key(config.ENV_PATH, "BASE_PATH", new_path)
-        set_key(config.ENV_PATH, "DEPTH", new_depth)
+        set_key(config.ENV_PATH, "SCAN_ROOTS", json.dumps(self.roots))
+        # The first root doubles as BASE_PATH / DEPTH (clone target, older versions)
+        set_key(config.ENV_PATH, "BASE_PATH", self.roots[0]["path"])
+        set_key(config.ENV_PATH, "DEPTH", str(self.roots[0]["depth"]))
+        set_key(config.ENV_PATH, "SCAN_WORKERS", new_workers)
+        set_key(config.ENV_PATH, "PRUNE_PATTERNS", new_prune)
+        set_key(config.ENV_PATH, "WATCH_MODE", "auto" if self.watch_var.get() else "off")
+        set_key(config.ENV_PATH, "STAY_RESIDENT", "true" if self.resident_var.get() else "false")
+        set_key(config.ENV_PATH, "VIRTUAL_TABLE", "true" if self.virtual_var.get() else "false")
         
         # Trigger the main window refresh
         self.launcher.refresh_data()
@@ -0,0 +1,94 @@
+import tkinter as tk
+
+
+class TreeRows:
+    """An ID-keyed model of a table: records in, Treeview rows out.
+
+    Each record's row has a stable item id, `key(record)` (a repo path, a PR
+    URL), so going from a clicked or selected item back to its record is a
+    dict lookup with `get`/`selected`, never a position in some list. The
+    records shown are swapped in one assignment after the tree is updated, so
+    a lookup never mixes old and new data.
+
+    Rows that drop out are detached, not deleted, so showing them again is
+    free. Values and stripe tags are only written when they change, and the
+    order is applied in a single `set_children` call. Works on a ttk.Treeview
+    or a VirtualList.
+    """
+
+    def __init__(self, tree, key, values, stripes=("evenrow", "oddrow")):
+        self.tree = tree
+        self.key = key
+        self.values_for = values
+        self.stripes = stripes
+        self.columns = tuple(tree["columns"])
+        self.records = {}  # iid -> record, for the rows shown
+        self.values = {}  # iid -> values last written, for every item (shown or detached)
+        self.tags = {}  # iid -> stripe tag last written
+        self.shown = []  # iids attached to the tree, in order
+
+    def get(self, iid):
+        return self.records.get(iid)
+
+    def selected(self):
+        """The record of the (first) selected row, or None."""
+        selection = self.tree.selection()
+        return self.records.get(selection[0]) if selection else None
+
+    def exists(self, iid):
+        return iid in self.values
+
+    def show(self, records):
+        """Makes the tree show exactly `records`, in order."""
+        records = {self.key(record): record for record in records}
+        tree = self.tree
+        for i, (iid, record) in enumerate(records.items()):
+            values = self.values_for(record)
+            tag = self.stripes[i % 2]
+            old = self.values.get(iid)
+            if old is None:
+                tree.insert("", tk.END, iid=iid, values=values, tags=(tag,))
+            elif old != values or self.tags[iid] != tag:
+                tree.item(iid, values=values, tags=(tag,))
+            self.values[iid] = values
+            self.tags[iid] = tag
+
+        order = list(records)
+        if order != self.shown:
+            tree.set_children("", *order)  # Detaches whatever isn't in order
+            self.shown = order
+            # A hidden row can't stay selected
+            hidden = [iid for iid in tree.selection() if iid not in records]
+            if hidden:
+                tree.selection_remove(*hidden)
+        self.records = records
+
+    def replace(self, records):
+        """show() for data that's replaced wholesale (a GitHub sync): rows that
+        aren't in `records` are deleted rather than kept around detached."""
+        records = list(records)
+        self.show(records)
+        self.prune(self.records)
+
+    def set(self, iid, column, value):
+        """Writes one cell, shown or not, if it changed."""
+        values = self.values.get(iid)
+        if values is None:
+            return
+        index = self.columns.index(column)
+        if values[index] == value:
+            return
+        self.values[iid] = values[:index] + (value,) + values[index + 1:]
+        self.tree.set(iid, column, value)
+
+    def prune(self, keep):
+        """Deletes the items whose iid isn't in `keep` (a set or dict)."""
+        stale = [iid for iid in self.values if iid not in keep]
+        if not stale:
+            return
+        self.tree.delete(*stale)
+        for iid in stale:
+            del self.values[iid]
+            del self.tags[iid]
+        stale = set(stale)
+        self.shown = [iid for iid in self.shown if iid not in stale]
@@ -0,0 +1,384 @@
+import tkinter as tk
+import tkinter.font as tkfont
+from tkinter import ttk
+
+from ui.theme import *
+
+ROW_PADDING = 8  # Added to the font's line height, close to ttk.Treeview's rows
+CELL_PADDING = 4
+ELLIPSIS = "…"
+
+
+class VirtualList(tk.Frame):
+    """A drop-in for the repo table's ttk.Treeview that draws only what's visible.
+
+    Rows live in Python (iid -> values and tags, plus the shown order). The
+    canvas holds one fixed set of items per row that fits in the window, and
+    scrolling just re-labels them, so memory and redraw time stay flat no
+    matter how many rows there are.
+
+    Implements the part of the Treeview API the launcher and TreeRows use:
+    heading/column/tag_configure, insert/item/set/delete/exists, get_children/
+    set_children (detaching), selection, identify_* and yview. Widget events
+    (<Button-1>, <Double-1>, <Return>, ...) bound with bind() go to the rows
+    canvas, run before its own click/key handling as with a Treeview, and
+    <<TreeviewSelect>> fires there too. Single selection only.
+    """
+
+    def __init__(self, master, columns, **kwargs):
+        kwargs.pop("show", None)  # Always headings only, like the table it replaces
+        super().__init__(master, bg=BG_MAIN, **kwargs)
+        self._columns = tuple(columns)
+        self._headings = {col: "" for col in self._columns}
+        self._heading_commands = {}
+        self._widths = {col: 100 for col in self._columns}
+        self._anchors = {col: "w" for col in self._columns}
+        self._tag_backgrounds = {}
+
+        self._items = {}  # iid -> {"values": tuple, "tags": tuple}
+        self._order = []  # Attached iids, top to bottom
+        self._positions = None  # iid -> index in _order, rebuilt on demand
+        self._selected = None
+        self._top = 0  # Index of the first visible row
+
+        self._font = tkfont.Font(font=FONT_MAIN)
+        self._heading_font = tkfont.Font(font=FONT_BOLD)
+        self._row_height = self._font.metrics("linespace") + ROW_PADDING
+        self._fit_cache = {}  # (text, width) -> text cut to fit
+        self._x = []  # (left, right) per column, after stretching to the width
+        self._slots = []  # Per visible row: [background id, text ids, last drawn state]
+        self._redraw_pending = False
+
+        self._header = tk.Canvas(
+            self, bg=BG_HEADER, height=self._row_height + 2, highlightthickness=0, borderwidth=0
+        )
+        self._header.pack(side=tk.TOP, fill=tk.X)
+        self._scrollbar = ttk.Scrollbar(self, orient="vertical", command=self.yview)
+        self._scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self._body = tk.Canvas(self, bg=BG_MAIN, highlightthickness=0, borderwidth=0, takefocus=1)
+        self._body.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+        # Our own behaviour lives on a bind tag after the widget's, like a
+        # Treeview's class bindings, so bind() can't replace it
+        tag = f"VirtualList{id(self)}"
+        body = self._body
+        body.bindtags((str(body), tag) + body.bindtags()[1:])
+        for sequence, handler in (
+            ("<Configure>", lambda e: self._layout()),
+            ("<Button-1>", self._on_click),
+            ("<MouseWheel>", self._on_wheel),
+            ("<Button-4>", lambda e: self.yview("scroll", -3, "units")),
+            ("<Button-5>", lambda e: self.yview("scroll", 3, "units")),
+            ("<Up>", lambda e: self._move_selection(-1)),
+            ("<Down>", lambda e: self._move_selection(1)),
+            ("<Prior>", lambda e: self._move_selection(-self._page())),
+            ("<Next>", lambda e: self._move_selection(self._page())),
+            ("<Home>", lambda e: self._move_selection(-len(self._order))),
+            ("<End>", lambda e: self._move_selection(len(self._order))),
+        ):
+            body.bind_class(tag, sequence, handler)
+        self._header.bind("<Button-1>", self._on_heading_click)
+
+    # --- Treeview-compatible API ---
+
+    def __getitem__(self, option):
+        if option == "columns":
+            return self._columns
+        return super().__getitem__(option)
+
+    def heading(self, column, text=None, command=None, **kwargs):
+        if text is not None:
+            self._headings[column] = text
+        if command is not None:
+            self._heading_commands[column] = command
+        self._layout()
+
+    def column(self, column, width=None, anchor=None, **kwargs):
+        if width is not None:
+            self._widths[column] = width
+        if anchor is not None:
+            self._anchors[column] = anchor
+        self._layout()
+
+    def tag_configure(self, tag, background=None, **kwargs):
+        if background is not None:
+            self._tag_backgrounds[tag] = background
+        self._schedule_redraw()
+
+    def bind(self, sequence=None, func=None, add=None):
+        return self._body.bind(sequence, func, add)
+
+    def focus_set(self):
+        self._body.focus_set()
+
+    def insert(self, parent, index, iid=None, values=(), tags=()):
+        iid = iid if iid is not None else f"I{len(self._items):05d}"
+        self._items[iid] = {"values": tuple(values), "tags": tuple(tags)}
+        if index == tk.END:
+            if self._positions is not None:
+                self._positions[iid] = len(self._order)
+            self._order.append(iid)
+        else:
+            self._order.insert(index, iid)
+            self._positions = None
+        self._schedule_redraw()
+        return iid
+
+    def item(self, iid, option=None, values=None, tags=None, **kwargs):
+        item = self._items[iid]
+        if option is not None:
+            return item[option]
+        if values is not None:
+            item["values"] = tuple(values)
+        if tags is not None:
+            item["tags"] = (tags,) if isinstance(tags, str) else tuple(tags)
+        self._schedule_redraw()
+
+    def set(self, iid, column, value=None):
+        item = self._items[iid]
+        index = self._columns.index(column)
+        if value is None:
+            return item["values"][index]
+        values = item["values"]
+        item["values"] = values[:index] + (value,) + values[index + 1:]
+        self._schedule_redraw()
+
+    def exists(self, iid):
+        return iid in self._items
+
+    def get_children(self, item=""):
+        return tuple(self._order)
+
+    def set_children(self, item, *children):
+        self._order = list(children)
+        self._positions = None
+        if self._selected is not None and self._selected not in self._index():
+            self._selected = None  # Detached rows drop out of the selection
+            self._body.event_generate("<<TreeviewSelect>>")
+        self._schedule_redraw()
+
+    def delete(self, *iids):
+        gone = set(iids)
+        for iid in iids:
+            del self._items[iid]
+        self.set_children("", *(iid for iid in self._order if iid not in gone))
+
+    def index(self, iid):
+        return self._index()[iid]
+
+    def selection(self):
+        return (self._selected,) if self._selected is not None else ()
+
+    def selection_set(self, iid):
+        self._select(iid)
+
+    def selection_remove(self, *iids):
+        if self._selected in iids:
+            self._select(None)
+
+    def see(self, iid):
+        row = self._index().get(iid)
+        if row is None:
+            return
+        visible = self._visible_rows()
+        if row < self._top:
+            self._scroll_to(row)
+        elif row >= self._top + visible:
+            self._scroll_to(row - visible + 1)
+
+    def identify_row(self, y):
+        row = self._top + int(y) // self._row_height
+        return self._order[row] if 0 <= row < len(self._order) else ""
+
+    def identify_column(self, x):
+        for i, (left, right) in enumerate(self._x):
+            if left <= x < right:
+                return f"#{i + 1}"
+        return ""
+
+    def identify_region(self, x, y):
+        return "cell" if self.identify_row(y) and self.identify_column(x) else "nothing"
+
+    def yview(self, *args):
+        """Scrollbar protocol: ("moveto", fraction) or ("scroll", n, "units"|"pages")."""
+        if not args:
+            return self._fractions()
+        if args[0] == "moveto":
+            self._scroll_to(round(float(args[1]) * len(self._order)))
+        elif args[0] == "scroll":
+            step = int(args[1]) * (self._page() if args[2] == "pages" else 1)
+            self._scroll_to(self._top + step)
+
+    # --- Internals ---
+
+    def _index(self):
+        if self._positions is None:
+            self._positions = {iid: i for i, iid in enumerate(self._order)}
+        return self._positions
+
+    def _visible_rows(self):
+        return max(1, self._body.winfo_height() // self._row_height)
+
+    def _page(self):
+        return max(1, self._visible_rows() - 1)
+
+    def _fractions(self):
+        total = len(self._order)
+        if not total:
+            return 0.0, 1.0
+        return self._top / total, min(1.0, (self._top + self._visible_rows()) / total)
+
+    def _scroll_to(self, top):
+        top = max(0, min(top, len(self._order) - self._visible_rows()))
+        if top != self._top:
+            self._top = top
+            self._redraw()
+
+    def _select(self, iid):
+        if iid == self._selected:
+            return
+        self._selected = iid
+        self._schedule_redraw()
+        self._body.event_generate("<<TreeviewSelect>>")
+
+    def _move_selection(self, step):
+        if not self._order:
+            return "break"
+        current = self._index().get(self._selected)
+        row = 0 if current is None else max(0, min(len(self._order) - 1, current + step))
+        self._select(self._order[row])
+        self.see(self._order[row])
+        return "break"
+
+    def _on_click(self, event):
+        self._body.focus_set()
+        iid = self.identify_row(event.y)
+        if iid:
+            self._select(iid)
+
+    def _on_wheel(self, event):
+        # Windows reports multiples of 120, macOS small deltas
+        delta = event.delta // 120 if abs(event.delta) >= 120 else event.delta
+        self.yview("scroll", -delta * 3, "units")
+
+    def _on_heading_click(self, event):
+        column = self.identify_column(event.x)
+        if column:
+            command = self._heading_commands.get(self._columns[int(column[1:]) - 1])
+            if command:
+                command()
+
+    def _fit(self, text, width):
+        """Text cut with an ellipsis to fit `width` pixels, as Treeview cells are."""
+        key = (text, width)
+        fitted = self._fit_cache.get(key)
+        if fitted is None:
+            fitted = text
+            if self._font.measure(text) > width:
+                lo, hi = 0, len(text)
+                while lo < hi:  # Longest prefix that fits with the ellipsis
+                    mid = (lo + hi + 1) // 2
+                    if self._font.measure(text[:mid] + ELLIPSIS) <= width:
+                        lo = mid
+                    else:
+                        hi = mid - 1
+                fitted = text[:lo] + ELLIPSIS
+            if len(self._fit_cache) > 20000:
+                self._fit_cache.clear()
+            self._fit_cache[key] = fitted
+        return fitted
+
+    def _text_x(self, column, left, right):
+        anchor = self._anchors[column]
+        if anchor == "center":
+            return (left + right) / 2
+        return right - CELL_PADDING if anchor == "e" else left + CELL_PADDING
+
+    def _layout(self):
+        """Spreads the columns over the width (like Treeview's stretch) and
+        places the header and the row slots."""
+        width = max(self._body.winfo_width(), 1)
+        requested = sum(self._widths.values()) or 1
+        self._x = []
+        left = 0
+        for col in self._columns:
+            right = left + self._widths[col] * width / requested
+            self._x.append((left, right))
+            left = right
+
+        header = self._header
+        header.delete("all")
+        middle = (self._row_height + 2) / 2
+        for col, (left, right) in zip(self._columns, self._x):
+            header.create_text(
+                self._text_x(col, left, right), middle, text=self._headings[col],
+                anchor=self._anchors[col] if self._anchors[col] != "center" else "center",
+                fill=ACCENT, font=self._heading_font,
+            )
+
+        # Slot items keep their place; only their text and colour change on scroll
+        self._body.delete("all")
+        self._slots = []
+        self._fit_cache.clear()
+        self._redraw()
+
+    def _schedule_redraw(self):
+        # Model changes come in bursts (a whole filter pass); draw once after them
+        if not self._redraw_pending:
+            self._redraw_pending = True
+            self.after_idle(self._redraw)
+
+    def _redraw(self):
+        self._redraw_pending = False
+        body = self._body
+        width = max(body.winfo_width(), 1)
+        visible = self._visible_rows() + 1  # A partly shown row at the bottom
+        self._top = max(0, min(self._top, len(self._order) - visible + 1))
+        height = self._row_height
+
+        while len(self._slots) < visible:
+            y = len(self._slots) * height
+            background = body.create_rectangle(0, y, width, y + height, width=0)
+            texts = [
+                body.create_text(
+                    self._text_x(col, left, right), y + height / 2,
+                    anchor=self._anchors[col] if self._anchors[col] != "center" else "center",
+                    font=self._font,
+                )
+                for col, (left, right) in zip(self._columns, self._x)
+            ]
+            self._slots.append([background, texts, None])
+
+        for i, slot in enumerate(self._slots):
+            row = self._top + i
+            if row >= len(self._order):
+                if slot[2] != "hidden":
+                    body.itemconfigure(slot[0], state="hidden")
+                    for text in slot[1]:
+                        body.itemconfigure(text, state="hidden")
+                    slot[2] = "hidden"
+                continue
+            iid = self._order[row]
+            item = self._items[iid]
+            selected = iid == self._selected
+            state = (iid, item["values"], item["tags"], selected)
+            if slot[2] == state:
+                continue  # Same row as last time, nothing to draw
+            if selected:
+                fill, fg = SELECTED, "white"
+            else:
+                fill = next(
+                    (self._tag_backgrounds[t] for t in item["tags"] if t in self._tag_backgrounds),
+                    BG_MAIN,
+                )
+                fg = FG_TEXT
+            body.itemconfigure(slot[0], fill=fill, state="normal")
+            for text, value, (left, right) in zip(slot[1], item["values"], self._x):
+                body.itemconfigure(
+                    text, text=self._fit(str(value), right - left - 2 * CELL_PADDING),
+                    fill=fg, state="normal",
+                )
+            slot[2] = state
+
+        first, last = self._fractions()
+        self._scrollbar.set(first, last)